@@ -0,0 +1,7 @@
+"""
+Re-export of the benchmark infrastructure
+"""
+
+from .benchmark import Benchmark
+from .stub_provider_server import StubProviderServer
+from .stub_provider_handler import StubProviderHandler
@@ -0,0 +1,130 @@
+"""
+This script runs the benchmark suite offline, on scripted providers.
+
+Modules Imported:
+- `ArgumentParser` from `argparse`: Parses the command line arguments.
+- `fnmatch` from `fnmatch`: Selects benchmarks by name.
+- `dumps`, `loads` from `json`: Saves and loads results.
+- `makedirs`, `path` from `os`: Creates the directory of saved results.
+- `python_version`, `platform` from `platform`: Describes the machine of saved results.
+- `datetime`, `timezone` from `datetime`: Dates saved results.
+- `format_exception` from `traceback`: Reports failed benchmarks.
+- `exit` from `sys`: Fails the run on regressions.
+- `List`, `Optional` from `typing`: Specifies list and optional types.
+- `Benchmark` from `.benchmark`: Represents a benchmark.
+- The `benchmarks` functions of the suites: Collects the benchmarks.
+
+Main Function:
+The `main` function collects the benchmarks of all suites, runs those matching `--filter` and prints their median,
+minimum and maximum seconds per call. `--save <path>` writes the results as JSON, `--compare <path>` compares the
+medians to saved results. The run fails if a benchmark raises, exceeds its budget, or is slower than the saved
+median by more than `--threshold` (25% by default).
+
+Usage:
+```
+python -m benchmarks --list
+python -m benchmarks --filter "thread.*" --repeat 3
+python -m benchmarks --save benchmarks/results/baseline.json
+python -m benchmarks --compare benchmarks/results/baseline.json
+```
+"""
+
+from argparse import ArgumentParser
+from fnmatch import fnmatch
+from json import dumps, loads
+from os import makedirs, path
+from platform import python_version, platform
+from datetime import datetime, timezone
+from traceback import format_exception
+from sys import exit
+from typing import List, Optional
+from .benchmark import Benchmark
+from . import startup_benchmarks, thread_benchmarks, adapter_benchmarks, tool_benchmarks, workflow_benchmarks
+
+suites = [startup_benchmarks, thread_benchmarks, adapter_benchmarks, tool_benchmarks, workflow_benchmarks]
+
+def argument_parser() -> ArgumentParser:
+  """
+  Creates the parser of the command line arguments.
+  """
+  parser = ArgumentParser(prog= "benchmarks", description= "Runs the ChatDev benchmarks on scripted providers.")
+  parser.add_argument("--filter", default= "*", help= "Glob pattern of the benchmark names to run, e.g. 'thread.*'")
+  parser.add_argument("--repeat", type= int, help= "Number of repetitions of every benchmark, overriding their defaults")
+  parser.add_argument("--save", help= "JSON file the results are written to")
+  parser.add_argument("--compare", help= "JSON file of saved results the medians are compared to")
+  parser.add_argument("--threshold", type= float, default= 0.25, help= "Relative slowdown against the saved median counted as a regression")
+  parser.add_argument("--list", action= "store_true", help= "Lists the benchmarks instead of running them")
+  return parser
+
+def collect_benchmarks(pattern: str) -> List[Benchmark]:
+  """
+  Returns the benchmarks of all suites whose names match the pattern.
+  """
+  return [benchmark for suite in suites for benchmark in suite.benchmarks() if fnmatch(benchmark.name, pattern)]
+
+def verdict(result: dict, baseline: Optional[dict], threshold: float) -> Optional[str]:
+  """
+  Returns why a result fails, if it does.
+  """
+  if not result["budget"] is None and result["median"] > result["budget"]:
+    return f"over budget of {result['budget'] * 1000:.1f}ms"
+  if not baseline is None and result["median"] > baseline["median"] * (1 + threshold):
+    return f"regressed {result['median'] / baseline['median'] - 1:.0%} from {baseline['median'] * 1000:.3f}ms"
+  return None
+
+def main():
+  """
+  The main entry point of the benchmark suite.
+  """
+  arguments = argument_parser().parse_args()
+  benchmarks = collect_benchmarks(arguments.filter)
+
+  if arguments.list:
+    for benchmark in benchmarks:
+      print(benchmark.name if benchmark.skip is None else f"{benchmark.name} (skipped: {benchmark.skip})")
+    return
+
+  baselines = {}
+  if not arguments.compare is None:
+    with open(arguments.compare, 'r') as file:
+      baselines = loads(file.read())["results"]
+
+  width = max([len(benchmark.name) for benchmark in benchmarks] + [9])
+  print(f"{'benchmark':<{width}}  {'median ms':>10}  {'min ms':>10}  {'max ms':>10}  result")
+  results = {}
+  failures = []
+  for benchmark in benchmarks:
+    if not benchmark.skip is None:
+      print(f"{benchmark.name:<{width}}  {'':>10}  {'':>10}  {'':>10}  skipped, {benchmark.skip}")
+      continue
+    try:
+      result = benchmark.run(arguments.repeat)
+    except Exception as e:
+      failures.append(benchmark.name)
+      print(f"{benchmark.name:<{width}}  {'':>10}  {'':>10}  {'':>10}  failed")
+      print(''.join(format_exception(type(e), value= e, tb= e.__traceback__)))
+      continue
+
+    results[benchmark.name] = result
+    reason = verdict(result, baselines.get(benchmark.name), arguments.threshold)
+    if not reason is None:
+      failures.append(benchmark.name)
+    print(f"{benchmark.name:<{width}}  {result['median'] * 1000:>10.3f}  {result['min'] * 1000:>10.3f}  {result['max'] * 1000:>10.3f}  {reason or 'ok'}")
+
+  if not arguments.save is None:
+    if path.dirname(arguments.save) != "":
+      makedirs(path.dirname(arguments.save), exist_ok= True)
+    with open(arguments.save, 'w') as file:
+      file.write(dumps({
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": python_version(),
+        "platform": platform(),
+        "results": results
+      }, indent= 2))
+
+  if len(failures) > 0:
+    print(f"{len(failures)} of {len(benchmarks)} benchmarks failed: {', '.join(failures)}")
+    exit(1)
+
+if __name__ == '__main__':
+  main()
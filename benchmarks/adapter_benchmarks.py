@@ -0,0 +1,35 @@
+"""
+This module defines the benchmarks of converting threads into provider requests.
+
+Modules Imported:
+- `OpenAIAdapter`, `AnthropicAdapter`, `ThreadCompactor` from `chatdev.adapters`: Represents the benchmarked conversions.
+- `Benchmark` from `.benchmark`: Represents a benchmark.
+- `sample_thread` from `.fixtures`: Builds the thread.
+- `List` from `typing`: Specifies list types.
+
+Functions:
+- `benchmarks() -> List[Benchmark]`: Returns the adapter benchmarks.
+"""
+
+from chatdev.adapters import OpenAIAdapter, AnthropicAdapter, ThreadCompactor
+from .benchmark import Benchmark
+from .fixtures import sample_thread
+from typing import List
+
+def benchmarks() -> List[Benchmark]:
+  """
+  Returns the adapter benchmarks on a thread of 500 messages. Cold requests convert every message, warm ones
+  are served from the payloads converted by the previous request, like every turn after the first.
+  """
+  thread = sample_thread("workspaces/benchmark")
+  openai_adapter = OpenAIAdapter(client= None, model= "gpt-4o")
+  anthropic_adapter = AnthropicAdapter(client= None, model= "claude-3-5-sonnet-latest")
+  compactor = ThreadCompactor()
+
+  return [
+    Benchmark("adapter.openai.llm_request.cold", lambda state: openai_adapter.llm_request(thread), setup= OpenAIAdapter.payloads.clear, repeat= 10),
+    Benchmark("adapter.openai.llm_request.warm", lambda state: openai_adapter.llm_request(thread), setup= lambda: openai_adapter.llm_request(thread), repeat= 10),
+    Benchmark("adapter.anthropic.llm_request.cold", lambda state: anthropic_adapter.llm_request(thread), setup= AnthropicAdapter.payloads.clear, repeat= 10),
+    Benchmark("adapter.anthropic.llm_request.warm", lambda state: anthropic_adapter.llm_request(thread), setup= lambda: anthropic_adapter.llm_request(thread), repeat= 10),
+    Benchmark("adapter.compactor.compact", lambda state: compactor.compact(thread, "gpt-4o"), repeat= 10)
+  ]
@@ -0,0 +1,79 @@
+"""
+This module defines the `Benchmark` class which times a function repeatedly.
+
+Modules Imported:
+- `Any`, `Callable`, `Optional` from `typing`: Specifies any, callable and optional types.
+- `perf_counter` from `time`: Measures the elapsed time.
+- `median` from `statistics`: Summarizes the timings.
+- `collect` from `gc`: Collects garbage before every repetition, so it isn't attributed to the next one.
+
+Classes:
+- `Benchmark`: A named, repeatable measurement with optional setup, teardown and time budget.
+
+`Benchmark` Class:
+Every repetition calls `setup`, then times `number` calls of `function` with the state returned by `setup`, then
+calls `teardown` with the state. Only the calls of `function` are timed. A benchmark with a `skip` reason isn't run,
+e.g. if docker is missing. A benchmark whose median exceeds its `budget` fails.
+
+Attributes:
+- `name` (str): The dotted name of the benchmark, e.g. `thread.dict`.
+- `function` (Callable[[Any], Any]): The measured function, called with the state of the setup.
+- `setup` (Optional[Callable[[], Any]]): Prepares the state of a repetition.
+- `teardown` (Optional[Callable[[Any], None]]): Cleans up the state of a repetition.
+- `repeat` (int): The number of repetitions.
+- `number` (int): The number of calls per repetition.
+- `budget` (Optional[float]): The maximum median seconds per call, if any.
+- `skip` (Optional[str]): The reason the benchmark can't run here, if any.
+
+Methods:
+- `__init__(self, name: str, function: Callable[[Any], Any], setup: Optional[Callable[[], Any]] = None, teardown: Optional[Callable[[Any], None]] = None, repeat: int = 5, number: int = 1, budget: Optional[float] = None, skip: Optional[str] = None)`: Initializes a benchmark.
+- `run(self, repeat: Optional[int] = None) -> dict`: Runs the repetitions and returns the seconds per call.
+"""
+
+from typing import Any, Callable, Optional
+from time import perf_counter
+from statistics import median
+from gc import collect
+
+class Benchmark:
+  name: str
+  function: Callable[[Any], Any]
+  setup: Optional[Callable[[], Any]]
+  teardown: Optional[Callable[[Any], None]]
+  repeat: int
+  number: int
+  budget: Optional[float]
+  skip: Optional[str]
+
+  def __init__(self, name: str, function: Callable[[Any], Any], setup: Optional[Callable[[], Any]] = None, teardown: Optional[Callable[[Any], None]] = None, repeat: int = 5, number: int = 1, budget: Optional[float] = None, skip: Optional[str] = None):
+    self.name = name
+    self.function = function
+    self.setup = setup
+    self.teardown = teardown
+    self.repeat = repeat
+    self.number = number
+    self.budget = budget
+    self.skip = skip
+
+  def run(self, repeat: Optional[int] = None) -> dict:
+    timings = []
+    for _ in range(repeat if not repeat is None else self.repeat):
+      state = self.setup() if not self.setup is None else None
+      collect()
+      try:
+        started = perf_counter()
+        for _ in range(self.number):
+          self.function(state)
+        timings.append((perf_counter() - started) / self.number)
+      finally:
+        if not self.teardown is None:
+          self.teardown(state)
+
+    return {
+      "median": median(timings),
+      "min": min(timings),
+      "max": max(timings),
+      "repeat": len(timings),
+      "number": self.number,
+      "budget": self.budget
+    }
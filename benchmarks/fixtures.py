@@ -0,0 +1,118 @@
+"""
+This module provides the threads, workflows and scripts the benchmarks run on.
+
+Modules Imported:
+- `Message`, `Thread`, `TextBlock`, `ToolUseBlock`, `ToolResultBlock`, `Workflow`, `WorkflowPhase`, `WorkflowConversation`, `WorkflowRole`, `WorkflowArtifact` from `chatdev.entities`: Represents the benchmarked threads and workflows.
+- `workflows` from `chatdev.workflows`: The registered workflows.
+- `deepcopy` from `copy`: Copies workflows before their models are replaced.
+- `contextmanager`, `redirect_stdout` from `contextlib`: Silences the progress output of workflow runs.
+- `devnull` from `os`: The sink of the silenced output.
+- `Random` from `random`: Generates reproducible texts.
+- `Iterator`, `List` from `typing`: Specifies iterator and list types.
+
+Functions:
+- `text(random: Random, length: int) -> str`: Returns a text of about the given length.
+- `sample_messages(count: int = 500, seed: int = 0) -> List[Message]`: Returns messages shaped like a workflow thread, with text turns and file tool calls.
+- `sample_thread(workspace_path: str, count: int = 500) -> Thread`: Returns a thread of sample messages.
+- `stub_workflow(name: str, model: str) -> Workflow`: Returns a copy of a registered workflow with every role using the model.
+- `branching_workflow(model: str) -> Workflow`: Returns a workflow whose documentation conversations are independent.
+- `tool_calls() -> List[dict]`: Returns the tool calls a scripted conversation turn makes.
+- `quiet() -> Iterator[None]`: Silences stdout.
+"""
+
+from chatdev.entities import Message, Thread, TextBlock, ToolUseBlock, ToolResultBlock, Workflow, WorkflowPhase, WorkflowConversation, WorkflowRole, WorkflowArtifact
+from chatdev.workflows import workflows
+from copy import deepcopy
+from contextlib import contextmanager, redirect_stdout
+from os import devnull
+from random import Random
+from typing import Iterator, List
+
+words = ["the", "workflow", "module", "returns", "input", "output", "file", "test", "builds", "and", "def", "class", "return", "self", "import", "value"]
+
+def text(random: Random, length: int) -> str:
+  """
+  Returns a text of about the given length.
+  """
+  parts = []
+  total = 0
+  while total < length:
+    word = random.choice(words)
+    parts.append(word)
+    total += len(word) + 1
+  return " ".join(parts)
+
+def sample_messages(count: int = 500, seed: int = 0) -> List[Message]:
+  """
+  Returns messages shaped like a workflow thread: switches, replies, file writes and reads with their results.
+  """
+  random = Random(seed)
+  messages = []
+  while len(messages) < count:
+    index = len(messages)
+    messages.append(Message(role= "user", content= [TextBlock(text= "SWITCH")]))
+    messages.append(Message(role= "assistant", content= [ToolUseBlock(id= f"call_{index}_write", name= "write_file", input= { "file_path": f"src/module_{index}.py", "content": text(random, 2000) })]))
+    messages.append(Message(role= "user", content= [ToolResultBlock(id= f"call_{index}_write", output= "")]))
+    messages.append(Message(role= "assistant", content= [ToolUseBlock(id= f"call_{index}_read", name= "read_file", input= { "file_path": f"src/module_{index}.py" })]))
+    messages.append(Message(role= "user", content= [ToolResultBlock(id= f"call_{index}_read", output= text(random, 2000))]))
+    messages.append(Message(role= "assistant", content= [TextBlock(text= f"Programmer:\n\n{text(random, 600)}")]))
+  return messages[:count]
+
+def sample_thread(workspace_path: str, count: int = 500) -> Thread:
+  """
+  Returns a thread of sample messages.
+  """
+  return Thread(workspace_path= workspace_path, messages= sample_messages(count))
+
+def stub_workflow(name: str, model: str) -> Workflow:
+  """
+  Returns a copy of a registered workflow with every role using the model.
+  """
+  workflow = deepcopy(workflows[name])
+  for role in workflow.roles():
+    role.model = model
+  return workflow
+
+def branching_workflow(model: str) -> Workflow:
+  """
+  Returns a workflow whose specification, manual and changelog are all written from the code, so the scheduler
+  runs them concurrently.
+  """
+  programmer = WorkflowRole(name= "Programmer", description= "Writes the code", model= model)
+  writer = WorkflowRole(name= "Writer", description= "Writes the documentation", model= model)
+  task, code, spec, manual, changelog = [WorkflowArtifact(name= name, description= f"The {name.lower()} of the task") for name in ["Task", "Code", "Specification", "Manual", "Changelog"]]
+  return Workflow(
+    name= "Branching Development",
+    description= "Code is written and then documented in three independent ways.",
+    phases= [
+      WorkflowPhase(name= "Coding", description= "The code is written.", conversations= [
+        WorkflowConversation(name= "Code", description= "Writes the code", lead= programmer, assistant= writer, input= task, output= code)
+      ]),
+      WorkflowPhase(name= "Documenting", description= "The code is documented.", conversations= [
+        WorkflowConversation(name= "Specification", description= "Specifies the code", lead= writer, assistant= programmer, input= code, output= spec),
+        WorkflowConversation(name= "Manual", description= "Explains the code", lead= writer, assistant= programmer, input= code, output= manual),
+        WorkflowConversation(name= "Changelog", description= "Lists the changes", lead= writer, assistant= programmer, input= code, output= changelog)
+      ])
+    ]
+  )
+
+def tool_calls() -> List[dict]:
+  """
+  Returns the tool calls a scripted conversation turn makes: a write, a read, an edit and a listing, then the
+  file is restored so the edit of the next turn applies again.
+  """
+  return [
+    { "name": "write_file", "input": { "file_path": "main.py", "content": "def main():\n  print('hello')\n\nif __name__ == '__main__':\n  main()\n" } },
+    { "name": "read_file", "input": { "file_path": "main.py" } },
+    { "name": "edit_file", "input": { "file_path": "main.py", "edits": [{ "search": "print('hello')", "replace": "print('hello world')" }] } },
+    { "name": "list_files", "input": { "ignore_patterns": [] } },
+    { "name": "write_file", "input": { "file_path": "main.py", "content": "def main():\n  print('hello')\n\nif __name__ == '__main__':\n  main()\n" } }
+  ]
+
+@contextmanager
+def quiet() -> Iterator[None]:
+  """
+  Silences stdout, the workflows print their progress.
+  """
+  with open(devnull, 'w') as sink, redirect_stdout(sink):
+    yield
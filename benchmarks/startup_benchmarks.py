@@ -0,0 +1,38 @@
+"""
+This module defines the benchmarks of the interpreter and package startup.
+
+Modules Imported:
+- `Benchmark` from `.benchmark`: Represents a benchmark.
+- `run` from `subprocess`: Starts fresh interpreters.
+- `executable` from `sys`: The interpreter the benchmarks run with.
+- `List` from `typing`: Specifies list types.
+
+Functions:
+- `python(code: str)`: Runs code in a fresh interpreter, failing if it fails.
+- `benchmarks() -> List[Benchmark]`: Returns the startup benchmarks.
+"""
+
+from .benchmark import Benchmark
+from subprocess import run
+from sys import executable
+from typing import List
+
+def python(code: str) -> None:
+  """
+  Runs code in a fresh interpreter, failing if it fails.
+  """
+  run([executable, "-c", code], check= True, capture_output= True)
+
+def benchmarks() -> List[Benchmark]:
+  """
+  Returns the startup benchmarks, the import of chatdev has a budget and must not load a provider SDK.
+  """
+  return [
+    Benchmark("startup.python", lambda state: python("pass"), repeat= 5),
+    Benchmark(
+      "startup.import_chatdev",
+      lambda state: python("import sys, chatdev, chatdev.adapters; assert not 'openai' in sys.modules and not 'anthropic' in sys.modules, 'a provider SDK was imported'"),
+      repeat= 5,
+      budget= 0.5
+    )
+  ]
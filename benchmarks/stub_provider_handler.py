@@ -0,0 +1,225 @@
+"""
+This module defines the `StubProviderHandler` class which answers OpenAI and Anthropic API requests with a `StubScript`.
+
+Modules Imported:
+- `BaseHTTPRequestHandler` from `http.server`: Handles the HTTP requests of the stub server.
+- `Message`, `TextBlock`, `ToolUseBlock` from `chatdev.entities`: Represents the scripted responses.
+- `StubScript` from `chatdev.adapters`: Generates the scripted responses.
+- `Dict`, `List`, `Optional`, `Tuple` from `typing`: Specifies dict, list, optional and tuple types.
+- `dumps`, `loads` from `json`: Serializes and deserializes the API payloads.
+- `sleep`, `time` from `time`: Simulates the latency of a response and dates responses.
+
+Classes:
+- `StubProviderHandler`: Mimics the chat completions API of OpenAI and the messages API of Anthropic.
+
+`StubProviderHandler` Class:
+`POST /v1/chat/completions` and `POST /v1/messages` convert the request into the messages of the script, wait for
+its latency and answer in the format of the provider, as a single response or as server-sent events if the request
+streams. `GET /static/<bytes>` returns a text body of the given size with an `ETag`, for the request tool.
+The script is taken from the `script` attribute of the server.
+
+Attributes:
+- `protocol_version` (str): HTTP/1.1, so clients keep their connections alive.
+- `chunk_length` (int): The number of characters per streamed text delta.
+- `disable_nagle_algorithm` (bool): Sends responses immediately, so small responses don't wait for delayed acknowledgements.
+
+Methods:
+- `log_message(self, format: str, *args)`: Suppresses the request log.
+- `do_GET(self)`: Serves the static bodies.
+- `do_POST(self)`: Answers the API requests.
+- `openai_messages(self, request: dict) -> List[dict]`: Converts a chat completions request into script messages.
+- `anthropic_messages(self, request: dict) -> List[dict]`: Converts a messages request into script messages.
+- `usage(self, messages: List[dict], message: Message) -> Tuple[int, int]`: Estimates the input and output tokens.
+- `openai_response(self, request: dict, message: Message, usage: Tuple[int, int]) -> dict`: Builds a chat completion.
+- `openai_events(self, request: dict, message: Message, usage: Tuple[int, int]) -> List[str]`: Builds the chunks of a streamed chat completion.
+- `anthropic_response(self, request: dict, message: Message, usage: Tuple[int, int]) -> dict`: Builds a message.
+- `anthropic_events(self, request: dict, message: Message, usage: Tuple[int, int]) -> List[str]`: Builds the events of a streamed message.
+- `send_json(self, status: int, body: dict)`: Sends a JSON response.
+- `send_events(self, events: List[str])`: Sends server-sent events.
+- `send_body(self, status: int, content_type: str, body: bytes, headers: Optional[Dict[str, str]] = None)`: Sends a response with a fixed length.
+"""
+
+from http.server import BaseHTTPRequestHandler
+from chatdev.entities import Message, TextBlock, ToolUseBlock
+from chatdev.adapters import StubScript
+from typing import Dict, List, Optional, Tuple
+from json import dumps, loads
+from time import sleep, time
+
+class StubProviderHandler(BaseHTTPRequestHandler):
+  protocol_version: str = "HTTP/1.1"
+  chunk_length: int = 24
+  disable_nagle_algorithm: bool = True
+
+  def log_message(self, format: str, *args) -> None:
+    pass
+
+  def do_GET(self) -> None:
+    if not self.path.startswith("/static/"):
+      self.send_json(404, { "error": { "type": "not_found", "message": self.path } })
+      return
+
+    size = int(self.path.removeprefix("/static/"))
+    etag = f'"static-{size}"'
+    if self.headers.get("if-none-match") == etag:
+      self.send_body(304, "text/plain", b"", { "ETag": etag })
+      return
+    self.send_body(200, "text/plain; charset=utf-8", b"x" * size, { "ETag": etag, "Cache-Control": "no-cache" })
+
+  def do_POST(self) -> None:
+    request = loads(self.rfile.read(int(self.headers.get("content-length", 0))))
+    script: StubScript = self.server.script
+
+    if self.path.endswith("/chat/completions"):
+      messages = self.openai_messages(request)
+    elif self.path.endswith("/messages"):
+      messages = self.anthropic_messages(request)
+    else:
+      self.send_json(404, { "error": { "type": "not_found", "message": self.path } })
+      return
+
+    delay = script.delay()
+    if delay > 0:
+      sleep(delay)
+    message = script.respond(messages)
+    usage = self.usage(messages, message)
+
+    if self.path.endswith("/chat/completions"):
+      if request.get("stream"):
+        self.send_events(self.openai_events(request, message, usage))
+      else:
+        self.send_json(200, self.openai_response(request, message, usage))
+    elif request.get("stream"):
+      self.send_events(self.anthropic_events(request, message, usage))
+    else:
+      self.send_json(200, self.anthropic_response(request, message, usage))
+
+  def openai_messages(self, request: dict) -> List[dict]:
+    messages = []
+    for message in request["messages"]:
+      if message["role"] == "tool":
+        messages.append({ "role": "user", "content": [{ "type": "tool_result", "id": message["tool_call_id"], "output": message["content"] }] })
+      elif message["role"] == "assistant":
+        text = [{ "type": "text", "text": message["content"] }] if message.get("content") else []
+        calls = [{ "type": "tool_use", "id": call["id"], "name": call["function"]["name"], "input": loads(call["function"]["arguments"]) } for call in message.get("tool_calls", [])]
+        messages.append({ "role": "assistant", "content": text + calls })
+      else:
+        content = message["content"]
+        parts = [{ "type": "text", "text": content }] if isinstance(content, str) else [{ "type": "text", "text": part["text"] } for part in content if part["type"] == "text"]
+        messages.append({ "role": message["role"], "content": parts })
+    return messages
+
+  def anthropic_messages(self, request: dict) -> List[dict]:
+    messages = []
+    for message in request["messages"]:
+      content = message["content"]
+      if isinstance(content, str):
+        messages.append({ "role": message["role"], "content": [{ "type": "text", "text": content }] })
+        continue
+
+      blocks = []
+      for block in content:
+        if block["type"] == "text":
+          blocks.append({ "type": "text", "text": block["text"] })
+        elif block["type"] == "tool_use":
+          blocks.append({ "type": "tool_use", "id": block["id"], "name": block["name"], "input": block["input"] })
+        elif block["type"] == "tool_result":
+          blocks.append({ "type": "tool_result", "id": block["tool_use_id"], "output": block.get("content") })
+      messages.append({ "role": message["role"], "content": blocks })
+    return messages
+
+  def usage(self, messages: List[dict], message: Message) -> Tuple[int, int]:
+    input_characters = sum(len(StubScript.text(payload)) for payload in messages)
+    output_characters = sum(len(block.text) for block in message.text_blocks())
+    return input_characters // 4, max(output_characters // 4, 1)
+
+  def openai_response(self, request: dict, message: Message, usage: Tuple[int, int]) -> dict:
+    text = "\n".join(block.text for block in message.text_blocks())
+    response_message = { "role": "assistant", "content": text if text != "" else None }
+    if len(message.tool_use_blocks()) > 0:
+      response_message["tool_calls"] = [{ "id": block.id, "type": "function", "function": { "name": block.name, "arguments": dumps(block.input) } } for block in message.tool_use_blocks()]
+
+    return {
+      "id": "chatcmpl-stub",
+      "object": "chat.completion",
+      "created": int(time()),
+      "model": request["model"],
+      "choices": [{
+        "index": 0,
+        "message": response_message,
+        "finish_reason": "tool_calls" if len(message.tool_use_blocks()) > 0 else "stop",
+        "logprobs": None
+      }],
+      "usage": { "prompt_tokens": usage[0], "completion_tokens": usage[1], "total_tokens": usage[0] + usage[1] }
+    }
+
+  def openai_events(self, request: dict, message: Message, usage: Tuple[int, int]) -> List[str]:
+    def chunk(delta: dict, finish_reason= None) -> str:
+      return dumps({ "id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time()), "model": request["model"], "choices": [{ "index": 0, "delta": delta, "finish_reason": finish_reason }] })
+
+    events = [chunk({ "role": "assistant", "content": "" })]
+    text = "\n".join(block.text for block in message.text_blocks())
+    for start in range(0, len(text), self.chunk_length):
+      events.append(chunk({ "content": text[start:start + self.chunk_length] }))
+    for index, block in enumerate(message.tool_use_blocks()):
+      events.append(chunk({ "tool_calls": [{ "index": index, "id": block.id, "type": "function", "function": { "name": block.name, "arguments": "" } }] }))
+      events.append(chunk({ "tool_calls": [{ "index": index, "function": { "arguments": dumps(block.input) } }] }))
+    events.append(chunk({}, "tool_calls" if len(message.tool_use_blocks()) > 0 else "stop"))
+
+    if request.get("stream_options", {}).get("include_usage"):
+      events.append(dumps({ "id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time()), "model": request["model"], "choices": [], "usage": { "prompt_tokens": usage[0], "completion_tokens": usage[1], "total_tokens": usage[0] + usage[1] } }))
+    return [f"data: {event}\n\n" for event in events] + ["data: [DONE]\n\n"]
+
+  def anthropic_response(self, request: dict, message: Message, usage: Tuple[int, int]) -> dict:
+    content = []
+    for block in message.content:
+      if isinstance(block, TextBlock):
+        content.append({ "type": "text", "text": block.text })
+      elif isinstance(block, ToolUseBlock):
+        content.append({ "type": "tool_use", "id": block.id, "name": block.name, "input": block.input })
+
+    return {
+      "id": "msg_stub",
+      "type": "message",
+      "role": "assistant",
+      "model": request["model"],
+      "content": content,
+      "stop_reason": "tool_use" if len(message.tool_use_blocks()) > 0 else "end_turn",
+      "stop_sequence": None,
+      "usage": { "input_tokens": usage[0], "output_tokens": usage[1] }
+    }
+
+  def anthropic_events(self, request: dict, message: Message, usage: Tuple[int, int]) -> List[str]:
+    def event(type: str, data: dict) -> str:
+      return f"event: {type}\ndata: {dumps({ 'type': type, **data })}\n\n"
+
+    events = [event("message_start", { "message": { **self.anthropic_response(request, Message(role= "assistant", content= []), (usage[0], 1)), "stop_reason": None } })]
+    for index, block in enumerate(message.content):
+      if isinstance(block, TextBlock):
+        events.append(event("content_block_start", { "index": index, "content_block": { "type": "text", "text": "" } }))
+        for start in range(0, len(block.text), self.chunk_length):
+          events.append(event("content_block_delta", { "index": index, "delta": { "type": "text_delta", "text": block.text[start:start + self.chunk_length] } }))
+      elif isinstance(block, ToolUseBlock):
+        events.append(event("content_block_start", { "index": index, "content_block": { "type": "tool_use", "id": block.id, "name": block.name, "input": {} } }))
+        events.append(event("content_block_delta", { "index": index, "delta": { "type": "input_json_delta", "partial_json": dumps(block.input) } }))
+      events.append(event("content_block_stop", { "index": index }))
+
+    stop_reason = "tool_use" if len(message.tool_use_blocks()) > 0 else "end_turn"
+    events.append(event("message_delta", { "delta": { "stop_reason": stop_reason, "stop_sequence": None }, "usage": { "output_tokens": usage[1] } }))
+    events.append(event("message_stop", {}))
+    return events
+
+  def send_json(self, status: int, body: dict) -> None:
+    self.send_body(status, "application/json", dumps(body).encode("utf-8"))
+
+  def send_events(self, events: List[str]) -> None:
+    self.send_body(200, "text/event-stream", "".join(events).encode("utf-8"), { "Cache-Control": "no-cache" })
+
+  def send_body(self, status: int, content_type: str, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+    self.send_response(status)
+    self.send_header("Content-Type", content_type)
+    self.send_header("Content-Length", str(len(body)))
+    for name, value in (headers or {}).items():
+      self.send_header(name, value)
+    self.end_headers()
+    self.wfile.write(body)
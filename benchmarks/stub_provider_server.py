@@ -0,0 +1,90 @@
+"""
+This module defines the `StubProviderServer` class which serves stubbed OpenAI and Anthropic APIs locally.
+
+Modules Imported:
+- `ThreadingHTTPServer` from `http.server`: Serves the requests on a thread each.
+- `Thread` from `threading`: Runs the server in the background.
+- `ArgumentParser` from `argparse`: Parses the arguments of a standalone server.
+- `Optional` from `typing`: Specifies optional types.
+- `StubScript` from `chatdev.adapters`: Generates the scripted responses.
+- `StubProviderHandler` from `.stub_provider_handler`: Answers the API requests.
+
+Classes:
+- `StubProviderServer`: Runs a local server the provider SDKs can be pointed at with their base URL.
+
+`StubProviderServer` Class:
+The OpenAI SDK uses `<url>/v1` as base URL, the Anthropic SDK `<url>`. Requests go through the SDKs, HTTP and
+the provider adapters like real ones, only the model is replaced by the script. The server is a context manager.
+
+Run `python -m benchmarks.stub_provider_server --port 8765` to serve it standalone, e.g. for manual runs with
+`OPENAI_BASE_URL=http://127.0.0.1:8765/v1`.
+
+Attributes:
+- `script` (StubScript): The script answering the requests.
+- `server` (ThreadingHTTPServer): The HTTP server.
+- `thread` (Optional[Thread]): The thread serving the requests while started.
+
+Methods:
+- `__init__(self, script: Optional[StubScript] = None, host: str = "127.0.0.1", port: int = 0)`: Binds the server, to a free port by default.
+- `url(self) -> str`: Returns the URL of the server.
+- `start(self) -> StubProviderServer`: Serves requests in the background.
+- `stop(self)`: Stops serving and closes the socket.
+- `__enter__(self) -> StubProviderServer`: Starts the server.
+- `__exit__(self, *exception)`: Stops the server.
+"""
+
+from http.server import ThreadingHTTPServer
+from threading import Thread
+from argparse import ArgumentParser
+from typing import Optional
+from chatdev.adapters import StubScript
+from .stub_provider_handler import StubProviderHandler
+
+class StubProviderServer:
+  script: StubScript
+  server: ThreadingHTTPServer
+  thread: Optional[Thread]
+
+  def __init__(self, script: Optional[StubScript] = None, host: str = "127.0.0.1", port: int = 0):
+    self.script = script if not script is None else StubScript()
+    self.server = ThreadingHTTPServer((host, port), StubProviderHandler)
+    self.server.daemon_threads = True
+    self.server.script = self.script
+    self.thread = None
+
+  def url(self) -> str:
+    host, port = self.server.server_address[:2]
+    return f"http://{host}:{port}"
+
+  def start(self) -> 'StubProviderServer':
+    self.thread = Thread(target= self.server.serve_forever, name= "stub-provider", daemon= True)
+    self.thread.start()
+    return self
+
+  def stop(self) -> None:
+    if not self.thread is None:
+      self.server.shutdown()
+      self.thread.join()
+      self.thread = None
+    self.server.server_close()
+
+  def __enter__(self) -> 'StubProviderServer':
+    return self.start()
+
+  def __exit__(self, *exception) -> None:
+    self.stop()
+
+if __name__ == '__main__':
+  parser = ArgumentParser(prog= "stub_provider_server", description= "Serves stubbed OpenAI and Anthropic APIs.")
+  parser.add_argument("--port", type= int, default= 8765)
+  parser.add_argument("--median-latency", type= float, default= 0.0, help= "Median seconds per response, log-normally distributed")
+  parser.add_argument("--sigma", type= float, default= 0.5, help= "Spread of the log-normal latency")
+  arguments = parser.parse_args()
+
+  latency = StubScript.lognormal(arguments.median_latency, arguments.sigma) if arguments.median_latency > 0 else None
+  server = StubProviderServer(script= StubScript(latency= latency), port= arguments.port)
+  print(f"Serving stub providers at {server.url()}, OpenAI base URL {server.url()}/v1")
+  try:
+    server.server.serve_forever()
+  except KeyboardInterrupt:
+    server.server.server_close()
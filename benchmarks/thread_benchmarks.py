@@ -0,0 +1,76 @@
+"""
+This module defines the benchmarks of thread serialization and journaling.
+
+Modules Imported:
+- `Thread`, `ThreadJournal` from `chatdev.entities`: Represents the serialized threads.
+- `StubAdapter` from `chatdev.adapters`: Dumps threads like every adapter.
+- `Benchmark` from `.benchmark`: Represents a benchmark.
+- `sample_messages`, `sample_thread` from `.fixtures`: Builds the threads.
+- `dumps` from `json`: Serializes threads.
+- `mkdtemp` from `tempfile`: Creates the workspaces of journals.
+- `rmtree` from `shutil`: Removes the workspaces.
+- `List` from `typing`: Specifies list types.
+
+Functions:
+- `journaled_thread() -> Thread`: Returns a thread of 500 messages persisted to a journal in a fresh workspace.
+- `benchmarks() -> List[Benchmark]`: Returns the thread benchmarks.
+"""
+
+from chatdev.entities import Thread, ThreadJournal
+from chatdev.adapters import StubAdapter
+from .benchmark import Benchmark
+from .fixtures import sample_messages, sample_thread
+from json import dumps
+from tempfile import mkdtemp
+from shutil import rmtree
+from typing import List
+
+def journaled_thread() -> Thread:
+  """
+  Returns a thread of 500 messages persisted to a journal in a fresh workspace.
+  """
+  thread = sample_thread(mkdtemp(prefix= "chatdev-benchmark-"))
+  thread.journal = ThreadJournal(workspace_path= thread.workspace_path)
+  thread.journal.sync(thread)
+  return thread
+
+def benchmarks() -> List[Benchmark]:
+  """
+  Returns the thread benchmarks on a thread of 500 messages.
+  """
+  thread = sample_thread("workspaces/benchmark")
+  data = thread.dict()
+  adapter = StubAdapter()
+  new_messages = sample_messages(2, seed= 1)
+
+  def append_and_dump(thread: Thread) -> None:
+    for message in new_messages:
+      thread.append_message(message)
+    adapter.dump_thread(thread)
+
+  return [
+    Benchmark("thread.dict", lambda state: thread.dict(), repeat= 10),
+    Benchmark("thread.dumps", lambda state: dumps(thread.dict()), repeat= 10),
+    Benchmark("thread.from_dict", lambda state: Thread.from_dict(data), repeat= 10),
+    Benchmark(
+      "thread.dump_thread.full",
+      lambda state: adapter.dump_thread(state),
+      setup= lambda: sample_thread(mkdtemp(prefix= "chatdev-benchmark-")),
+      teardown= lambda state: rmtree(state.workspace_path),
+      repeat= 5
+    ),
+    Benchmark(
+      "thread.dump_thread.append",
+      append_and_dump,
+      setup= journaled_thread,
+      teardown= lambda state: rmtree(state.workspace_path),
+      repeat= 10
+    ),
+    Benchmark(
+      "thread.journal.load",
+      lambda state: ThreadJournal.load(state.workspace_path),
+      setup= journaled_thread,
+      teardown= lambda state: rmtree(state.workspace_path),
+      repeat= 5
+    )
+  ]
@@ -0,0 +1,95 @@
+"""
+This module defines the benchmarks of the tools of `Adapter.execute_tool`.
+
+Modules Imported:
+- `Thread`, `ToolUseBlock` from `chatdev.entities`: Represents the workspace thread and the tool calls.
+- `StubAdapter`, `HttpFetcher` from `chatdev.adapters`: Executes the tools like every adapter.
+- `Benchmark` from `.benchmark`: Represents a benchmark.
+- `StubProviderServer` from `.stub_provider_server`: Serves the responses of the request tool.
+- `text` from `.fixtures`: Generates file contents.
+- `makedirs`, `path` from `os`: Creates the workspace files.
+- `mkdtemp` from `tempfile`: Creates the workspaces.
+- `rmtree`, `which` from `shutil`: Removes the workspaces and finds docker.
+- `Random` from `random`: Generates reproducible file contents.
+- `List` from `typing`: Specifies list types.
+
+Functions:
+- `workspace(files: int = 0) -> Thread`: Returns a thread of a fresh workspace with the given number of source files and a large file.
+- `tool(adapter: StubAdapter, name: str, **input)`: Executes a tool call, failing if it fails.
+- `benchmarks() -> List[Benchmark]`: Returns the tool benchmarks.
+"""
+
+from chatdev.entities import Thread, ToolUseBlock
+from chatdev.adapters import StubAdapter, HttpFetcher
+from .benchmark import Benchmark
+from .stub_provider_server import StubProviderServer
+from .fixtures import text
+from os import makedirs, path
+from tempfile import mkdtemp
+from shutil import rmtree, which
+from random import Random
+from typing import List
+
+def workspace(files: int = 0) -> Thread:
+  """
+  Returns a thread of a fresh workspace with the given number of source files in nested folders and a 1 MB file.
+  """
+  workspace_path = mkdtemp(prefix= "chatdev-benchmark-")
+  random = Random(0)
+  for index in range(files):
+    folder = path.join(workspace_path, "src", f"package_{index % 20}", f"module_{index % 7}")
+    makedirs(folder, exist_ok= True)
+    with open(path.join(folder, f"file_{index}.py"), 'w') as file:
+      file.write(text(random, 200))
+  with open(path.join(workspace_path, "large.txt"), 'w') as file:
+    file.write("\n".join(text(random, 100) for _ in range(10_000)))
+  with open(path.join(workspace_path, "main.py"), 'w') as file:
+    file.write("def main():\n  print('hello')\n")
+  return Thread(workspace_path= workspace_path, messages= [])
+
+def tool(adapter: StubAdapter, thread: Thread, name: str, **input) -> None:
+  """
+  Executes a tool call, failing if it fails.
+  """
+  result = adapter.safe_execute_tool(thread, ToolUseBlock(id= "benchmark", name= name, input= input))
+  if result.error:
+    raise RuntimeError(f"Tool {name} failed: {result.output}")
+
+def benchmarks() -> List[Benchmark]:
+  """
+  Returns the tool benchmarks. The docker tools need docker and are skipped without it.
+  """
+  adapter = StubAdapter(http_fetcher= HttpFetcher())
+  docker = None if not which("docker") is None else "docker is not installed"
+  content = text(Random(1), 10_000)
+
+  def close(thread: Thread) -> None:
+    adapter.workspace_indexes.pop(thread.workspace_path, None)
+    session = adapter.docker_sessions.pop(thread.workspace_path, None)
+    if not session is None:
+      session.stop()
+    rmtree(thread.workspace_path)
+
+  def listed(files: int) -> Thread:
+    thread = workspace(files)
+    tool(adapter, thread, "list_files", ignore_patterns= [])
+    return thread
+
+  def served() -> tuple:
+    return (workspace(), StubProviderServer().start())
+
+  def stop_served(state: tuple) -> None:
+    state[1].stop()
+    close(state[0])
+
+  return [
+    Benchmark("tool.read_file.small", lambda thread: tool(adapter, thread, "read_file", file_path= "main.py"), setup= workspace, teardown= close, number= 20),
+    Benchmark("tool.read_file.large_range", lambda thread: tool(adapter, thread, "read_file", file_path= "large.txt", start_line= 5000, end_line= 5100), setup= workspace, teardown= close, number= 20),
+    Benchmark("tool.write_file", lambda thread: tool(adapter, thread, "write_file", file_path= "src/new.py", content= content), setup= workspace, teardown= close, number= 20),
+    Benchmark("tool.edit_file", lambda thread: tool(adapter, thread, "edit_file", file_path= "main.py", edits= [{ "search": "print('hello')", "replace": "print('hello')" }]), setup= workspace, teardown= close, number= 20),
+    Benchmark("tool.list_files.cold", lambda thread: tool(adapter, thread, "list_files", ignore_patterns= []), setup= lambda: workspace(2000), teardown= close),
+    Benchmark("tool.list_files.warm", lambda thread: tool(adapter, thread, "list_files", ignore_patterns= []), setup= lambda: listed(2000), teardown= close, number= 5),
+    Benchmark("tool.request", lambda state: tool(adapter, state[0], "request", method= "GET", url= f"{state[1].url()}/static/10000"), setup= served, teardown= stop_served, number= 20),
+    Benchmark("tool.docker", lambda thread: tool(adapter, thread, "docker", arguments= ["run", "--rm", "alpine", "true"]), setup= workspace, teardown= close, repeat= 3, skip= docker),
+    Benchmark("tool.docker_session", lambda thread: tool(adapter, thread, "docker_session", command= "true", image= "alpine"), setup= workspace, teardown= close, repeat= 3, skip= docker)
+  ]
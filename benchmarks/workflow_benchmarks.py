@@ -0,0 +1,119 @@
+"""
+This module defines the end-to-end benchmarks of workflows on scripted providers.
+
+Modules Imported:
+- `WorkflowManager`, `AsyncWorkflowManager` from `chatdev`: Executes the benchmarked workflows.
+- `AdapterFactory`, `AsyncAdapterFactory`, `StubScript`, `StreamHandler` from `chatdev.adapters`: Creates the adapters of the scripted providers.
+- `Benchmark` from `.benchmark`: Represents a benchmark.
+- `StubProviderServer` from `.stub_provider_server`: Mimics the provider APIs for the SDK clients.
+- `Workflow` from `chatdev.entities`: Represents the benchmarked workflows.
+- `stub_workflow`, `branching_workflow`, `tool_calls`, `quiet` from `.fixtures`: Provides the workflows and the scripted tool calls.
+- `mkdtemp` from `tempfile`: Creates the workspaces.
+- `rmtree` from `shutil`: Removes the workspaces.
+- `run`, `gather` from `asyncio`: Runs the concurrent workflows.
+- `List` from `typing`: Specifies list types.
+
+Functions:
+- `execute(factory: AdapterFactory, workflow: str, model: str, scoped_threads: bool = False) -> None`: Executes a workflow in a temporary workspace.
+- `execute_branching(factory: AdapterFactory, max_concurrent_conversations: int) -> None`: Executes the branching workflow in a temporary workspace.
+- `run_workflow(workflow_manager: WorkflowManager, workflow: Workflow) -> None`: Executes a workflow silently in a temporary workspace.
+- `execute_concurrently(factory: AsyncAdapterFactory, workflow: str, model: str, count: int) -> None`: Executes workflows concurrently in temporary workspaces.
+- `served() -> StubProviderServer`: Starts a stub provider server with the scripted tool calls.
+- `benchmarks() -> List[Benchmark]`: Returns the workflow benchmarks.
+"""
+
+from chatdev import WorkflowManager, AsyncWorkflowManager
+from chatdev.adapters import AdapterFactory, AsyncAdapterFactory, StubScript, StreamHandler
+from .benchmark import Benchmark
+from .stub_provider_server import StubProviderServer
+from chatdev.entities import Workflow
+from .fixtures import stub_workflow, branching_workflow, tool_calls, quiet
+from tempfile import mkdtemp
+from shutil import rmtree
+from asyncio import run, gather
+from typing import List
+
+def execute(factory: AdapterFactory, workflow: str, model: str, scoped_threads: bool = False) -> None:
+  """
+  Executes a workflow with every role using the model in a temporary workspace.
+  """
+  run_workflow(WorkflowManager(adapter_factory= factory, scoped_threads= scoped_threads), stub_workflow(workflow, model))
+
+def execute_branching(factory: AdapterFactory, max_concurrent_conversations: int) -> None:
+  """
+  Executes the branching workflow on the stub model in a temporary workspace.
+  """
+  run_workflow(WorkflowManager(adapter_factory= factory, max_concurrent_conversations= max_concurrent_conversations), branching_workflow("stub"))
+
+def run_workflow(workflow_manager: WorkflowManager, workflow: Workflow) -> None:
+  """
+  Executes the workflow silently in a temporary workspace.
+  """
+  workspace_path = mkdtemp(prefix= "chatdev-benchmark-")
+  try:
+    with quiet():
+      workflow_manager.execute(workflow, "A snake game", workspace_path)
+  finally:
+    rmtree(workspace_path)
+
+def execute_concurrently(factory: AsyncAdapterFactory, workflow: str, model: str, count: int) -> None:
+  """
+  Executes the workflow `count` times concurrently in temporary workspaces, like a batch.
+  """
+  workspace_paths = [mkdtemp(prefix= "chatdev-benchmark-") for _ in range(count)]
+  workflow_manager = AsyncWorkflowManager(adapter_factory= factory)
+
+  async def execute_all() -> None:
+    await gather(*[workflow_manager.execute(stub_workflow(workflow, model), "A snake game", workspace_path) for workspace_path in workspace_paths])
+
+  try:
+    with quiet():
+      run(execute_all())
+  finally:
+    for workspace_path in workspace_paths:
+      rmtree(workspace_path)
+
+def served() -> StubProviderServer:
+  """
+  Starts a stub provider server with the scripted tool calls.
+  """
+  return StubProviderServer(script= StubScript(tool_calls= tool_calls())).start()
+
+def benchmarks() -> List[Benchmark]:
+  """
+  Returns the workflow benchmarks. The stub adapter measures the overhead of the workflow manager, the adapters and
+  the tools, the OpenAI and Anthropic variants add the SDKs and HTTP on a local server. The batch variant waits 10ms
+  per response, so it measures how well concurrent workflows overlap their waits, the branching variants how well
+independent conversations of a workflow do.
+  """
+  def stub_factory() -> AdapterFactory:
+    return AdapterFactory(stub_script= StubScript(tool_calls= tool_calls()))
+
+  def streaming_factory() -> AdapterFactory:
+    return AdapterFactory(stream_handler= StreamHandler(), stub_script= StubScript(tool_calls= tool_calls()))
+
+  def openai_factory(server: StubProviderServer) -> AdapterFactory:
+    from openai import OpenAI
+    return AdapterFactory(openai_client= OpenAI(base_url= f"{server.url()}/v1", api_key= "stub", max_retries= 0))
+
+  def anthropic_factory(server: StubProviderServer) -> AdapterFactory:
+    from anthropic import Anthropic
+    return AdapterFactory(anthropic_client= Anthropic(base_url= server.url(), api_key= "stub", max_retries= 0))
+
+  def latency_factory() -> AdapterFactory:
+    return AdapterFactory(stub_script= StubScript(tool_calls= tool_calls(), latency= StubScript.fixed(0.01)))
+
+  def batch_factory() -> AsyncAdapterFactory:
+    return AsyncAdapterFactory(stub_script= StubScript(tool_calls= tool_calls(), latency= StubScript.fixed(0.01)))
+
+  return [
+    Benchmark("workflow.stub.tiny", lambda factory: execute(factory, "tiny_software_development", "stub"), setup= stub_factory),
+    Benchmark("workflow.stub.medium", lambda factory: execute(factory, "medium_software_development", "stub"), setup= stub_factory),
+    Benchmark("workflow.stub.medium.scoped", lambda factory: execute(factory, "medium_software_development", "stub", scoped_threads= True), setup= stub_factory),
+    Benchmark("workflow.stub.medium.streaming", lambda factory: execute(factory, "medium_software_development", "stub"), setup= streaming_factory),
+    Benchmark("workflow.stub.branching.sequential", lambda factory: execute_branching(factory, 1), setup= latency_factory, repeat= 3),
+    Benchmark("workflow.stub.branching.concurrent", lambda factory: execute_branching(factory, 4), setup= latency_factory, repeat= 3),
+    Benchmark("workflow.stub.batch", lambda factory: execute_concurrently(factory, "tiny_software_development", "stub", 8), setup= batch_factory, repeat= 3),
+    Benchmark("workflow.openai.tiny", lambda state: execute(openai_factory(state), "tiny_software_development", "gpt-4o"), setup= served, teardown= StubProviderServer.stop, repeat= 3),
+    Benchmark("workflow.anthropic.tiny", lambda state: execute(anthropic_factory(state), "tiny_software_development", "claude-3-5-sonnet-latest"), setup= served, teardown= StubProviderServer.stop, repeat= 3)
+  ]
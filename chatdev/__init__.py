@@ -2,4 +2,9 @@
 Re-export of all root-level modules
 """
 
+from .workflow_checkpoint import WorkflowCheckpoint
+from .workflow_scheduler import WorkflowScheduler
+from .branch_request import BranchRequest
 from .workflow_manager import WorkflowManager
+from .async_workflow_manager import AsyncWorkflowManager
+from .batch_runner import BatchRunner
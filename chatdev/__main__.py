@@ -2,17 +2,38 @@
 This script is the main entry point for the ChatDev application.
 
 Modules Imported:
+- `getenv` from `os`: Reads configuration from environment variables.
+- `ArgumentParser`, `Namespace` from `argparse`: Parses the command line arguments.
+- `run` from `asyncio`: Runs the batch runner on an event loop.
+- `stdin` from `sys`: Reads the input of non-interactive runs.
+- `deepcopy` from `copy`: Copies the selected workflow before its models are overridden.
+- `Dict`, `Optional` from `typing`: Specifies dict and optional types.
 - `load_dotenv` from `dotenv`: Loads environment variables from .env files.
-- `OpenAI` from `openai`: Initializes the OpenAI client.
-- `Anthropic` from `anthropic`: Initializes the Anthropic client.
-- Various components from the `chatdev` module: Initializes WorkflowManager, AdapterFactory, and workflows.
+- Various components from the `chatdev` module: Initializes WorkflowManager, BatchRunner, adapter factories, and workflows.
 
 Main Function:
 The `main` function is the main entry point for the application and performs the following tasks:
 1. Loads environment variables from `.env` and `.env.local` files.
-2. Initializes the `AdapterFactory` with OpenAI and Anthropic clients.
+2. Initializes the `AdapterFactory`, streaming responses live to stdout unless conversations run concurrently. The OpenAI and Anthropic clients and SDKs
+   are only loaded once a model of their provider is used.
+   If `CHATDEV_RESPONSE_CACHE` is set to `record` or `replay`, LLM responses are recorded to or replayed from `.chatdev-cache`.
+   `CHATDEV_<PROVIDER>_REQUESTS_PER_MINUTE` and `CHATDEV_<PROVIDER>_TOKENS_PER_MINUTE` limit the requests per provider,
+   failed requests are retried by the adapters instead of the clients. Both clients share the connections of one `HttpClientPool`.
+   Threads are compacted by a `ThreadCompactor` before they are sent. If `CHATDEV_HTTP_CACHE` names a directory,
+   responses to GET requests of the request tool are cached there. `CHATDEV_READ_FILE_MAX_BYTES` caps the bytes
+   `read_file` returns at once, 100 kB by default.
 3. Creates a `WorkflowManager` instance with the adapter factory.
-4. Executes the documentation workflow based on user input.
+4. Executes the workflow selected with `--workflow` (`medium_software_development` by default) in the workspace of
+   `--workspace`, with the input of `--input`, `--input-file` or stdin, and asks for it only on a terminal.
+   `--model` overrides the model of every role, `--role-model <role>=<model>` the model of a single role.
+
+With `--batch <jobs.jsonl>` the jobs of the file are executed concurrently by a `BatchRunner` instead,
+without streaming, and their results are appended to `--output` (`<jobs>.results.jsonl` by default).
+With `--resume <workspace>` an interrupted run continues from its last checkpoint, model overrides apply to it as well.
+With `--concurrent-conversations <n>` up to n independent conversations of a phase run at the same time, their
+messages are printed once complete instead of streamed, so they don't interleave.
+With `--scoped-threads` every conversation runs on its own thread holding the instructions and a brief of its input
+artifact instead of all earlier conversations, so its prompts don't grow with the workflow.
 
 Usage:
 ```python
@@ -23,36 +44,164 @@ if __name__ == '__main__':
 This condition ensures that the `main` function is called when the script is executed directly.
 """
 
+from os import getenv
+from argparse import ArgumentParser, Namespace
+from asyncio import run
+from sys import stdin
+from copy import deepcopy
+from typing import Dict, Optional
 from dotenv import load_dotenv
-from openai import OpenAI
-from anthropic import Anthropic
-from chatdev import WorkflowManager
-from chatdev.adapters import AdapterFactory
-from chatdev.workflows import medium_software_development_workflow, documentation_workflow
+from chatdev import WorkflowManager, AsyncWorkflowManager, BatchRunner, WorkflowCheckpoint
+from chatdev.adapters import AdapterFactory, AsyncAdapterFactory, PrintStreamHandler, ResponseCache, RateLimiter, HttpClientPool, HttpFetcher, FileReader, ThreadCompactor
+from chatdev.entities import Workflow
+from chatdev.workflows import workflows
+
+def rate_limiter(provider: str) -> RateLimiter:
+    """
+    Creates the rate limiter of a provider from the environment, limits that aren't set are unlimited.
+    """
+    requests_per_minute = getenv(f"CHATDEV_{provider.upper()}_REQUESTS_PER_MINUTE")
+    tokens_per_minute = getenv(f"CHATDEV_{provider.upper()}_TOKENS_PER_MINUTE")
+    return RateLimiter(
+        requests_per_minute= int(requests_per_minute) if requests_per_minute else None,
+        tokens_per_minute= int(tokens_per_minute) if tokens_per_minute else None
+    )
+
+def argument_parser() -> ArgumentParser:
+    """
+    Creates the parser of the command line arguments.
+    """
+    parser = ArgumentParser(prog= "chatdev", description= "Runs a ChatDev workflow, a batch of workflows or resumes an interrupted run.")
+    parser.add_argument("--workflow", choices= sorted(workflows), default= "medium_software_development", help= "Workflow to execute")
+    parser.add_argument("--workspace", help= "Workspace directory of the run, workspaces/<id> by default")
+    inputs = parser.add_mutually_exclusive_group()
+    inputs.add_argument("--input", help= "Input of the workflow, read from stdin or asked for if omitted")
+    inputs.add_argument("--input-file", help= "File containing the input of the workflow, - for stdin")
+    parser.add_argument("--model", help= "Model used by every role of the workflow")
+    parser.add_argument("--role-model", action= "append", default= [], metavar= "ROLE=MODEL", help= "Model used by one role, may be repeated")
+    parser.add_argument("--batch", help= "JSONL file of jobs to execute concurrently")
+    parser.add_argument("--output", help= "JSONL file the job results are appended to")
+    parser.add_argument("--concurrency", type= int, default= 4, help= "Maximum number of concurrent jobs")
+    parser.add_argument("--resume", help= "Workspace of an interrupted run to continue from its last checkpoint")
+    parser.add_argument("--concurrent-conversations", type= int, default= 1, help= "Maximum number of independent conversations of a phase run at the same time, without streaming if more than 1")
+    parser.add_argument("--scoped-threads", action= "store_true", help= "Run every conversation on its own thread seeded with the instructions and a brief of its input")
+    return parser
+
+def role_models(parser: ArgumentParser, arguments: Namespace) -> Dict[str, str]:
+    """
+    Parses the `--role-model` overrides into models by role name.
+    """
+    models = {}
+    for role_model in arguments.role_model:
+        role, separator, model = role_model.partition("=")
+        if separator == "" or role.strip() == "" or model.strip() == "":
+            parser.error(f"--role-model expects ROLE=MODEL, got '{role_model}'")
+        models[role.strip()] = model.strip()
+    return models
+
+def override_models(parser: ArgumentParser, workflow: Workflow, model: Optional[str], models: Dict[str, str]) -> Workflow:
+    """
+    Applies the model overrides to the roles of the workflow.
+    """
+    roles = { role.name: role for role in workflow.roles() }
+    unknown = [name for name in models if not name in roles]
+    if len(unknown) > 0:
+        parser.error(f"Unknown roles {', '.join(unknown)} of workflow {workflow.name}, known roles are {', '.join(roles)}")
+
+    for role in roles.values():
+        if not model is None:
+            role.model = model
+        role.model = models.get(role.name, role.model)
+    return workflow
+
+def read_input(arguments: Namespace) -> str:
+    """
+    Returns the input of the workflow from the arguments, a file or stdin, asking for it only on a terminal.
+    """
+    if not arguments.input is None:
+        return arguments.input
+    if not arguments.input_file is None and arguments.input_file != "-":
+        with open(arguments.input_file, 'r') as file:
+            return file.read().strip()
+    if arguments.input_file == "-" or not stdin.isatty():
+        return stdin.read().strip()
+    return input("What do you want to build?: ")
 
 def main():
     """
     The main entry point for the application.
 
-    Loads environment variables, initializes the adapter factory and workflow manager,
-    and executes the workflow based on user input.
+    Parses the arguments, loads environment variables, initializes the adapter factory and workflow manager,
+    and executes, batches or resumes the workflow.
     """
+    parser = argument_parser()
+    arguments = parser.parse_args()
+    models = role_models(parser, arguments)
+
     load_dotenv(".env")
     load_dotenv(".env.local", override=True)
 
+    response_cache_mode = getenv("CHATDEV_RESPONSE_CACHE")
+    response_cache = ResponseCache(mode= response_cache_mode) if response_cache_mode else None
+    rate_limiters = { provider: rate_limiter(provider) for provider in ["openai", "anthropic"] }
+    http_client_pool = HttpClientPool()
+    http_cache_directory = getenv("CHATDEV_HTTP_CACHE")
+    http_fetcher = HttpFetcher(http_client_pool= http_client_pool, cache_directory= http_cache_directory or None)
+    read_file_max_bytes = getenv("CHATDEV_READ_FILE_MAX_BYTES")
+    file_reader = FileReader(max_bytes= int(read_file_max_bytes)) if read_file_max_bytes else FileReader()
+
+    if not arguments.batch is None:
+        if not arguments.model is None or len(models) > 0:
+            parser.error("--model and --role-model don't apply to --batch, the jobs select their workflows")
+
+        batch_factory = AsyncAdapterFactory(
+            response_cache= response_cache,
+            rate_limiters= rate_limiters,
+            http_client_pool= http_client_pool,
+            compactor= ThreadCompactor(),
+            http_fetcher= http_fetcher,
+            file_reader= file_reader
+        )
+        batch_runner = BatchRunner(
+            workflow_manager= AsyncWorkflowManager(adapter_factory= batch_factory, max_concurrent_conversations= arguments.concurrent_conversations, scoped_threads= arguments.scoped_threads),
+            max_concurrency= arguments.concurrency
+        )
+        results_path = arguments.output if not arguments.output is None else f"{arguments.batch.removesuffix('.jsonl')}.results.jsonl"
+        results = run(batch_runner.run(arguments.batch, results_path))
+        failures = [result for result in results if result["status"] == "failure"]
+        print(f"{len(results) - len(failures)} of {len(results)} jobs succeeded, results were written to {results_path}")
+        print(f"Adapter and connection statistics: {batch_factory.stats()}")
+        return
+
     factory = AdapterFactory(
-        openai_client= OpenAI(),
-        anthropic_client= Anthropic()
+        # Streams of concurrent conversations would interleave, their messages are printed once complete instead
+        stream_handler= PrintStreamHandler() if arguments.concurrent_conversations <= 1 else None,
+        response_cache= response_cache,
+        rate_limiters= rate_limiters,
+        http_client_pool= http_client_pool,
+        compactor= ThreadCompactor(),
+        http_fetcher= http_fetcher,
+        file_reader= file_reader
     )
 
     workflow_manager = WorkflowManager(
-        adapter_factory= factory
+        adapter_factory= factory,
+        max_concurrent_conversations= arguments.concurrent_conversations,
+        scoped_threads= arguments.scoped_threads
     )
 
+    if not arguments.resume is None:
+        workflow = workflow_manager.checkpoint_workflow(WorkflowCheckpoint.load(arguments.resume))
+        workflow_manager.resume(
+            workspace_path= arguments.resume,
+            workflow= override_models(parser, workflow, arguments.model, models)
+        )
+        return
+
     workflow_manager.execute(
-        workflow= medium_software_development_workflow,
-        input= input("What do you want to build?: "),
-        workspace_path= None
+        workflow= override_models(parser, deepcopy(workflows[arguments.workflow]), arguments.model, models),
+        input= read_input(arguments),
+        workspace_path= arguments.workspace
     )
 
 if __name__ == '__main__':
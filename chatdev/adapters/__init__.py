@@ -1,5 +1,42 @@
 from .adapter_factory import AdapterFactory
 from .adapter import Adapter
+from .tool_executor import ToolExecutor
+from .concurrent_tool_executor import ConcurrentToolExecutor
+from .response_budget import ResponseBudget
+from .response_result import ResponseResult
+from .response_request import ResponseRequest
+from .call_record import CallRecord
+from .usage_report import UsageReport
+from .stream_handler import StreamHandler
+from .print_stream_handler import PrintStreamHandler
+from .response_cache import ResponseCache
+from .rate_limiter import RateLimiter
+from .retry_policy import RetryPolicy
+from .http_client_pool import HttpClientPool
+from .http_fetcher import HttpFetcher
+from .thread_compactor import ThreadCompactor
+from .workspace_index import WorkspaceIndex
+from .file_reader import FileReader
+from .file_editor import FileEditor
+from .docker_session import DockerSession
+from .stub_script import StubScript
+from .stub_adapter import StubAdapter
 
-from .openai_adapter import OpenAIAdapter
-from .anthropic_adapter import AnthropicAdapter
+from .async_adapter_factory import AsyncAdapterFactory
+from .async_adapter import AsyncAdapter
+from .async_stub_adapter import AsyncStubAdapter
+
+from importlib import import_module
+
+# The provider adapters import the provider SDKs, which are slow to import, so they are loaded on first access
+lazy_exports = {
+  "OpenAIAdapter": ".openai_adapter",
+  "AnthropicAdapter": ".anthropic_adapter",
+  "AsyncOpenAIAdapter": ".async_openai_adapter",
+  "AsyncAnthropicAdapter": ".async_anthropic_adapter"
+}
+
+def __getattr__(name: str):
+  if name in lazy_exports:
+    return getattr(import_module(lazy_exports[name], __name__), name)
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
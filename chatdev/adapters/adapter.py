@@ -2,14 +2,28 @@
 This module contains the Adapter class which interacts with various tools and AI models.
 
 Modules Imported:
-- `List` from `typing`: Specifies list type.
-- `Thread`, `Tool`, `Message`, `ToolUseBlock`, `ToolResultBlock` from `chatdev.entities`: Represents various components of workflows and tool interactions.
-- `makedirs`, `path`, `walk` from `os`: Manages file and directory operations.
-- `dumps` from `json`: Serializes Python objects to JSON format.
+- `Dict`, `List`, `Optional`, `Tuple` from `typing`: Specifies dict, list, optional and tuple types.
+- `Thread`, `ThreadJournal`, `Tool`, `Message`, `TextBlock`, `ToolUseBlock`, `ToolResultBlock`, `Usage` from `chatdev.entities`: Represents various components of workflows and tool interactions.
+- `makedirs`, `path` from `os`: Manages file and directory operations.
 - `compile`, `Pattern` from `re`: Compiles regular expressions for pattern matching.
 - `run` from `subprocess`: Executes shell commands.
 - `format_exception` from `traceback`: Formats exception traceback for error handling.
-- `request` from `requests`: Sends HTTP requests.
+- `ToolExecutor` from `.tool_executor`: Runs the tool calls of a message.
+- `ResponseBudget` from `.response_budget`: Limits the LLM calls of a conversation.
+- `ResponseResult` from `.response_result`: Describes the outcome of a response.
+- `StreamHandler` from `.stream_handler`: Receives streamed output.
+- `ResponseCache` from `.response_cache`: Records and replays LLM responses.
+- `RateLimiter` from `.rate_limiter`: Keeps the requests within the rate limits of the provider.
+- `RetryPolicy` from `.retry_policy`: Decides whether and when failed requests are retried.
+- `ThreadCompactor` from `.thread_compactor`: Shrinks the thread sent to the provider.
+- `CallRecord` from `.call_record`: Records the timing and usage of LLM and tool calls.
+- `WorkspaceIndex` from `.workspace_index`: Lists the files of a workspace incrementally.
+- `FileReader` from `.file_reader`: Reads capped ranges of files.
+- `FileEditor` from `.file_editor`: Applies patches to files atomically.
+- `DockerSession` from `.docker_session`: Runs commands in a long-lived container per workspace.
+- `HttpFetcher` from `.http_fetcher`: Sends the requests of the request tool.
+- `dumps` from `json`: Serializes requests to estimate their tokens.
+- `monotonic`, `sleep`, `time` from `time`: Times calls and waits before retrying failed requests.
 
 Classes:
 - `Adapter`: Manages interactions with tools and AI responses.
@@ -17,37 +31,94 @@ Classes:
 `Adapter` Class:
 Attributes:
 - `tools` (List[Tool]): List of tools available for interactions.
+- `model` (str): The model identifier, set by the provider adapters.
+- `tool_executor` (ToolExecutor): Runs the tool calls of a message, sequentially unless configured otherwise.
+- `stream_handler` (Optional[StreamHandler]): Receives the output of streamed responses, responses are only streamed if set.
+- `response_cache` (Optional[ResponseCache]): Records and replays LLM responses, if set.
+- `rate_limiter` (Optional[RateLimiter]): Limits the requests to the provider, usually shared by all adapters of a provider.
+- `retry_policy` (Optional[RetryPolicy]): Retries failed requests, requests are not retried if unset.
+- `compactor` (Optional[ThreadCompactor]): Compacts the thread before each LLM call, the full thread is sent if unset.
+- `workspace_indexes` (Dict[str, WorkspaceIndex]): The file index per workspace path, usually shared by all adapters of a factory.
+- `docker_sessions` (Dict[str, DockerSession]): The docker session per workspace path, usually shared by all adapters of a factory.
+- `http_fetcher` (HttpFetcher): Sends the requests of the `request` tool, usually shared by all adapters of a factory.
+- `max_listed_files` (int): The maximum number of paths `list_files` returns.
+- `file_reader` (FileReader): Reads the ranges of files `read_file` returns, capped to 100 kB by default, usually shared by all adapters of a factory.
+- `file_editor` (FileEditor): Applies the diffs and search/replace edits of `edit_file`.
+- `connection_errors` (tuple): The exception types of the provider client that are retried like transient HTTP errors.
 
 Methods:
-- `generate_llm_response(self, thread: Thread) -> None`: Generates LLM response (implementation pending).
-- `generate_response(self, thread: Thread) -> None`: Generates response by dumping thread data and executing tools.
-- `dump_thread(self, thread: Thread) -> None`: Dumps the thread data in JSON format.
-- `execute_tools(self, thread: Thread) -> None`: Executes tool commands and handles results and errors.
+- `__init__(self, tool_executor: Optional[ToolExecutor] = None, stream_handler: Optional[StreamHandler] = None, response_cache: Optional[ResponseCache] = None, rate_limiter: Optional[RateLimiter] = None, retry_policy: Optional[RetryPolicy] = None, compactor: Optional[ThreadCompactor] = None, workspace_indexes: Optional[Dict[str, WorkspaceIndex]] = None, docker_sessions: Optional[Dict[str, DockerSession]] = None, http_fetcher: Optional[HttpFetcher] = None, file_reader: Optional[FileReader] = None)`: Initializes the Adapter with the given tool executor, stream handler, response cache, rate limiter, retry policy, compactor, workspace indexes, docker sessions, HTTP fetcher and file reader.
+- `generate_llm_response(self, thread: Thread, stop_phrases: Optional[List[str]] = None) -> CallRecord`: Generates LLM response, served from the response cache if possible, appends it to the thread and returns the record of the call.
+- `compacted_thread(self, thread: Thread) -> Thread`: Returns the view of the thread that is sent to the provider.
+- `cached_llm_response(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Optional[str], Optional[Tuple[Message, Usage]]]`: Returns the cache key of the request and the cached response, if any.
+- `store_llm_response(self, key: Optional[str], message: Message, usage: Usage)`: Stores a response in the response cache, if any.
+- `send_limited_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]`: Sends the request within the rate limits and retries it on transient errors.
+- `estimated_tokens(self, request: dict) -> int`: Roughly estimates the tokens of a request for the rate limiter.
+- `retry_delay(self, attempt: int, error: Exception) -> Optional[float]`: Returns the seconds to wait before retrying a failed request, `None` if it is not retried.
+- `llm_request(self, thread: Thread) -> dict`: Builds the provider request for the thread (implementation pending).
+- `send_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]`: Sends the request to the provider (implementation pending). Streamed responses end as soon as a stop phrase appears.
+- `replay_to_stream_handler(self, message: Message)`: Passes a cached message to the stream handler as if it was streamed.
+- `generate_response(self, thread: Thread, budget: Optional[ResponseBudget] = None, stop_phrases: Optional[List[str]] = None) -> ResponseResult`: Alternates LLM calls and tool calls until the model answers without tools or the budget is exhausted.
+- `dump_thread(self, thread: Thread) -> None`: Appends new messages of the thread to its journal.
+- `execute_tools(self, thread: Thread) -> List[CallRecord]`: Executes the tool calls of the last message, appends their results and returns the records of the calls.
+- `recorded_execute_tool(self, thread: Thread, block: ToolUseBlock, records: List[CallRecord]) -> ToolResultBlock`: Safely executes a tool and adds the record of the call.
 - `safe_execute_tool(self, thread: Thread, block: ToolUseBlock) -> ToolResultBlock`: Safely executes a tool and handles errors.
 - `execute_tool(self, thread: Thread, block: ToolUseBlock) -> ToolResultBlock`: Executes a specific tool command based on the block name.
-- `list_files_recursive(self, base_path: str, ignore_patterns: List[Pattern]) -> List[str]`: Lists files recursively, ignoring specified patterns.
+- `workspace_index(self, workspace_path: str) -> WorkspaceIndex`: Returns the file index of the workspace, creating it on first use.
+- `docker_session(self, workspace_path: str) -> DockerSession`: Returns the docker session of the workspace, creating it on first use.
+- `list_files_recursive(self, base_path: str, ignore_patterns: List[Pattern]) -> List[str]`: Lists the indexed files of the workspace, ignoring specified patterns.
 """
 
-from typing import List
-from chatdev.entities import Thread, Tool, Message, ToolUseBlock, ToolResultBlock
-from os import makedirs, path, walk
-from json import dumps
+from typing import Dict, List, Optional, Tuple
+from chatdev.entities import Thread, ThreadJournal, Tool, Message, TextBlock, ToolUseBlock, ToolResultBlock, Usage
+from os import makedirs, path
 from re import Pattern, compile
 from subprocess import run
 from traceback import format_exception
-from requests import request
+from .tool_executor import ToolExecutor
+from .response_budget import ResponseBudget
+from .response_result import ResponseResult
+from .stream_handler import StreamHandler
+from .response_cache import ResponseCache
+from .rate_limiter import RateLimiter
+from .retry_policy import RetryPolicy
+from .thread_compactor import ThreadCompactor
+from .call_record import CallRecord
+from .workspace_index import WorkspaceIndex
+from .file_reader import FileReader
+from .file_editor import FileEditor
+from .docker_session import DockerSession
+from .http_fetcher import HttpFetcher
+from json import dumps
+from time import monotonic, sleep, time
 
 class Adapter:
 
   read_file_tool: Tool = Tool(
      name= "read_file",
-     description= "allows you to read files and shall be used anytime something similar to reading a file should be achieved. It returns the full content of the file.",
+     description= "allows you to read files and shall be used anytime something similar to reading a file should be achieved. It returns a header with the size and line count of the file followed by its content. Large files are truncated, read them in line ranges.",
      input_schema= {
       "type": "object",
       "properties": {
         "file_path": {
           "type": "string",
           "description": "path to the file that should be read"
+        },
+        "start_line": {
+          "type": "integer",
+          "description": "first line to read, starting at 1"
+        },
+        "end_line": {
+          "type": "integer",
+          "description": "last line to read, inclusive"
+        },
+        "start_byte": {
+          "type": "integer",
+          "description": "first byte to read if no lines are given, starting at 0"
+        },
+        "end_byte": {
+          "type": "integer",
+          "description": "byte to stop reading at if no lines are given, exclusive"
         }
       },
       "required": ["file_path"]
@@ -73,9 +144,46 @@ class Adapter:
     }
   )
 
+  edit_file_tool: Tool = Tool(
+    name= "edit_file",
+    description= "allows you to change parts of an existing file without sending all of its content. Prefer it over write_file for changes to existing files. Provide either a unified diff or search/replace edits. All edits are checked against the current file first, if one doesn't match nothing is changed. It returns a summary of the changes.",
+    input_schema= {
+      "type": "object",
+      "properties": {
+        "file_path": {
+          "type": "string",
+          "description": "path to the file that should be edited"
+        },
+        "diff": {
+          "type": "string",
+          "description": "a unified diff of the file with hunks like \"@@ -12,3 +12,4 @@\" followed by context lines starting with a space, removed lines starting with - and added lines starting with +"
+        },
+        "edits": {
+          "type": "array",
+          "description": "search/replace edits applied in order, every search text has to occur exactly once in the file",
+          "items": {
+            "type": "object",
+            "properties": {
+              "search": {
+                "type": "string",
+                "description": "the exact text to replace, including enough lines to be unique"
+              },
+              "replace": {
+                "type": "string",
+                "description": "the text to replace it with"
+              }
+            },
+            "required": ["search", "replace"]
+          }
+        }
+      },
+      "required": ["file_path"]
+    }
+  )
+
   list_files_tool: Tool = Tool(
     name= "list_files",
-    description= "allows you to list files and shall be used anytime something similar to listing a file should be achieved. It returns an formatted list of file paths. Always use the first parameter and ignore files like node_modules, .git and similar ones you can think of.",
+    description= "allows you to list files and shall be used anytime something similar to listing a file should be achieved. It returns an formatted list of file paths. Folders like node_modules, .git and .venv and everything ignored by .gitignore files are skipped already, use the first parameter to ignore other files you don't need.",
     input_schema= {
       "type": "object",
       "properties": {
@@ -109,6 +217,29 @@ class Adapter:
     }
   )
 
+  docker_session_tool: Tool = Tool(
+    name= "docker_session",
+    description= "Runs a shell command in a container that stays alive for the whole workflow, so installed dependencies, caches and build outputs are kept between commands. Prefer it over docker run for installing, building and testing. Your workspace is mounted at /workspace, which is the working directory of every command. It returns the exit code and the combined stdout and stderr, long outputs are shortened in the middle.",
+    input_schema= {
+      "type": "object",
+      "properties": {
+        "command": {
+          "type": "string",
+          "description": "the shell command to run, e.g. \"pip install -r requirements.txt && pytest\""
+        },
+        "image": {
+          "type": "string",
+          "description": "the image of the container, e.g. \"python:3.12\" or \"node:20\". Only needed for the first command, a different image replaces the container and loses its state."
+        },
+        "timeout": {
+          "type": "integer",
+          "description": "seconds the command may run before it is stopped, 300 by default"
+        }
+      },
+      "required": ["command"]
+    }
+  )
+
   request_tool: Tool = Tool(
     name= "request",
     description= "Allows you to send HTTP requests to anywhere. You can grab any HTTP resource and construct dynamic requests to get additional content, test HTTP endpoints, request APIs, use search engines, fill out forms etc.",
@@ -141,41 +272,181 @@ class Adapter:
   tools: List[Tool] = [
     read_file_tool,
     write_file_tool,
+    edit_file_tool,
     list_files_tool,
     docker_tool,
+    docker_session_tool,
     request_tool
   ]
 
-  def generate_llm_response(self, thread: Thread) -> None:
+  model: str
+  tool_executor: ToolExecutor
+  stream_handler: Optional[StreamHandler]
+  response_cache: Optional[ResponseCache]
+  rate_limiter: Optional[RateLimiter]
+  retry_policy: Optional[RetryPolicy]
+  compactor: Optional[ThreadCompactor]
+  workspace_indexes: Dict[str, WorkspaceIndex]
+  docker_sessions: Dict[str, DockerSession]
+  http_fetcher: HttpFetcher
+  file_reader: FileReader
+
+  connection_errors: tuple = ()
+  max_listed_files: int = 2000
+  file_editor: FileEditor = FileEditor()
+
+  def __init__(self, tool_executor: Optional[ToolExecutor] = None, stream_handler: Optional[StreamHandler] = None, response_cache: Optional[ResponseCache] = None, rate_limiter: Optional[RateLimiter] = None, retry_policy: Optional[RetryPolicy] = None, compactor: Optional[ThreadCompactor] = None, workspace_indexes: Optional[Dict[str, WorkspaceIndex]] = None, docker_sessions: Optional[Dict[str, DockerSession]] = None, http_fetcher: Optional[HttpFetcher] = None, file_reader: Optional[FileReader] = None):
+    self.tool_executor = tool_executor if not tool_executor is None else ToolExecutor()
+    self.stream_handler = stream_handler
+    self.response_cache = response_cache
+    self.rate_limiter = rate_limiter
+    self.retry_policy = retry_policy
+    self.compactor = compactor
+    self.workspace_indexes = workspace_indexes if not workspace_indexes is None else {}
+    self.docker_sessions = docker_sessions if not docker_sessions is None else {}
+    self.http_fetcher = http_fetcher if not http_fetcher is None else HttpFetcher()
+    self.file_reader = file_reader if not file_reader is None else FileReader()
+
+  def generate_llm_response(self, thread: Thread, stop_phrases: Optional[List[str]] = None) -> CallRecord:
+    started_at = time()
+    started = monotonic()
+    request = self.llm_request(self.compacted_thread(thread))
+
+    key, cached = self.cached_llm_response(request, stop_phrases)
+    if not cached is None:
+      message, usage = cached
+    else:
+      message, usage = self.send_limited_llm_request(request, stop_phrases)
+      self.store_llm_response(key, message, usage)
+
+    thread.append_message(message)
+    return CallRecord(kind= "llm", name= self.model, started_at= started_at, seconds= monotonic() - started, usage= usage, cached= not cached is None)
+
+  def send_limited_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]:
+    estimated_tokens = self.estimated_tokens(request)
+    attempt = 0
+
+    while True:
+      if not self.rate_limiter is None:
+        self.rate_limiter.acquire(estimated_tokens)
+      try:
+        message, usage = self.send_llm_request(request, stop_phrases)
+      except Exception as e:
+        # A failed attempt consumed no tokens, its reservation must not throttle the retry or other requests
+        if not self.rate_limiter is None:
+          self.rate_limiter.settle(estimated_tokens, 0)
+        delay = self.retry_delay(attempt, e)
+        if delay is None:
+          raise
+        sleep(delay)
+        attempt += 1
+        continue
+
+      if not self.rate_limiter is None:
+        self.rate_limiter.settle(estimated_tokens, usage.total_tokens())
+      return message, usage
+
+  def estimated_tokens(self, request: dict) -> int:
+    # About four characters per token, plus the tokens the response may generate
+    return len(dumps(request.get("messages", []), default= str)) // 4 + request.get("max_tokens", 1000)
+
+  def retry_delay(self, attempt: int, error: Exception) -> Optional[float]:
+    if self.retry_policy is None:
+      return None
+
+    delay = self.retry_policy.delay(attempt, error, isinstance(error, self.connection_errors))
+    if not delay is None and not self.rate_limiter is None and RetryPolicy.status_code(error) == 429:
+      # The provider's limit was hit, hold back every request of this provider, not only this one
+      self.rate_limiter.pause(delay)
+    return delay
+
+  def compacted_thread(self, thread: Thread) -> Thread:
+    if self.compactor is None:
+      return thread
+    return self.compactor.compact(thread, self.model)
+
+  def cached_llm_response(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Optional[str], Optional[Tuple[Message, Usage]]]:
+    if self.response_cache is None:
+      return None, None
+
+    key = self.response_cache.key(request, stop_phrases)
+    cached = self.response_cache.get(key)
+    if not cached is None:
+      self.replay_to_stream_handler(cached[0])
+    return key, cached
+
+  def store_llm_response(self, key: Optional[str], message: Message, usage: Usage) -> None:
+    if not self.response_cache is None and not key is None:
+      self.response_cache.set(key, message, usage)
+
+  def llm_request(self, thread: Thread) -> dict:
     pass
 
-  def generate_response(self, thread: Thread) -> None: 
-    self.generate_llm_response(thread)
-    self.dump_thread(thread)
-    self.execute_tools(thread)
+  def send_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]:
+    pass
 
-  def dump_thread(self, thread: Thread) -> None:
-    dump_path = f"{thread.workspace_path}/.chatdev-thread.json"
-    makedirs(path.dirname(dump_path), exist_ok= True)
-    with open(dump_path, 'w') as file:
-      file.write(dumps(thread.dict(), indent= 2))
+  def replay_to_stream_handler(self, message: Message) -> None:
+    if self.stream_handler is None:
+      return
+    self.stream_handler.on_message_start()
+    for block in message.content:
+      if isinstance(block, TextBlock):
+        self.stream_handler.on_text(block.text)
+      elif isinstance(block, ToolUseBlock):
+        self.stream_handler.on_tool_use(block)
+    self.stream_handler.on_message_end(message)
+
+  def generate_response(self, thread: Thread, budget: Optional[ResponseBudget] = None, stop_phrases: Optional[List[str]] = None) -> ResponseResult:
+    budget = budget if not budget is None else ResponseBudget()
+    budget.start()
+    turns = 0
+    usage = Usage()
+    records = []
 
-  def execute_tools(self, thread: Thread) -> None:
     while True:
-      tool_use_blocks = thread.last_message_tool_use_blocks()
-      if len(tool_use_blocks) == 0:
-        break
+      stop_reason = budget.stop_reason()
+      if not stop_reason is None:
+        return ResponseResult(turns= turns, usage= usage, stop_reason= stop_reason, records= records)
+
+      record = self.generate_llm_response(thread, stop_phrases)
+      budget.consume(record.usage)
+      turns += 1
+      usage = usage + record.usage
+      records.append(record)
+      self.dump_thread(thread)
+
+      if len(thread.last_message_tool_use_blocks()) == 0:
+        return ResponseResult(turns= turns, usage= usage, stop_reason= "end_turn", records= records)
 
-      tool_result_blocks = [self.safe_execute_tool(thread, block) for block in tool_use_blocks]
+      records.extend(self.execute_tools(thread))
+      self.dump_thread(thread)
+
+  def dump_thread(self, thread: Thread) -> None:
+    if thread.journal is None:
+      thread.journal = ThreadJournal(workspace_path= thread.workspace_path)
+    thread.journal.sync(thread)
+
+  def execute_tools(self, thread: Thread) -> List[CallRecord]:
+    tool_use_blocks = thread.last_message_tool_use_blocks()
+    if len(tool_use_blocks) == 0:
+      return []
+
+    records = []
+    tool_result_blocks = self.tool_executor.execute(tool_use_blocks, lambda block: self.recorded_execute_tool(thread, block, records))
+    thread.append_message(
+      Message(
+        role= "user",
+        content= tool_result_blocks
+      )
+    )
+    return sorted(records, key= lambda record: record.started_at)
 
-      if len(tool_result_blocks) > 0:
-        thread.append_message(
-          Message(
-            role= "user",
-            content= tool_result_blocks
-          )
-        )
-        self.generate_response(thread)
+  def recorded_execute_tool(self, thread: Thread, block: ToolUseBlock, records: List[CallRecord]) -> ToolResultBlock:
+    started_at = time()
+    started = monotonic()
+    result = self.safe_execute_tool(thread, block)
+    records.append(CallRecord(kind= "tool", name= block.name, started_at= started_at, seconds= monotonic() - started, error= result.error))
+    return result
 
   def safe_execute_tool(self, thread: Thread, block: ToolUseBlock) -> ToolResultBlock:
     try:
@@ -192,29 +463,49 @@ class Adapter:
     if block.name == "read_file":
       input_file_path = block.input["file_path"]
       workspace_file_path = f"{thread.workspace_path}/{input_file_path}"
-      with open(workspace_file_path, 'r') as file:
-        content = file.read()
-        return ToolResultBlock(
-          id= block.id,
-          output= content
-        )
+      content = self.file_reader.read(
+        workspace_file_path,
+        start_line= block.input.get("start_line"),
+        end_line= block.input.get("end_line"),
+        start_byte= block.input.get("start_byte"),
+        end_byte= block.input.get("end_byte")
+      )
+      return ToolResultBlock(
+        id= block.id,
+        output= content
+      )
     elif block.name == "write_file":
       input_file_path = block.input["file_path"]
       workspace_file_path = f"{thread.workspace_path}/{input_file_path}"
       input_content = block.input["content"]
-      makedirs(path.dirname(workspace_file_path), exist_ok= True)
-      with open(workspace_file_path, 'w') as file:
-        content = file.write(input_content)
-        return ToolResultBlock(
-          id= block.id,
-          output= ""
-        )
+
+      def write_file() -> None:
+        makedirs(path.dirname(workspace_file_path), exist_ok= True)
+        with open(workspace_file_path, 'w') as file:
+          file.write(input_content)
+
+      self.workspace_index(thread.workspace_path).record_write(input_file_path, write_file)
+      return ToolResultBlock(
+        id= block.id,
+        output= ""
+      )
+    elif block.name == "edit_file":
+      input_file_path = block.input["file_path"]
+      workspace_file_path = f"{thread.workspace_path}/{input_file_path}"
+      summary = self.workspace_index(thread.workspace_path).record_write(input_file_path, lambda: self.file_editor.edit(workspace_file_path, diff= block.input.get("diff"), edits= block.input.get("edits")))
+      return ToolResultBlock(
+        id= block.id,
+        output= summary
+      )
     elif block.name == "list_files":
-      ignore_patterns = [compile(pattern) for pattern in block.input["ignore_patterns"]]
+      ignore_patterns = [compile(pattern) for pattern in block.input.get("ignore_patterns", [])]
       files_list = self.list_files_recursive(thread.workspace_path, ignore_patterns)
+      output = "\n".join(files_list[:self.max_listed_files])
+      if len(files_list) > self.max_listed_files:
+        output += f"\n... and {len(files_list) - self.max_listed_files} more files, use ignore_patterns to narrow the listing"
       return ToolResultBlock(
         id= block.id,
-        output= "\n".join(files_list)
+        output= output
       )
     elif block.name == "docker":
       arguments = block.input["arguments"]
@@ -225,27 +516,41 @@ class Adapter:
         id= block.id,
         output= result.stdout
       )
+    elif block.name == "docker_session":
+      return_code, output = self.docker_session(thread.workspace_path).execute(block.input["command"], image= block.input.get("image"), timeout= block.input.get("timeout"))
+      return ToolResultBlock(
+        id= block.id,
+        output= f"Exit code {return_code}\n{output}",
+        error= not return_code == 0
+      )
     elif block.name == "request":
       method = block.input.get("method", "GET")
       url = block.input["url"]
       headers = block.input.get("headers", {})
       body = block.input.get("body", None)
 
-      response = request(method, url, headers=headers, data=body)
-      
+      output, error = self.http_fetcher.fetch(method, url, headers= headers, body= body)
+
       return ToolResultBlock(
         id= block.id,
-        output= response.text if response.ok else f"Request failed: {response.status_code} {response.reason}",
-        error= not response.ok
+        output= output,
+        error= error
       )
     else:
       raise ValueError(f"Invalid tool name {block.name}!")
 
+  def workspace_index(self, workspace_path: str) -> WorkspaceIndex:
+    if not workspace_path in self.workspace_indexes:
+      self.workspace_indexes.setdefault(workspace_path, WorkspaceIndex(workspace_path))
+    return self.workspace_indexes[workspace_path]
+
+  def docker_session(self, workspace_path: str) -> DockerSession:
+    if not workspace_path in self.docker_sessions:
+      self.docker_sessions.setdefault(workspace_path, DockerSession(workspace_path))
+    return self.docker_sessions[workspace_path]
+
   def list_files_recursive(self, base_path: str, ignore_patterns: List[Pattern]) -> List[str]:
-    files_list = []
-    for root, dirs, files in walk(base_path):
-      for file in files:
-        file_path = path.join(root, file).removeprefix(base_path).removeprefix("/")
-        if not any(pattern.search(file_path) for pattern in ignore_patterns):
-          files_list.append(file_path)
-    return files_list
+    files_list = self.workspace_index(base_path).files()
+    if len(ignore_patterns) == 0:
+      return files_list
+    return [file_path for file_path in files_list if not any(pattern.search(file_path) for pattern in ignore_patterns)]
@@ -2,46 +2,183 @@
 This module defines the `AdapterFactory` class which creates specific adapters for AI models.
 
 Modules Imported:
-- `OpenAI` from `openai`: Initializes the OpenAI client.
-- `Anthropic` from `anthropic`: Initializes the Anthropic client.
-- `AnthropicAdapter` from `.anthropic_adapter`: Represents the adapter for Anthropic AI models.
-- `OpenAIAdapter` from `.openai_adapter`: Represents the adapter for OpenAI models.
+- `OpenAI` from `openai`: Initializes the OpenAI client, imported when the first OpenAI model is used.
+- `Anthropic` from `anthropic`: Initializes the Anthropic client, imported when the first Anthropic model is used.
+- `AnthropicAdapter` from `.anthropic_adapter`: Represents the adapter for Anthropic AI models, imported on first use.
+- `OpenAIAdapter` from `.openai_adapter`: Represents the adapter for OpenAI models, imported on first use.
+- `StubAdapter` from `.stub_adapter`: Represents the adapter answering `stub` models offline, imported on first use.
+- `StubScript` from `.stub_script`: Generates the responses of `stub` models.
 - `Adapter` from `.adapter`: Represents the generic adapter interface.
-- `List` from `typing`: Specifies list type (unused but imported).
+- `ToolExecutor` from `.tool_executor`: Runs the tool calls of a message.
+- `ConcurrentToolExecutor` from `.concurrent_tool_executor`: Runs independent tool calls of a message in parallel.
+- `StreamHandler` from `.stream_handler`: Receives streamed output.
+- `ResponseCache` from `.response_cache`: Records and replays LLM responses.
+- `RateLimiter` from `.rate_limiter`: Keeps the requests within the rate limits of a provider.
+- `RetryPolicy` from `.retry_policy`: Decides whether and when failed requests are retried.
+- `ThreadCompactor` from `.thread_compactor`: Shrinks the threads sent to the providers.
+- `HttpClientPool` from `.http_client_pool`: Provides the HTTP clients shared by the provider clients.
+- `WorkspaceIndex` from `.workspace_index`: Lists the files of a workspace incrementally.
+- `DockerSession` from `.docker_session`: Runs commands in a long-lived container per workspace.
+- `HttpFetcher` from `.http_fetcher`: Sends the requests of the request tool.
+- `FileReader` from `.file_reader`: Reads capped ranges of files.
+- `Lock` from `threading`: Guards the adapter cache.
+- `Any`, `Dict`, `List`, `Optional`, `TYPE_CHECKING` from `typing`: Specifies any, dict, list and optional types and imports the client types for type checking only.
 
 Classes:
 - `AdapterFactory`: Creates specific adapters for AI models based on the model identifier.
 
 `AdapterFactory` Class:
+The provider SDKs take most of the startup time, so they are only imported once a model of their provider is used.
+Clients that aren't given are created then as well, without retries of their own and over the HTTP client pool.
+Models starting with `stub` are answered offline by a `StubScript`, which takes the place of the client.
+
 Attributes:
-- `openai_client` (OpenAI): The OpenAI client.
-- `anthropic_client` (Anthropic): The Anthropic client.
+- `clients` (Dict[str, Any]): The client of each provider (`"openai"`, `"anthropic"`, `"stub"`) given or created so far.
+- `tool_executor` (ToolExecutor): The tool executor shared by all adapters, a `ConcurrentToolExecutor` by default.
+- `stream_handler` (Optional[StreamHandler]): The stream handler of all adapters, responses are streamed if set.
+- `response_cache` (Optional[ResponseCache]): The response cache shared by all adapters, if any.
+- `rate_limiters` (Dict[str, RateLimiter]): The rate limiter of each provider (`"openai"`, `"anthropic"`), shared by all adapters of the provider, unlimited by default.
+- `retry_policy` (RetryPolicy): The retry policy of all adapters.
+- `compactor` (Optional[ThreadCompactor]): The compactor shared by all adapters, threads are sent in full if unset.
+- `http_client_pool` (Optional[HttpClientPool]): The pool the HTTP clients of the provider clients were taken from, if any.
+- `workspace_indexes` (Dict[str, WorkspaceIndex]): The file index per workspace path shared by all adapters, so writes of one model are seen by the others.
+- `docker_sessions` (Dict[str, DockerSession]): The docker session per workspace path shared by all adapters, closed at the end of each workflow.
+- `http_fetcher` (HttpFetcher): Sends the requests of the `request` tool of all adapters, over the HTTP client pool if given.
+- `file_reader` (FileReader): Reads the files of the `read_file` tool of all adapters, its `max_bytes` caps the results.
+- `adapters` (Dict[str, Adapter]): The adapters created so far per model, adapters hold no per-thread state and are reused.
+- `lock` (Lock): Guards the adapter and client caches.
 
 Methods:
-- `__init__(self, openai_client: OpenAI, anthropic_client: Anthropic)`: Initializes the AdapterFactory with OpenAI and Anthropic clients.
-- `adapter(self, model: str) -> Adapter`: Creates and returns a specific adapter based on the model identifier.
+- `__init__(self, openai_client: Optional[OpenAI] = None, anthropic_client: Optional[Anthropic] = None, tool_executor: Optional[ToolExecutor] = None, stream_handler: Optional[StreamHandler] = None, response_cache: Optional[ResponseCache] = None, rate_limiters: Optional[Dict[str, RateLimiter]] = None, retry_policy: Optional[RetryPolicy] = None, http_client_pool: Optional[HttpClientPool] = None, compactor: Optional[ThreadCompactor] = None, http_fetcher: Optional[HttpFetcher] = None, file_reader: Optional[FileReader] = None, stub_script: Optional[StubScript] = None)`: Initializes the AdapterFactory with optional OpenAI and Anthropic clients, a tool executor, a stream handler, a response cache, rate limiters, a retry policy, the HTTP client pool of the clients, a thread compactor, the fetcher of tool requests, the reader of read_file and the script of stub models.
+- `rate_limiter(self, provider: str) -> RateLimiter`: Returns the rate limiter of the provider.
+- `adapter(self, model: str) -> Adapter`: Returns the adapter of the model, creating it on first use.
+- `create_adapter(self, model: str) -> Adapter`: Creates a specific adapter based on the model identifier.
+- `provider(self, model: str) -> str`: Returns the provider of the model.
+- `client(self, provider: str) -> Any`: Returns the client of the provider, creating it on first use.
+- `create_client(self, provider: str) -> Any`: Creates the client of the provider.
+- `adapter_class(self, provider: str) -> type`: Returns the adapter class of the provider.
+- `close_workspace(self, workspace_path: str)`: Stops the docker session of a workspace and drops its file index.
+- `stats(self) -> Dict[str, int]`: Returns the number of cached adapters and the statistics of the HTTP client pool.
 """
 
-from openai import OpenAI
-from anthropic import Anthropic
-from .anthropic_adapter import AnthropicAdapter
-from .openai_adapter import OpenAIAdapter
 from .adapter import Adapter
-from typing import List
+from .tool_executor import ToolExecutor
+from .concurrent_tool_executor import ConcurrentToolExecutor
+from .stream_handler import StreamHandler
+from .response_cache import ResponseCache
+from .rate_limiter import RateLimiter
+from .retry_policy import RetryPolicy
+from .thread_compactor import ThreadCompactor
+from .http_client_pool import HttpClientPool
+from .workspace_index import WorkspaceIndex
+from .docker_session import DockerSession
+from .http_fetcher import HttpFetcher
+from .file_reader import FileReader
+from .stub_script import StubScript
+from threading import Lock
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+  from openai import OpenAI
+  from anthropic import Anthropic
 
 class AdapterFactory:
-  openai_client: OpenAI
-  anthropic_client: Anthropic
+  clients: Dict[str, Any]
+  tool_executor: ToolExecutor
+  stream_handler: Optional[StreamHandler]
+  response_cache: Optional[ResponseCache]
+  rate_limiters: Dict[str, RateLimiter]
+  retry_policy: RetryPolicy
+  http_client_pool: Optional[HttpClientPool]
+  compactor: Optional[ThreadCompactor]
+  workspace_indexes: Dict[str, WorkspaceIndex]
+  docker_sessions: Dict[str, DockerSession]
+  http_fetcher: HttpFetcher
+  file_reader: FileReader
+  adapters: Dict[str, Adapter]
+  lock: Lock
+
+  def __init__(self, openai_client: Optional['OpenAI'] = None, anthropic_client: Optional['Anthropic'] = None, tool_executor: Optional[ToolExecutor] = None, stream_handler: Optional[StreamHandler] = None, response_cache: Optional[ResponseCache] = None, rate_limiters: Optional[Dict[str, RateLimiter]] = None, retry_policy: Optional[RetryPolicy] = None, http_client_pool: Optional[HttpClientPool] = None, compactor: Optional[ThreadCompactor] = None, http_fetcher: Optional[HttpFetcher] = None, file_reader: Optional[FileReader] = None, stub_script: Optional[StubScript] = None):
+    self.clients = { provider: client for provider, client in [("openai", openai_client), ("anthropic", anthropic_client), ("stub", stub_script)] if not client is None }
+    self.tool_executor = tool_executor if not tool_executor is None else ConcurrentToolExecutor()
+    self.stream_handler = stream_handler
+    self.response_cache = response_cache
+    self.rate_limiters = dict(rate_limiters) if not rate_limiters is None else {}
+    self.retry_policy = retry_policy if not retry_policy is None else RetryPolicy()
+    self.http_client_pool = http_client_pool
+    self.compactor = compactor
+    self.workspace_indexes = {}
+    self.docker_sessions = {}
+    self.http_fetcher = http_fetcher if not http_fetcher is None else HttpFetcher(http_client_pool= http_client_pool)
+    self.file_reader = file_reader if not file_reader is None else FileReader()
+    self.adapters = {}
+    self.lock = Lock()
 
-  def __init__(self, openai_client: OpenAI, anthropic_client: Anthropic):
-    self.openai_client = openai_client
-    self.anthropic_client = anthropic_client
+  def rate_limiter(self, provider: str) -> RateLimiter:
+    if not provider in self.rate_limiters:
+      self.rate_limiters[provider] = RateLimiter()
+    return self.rate_limiters[provider]
 
   def adapter(self, model: str) -> Adapter:
+    with self.lock:
+      if not model in self.adapters:
+        self.adapters[model] = self.create_adapter(model)
+      return self.adapters[model]
+
+  def create_adapter(self, model: str) -> Adapter:
+    provider = self.provider(model)
+    return self.adapter_class(provider)(client= self.client(provider), model= model, tool_executor= self.tool_executor, stream_handler= self.stream_handler, response_cache= self.response_cache, rate_limiter= self.rate_limiter(provider), retry_policy= self.retry_policy, compactor= self.compactor, workspace_indexes= self.workspace_indexes, docker_sessions= self.docker_sessions, http_fetcher= self.http_fetcher, file_reader= self.file_reader)
+
+  def provider(self, model: str) -> str:
     if model.startswith("gpt-"):
-      return OpenAIAdapter(client= self.openai_client, model= model)
-    
+      return "openai"
+
     if model.startswith("claude-"):
-      return AnthropicAdapter(client= self.anthropic_client, model= model)
+      return "anthropic"
+
+    if model.startswith("stub"):
+      return "stub"
     
     raise Exception("Could not resolve model")
+
+  def client(self, provider: str) -> Any:
+    if not provider in self.clients:
+      self.clients[provider] = self.create_client(provider)
+    return self.clients[provider]
+
+  def create_client(self, provider: str) -> Any:
+    if provider == "stub":
+      return StubScript()
+
+    # The adapters retry failed requests themselves
+    http_client = self.http_client_pool.client() if not self.http_client_pool is None else None
+    if provider == "openai":
+      from openai import OpenAI
+      return OpenAI(max_retries= 0, http_client= http_client)
+
+    from anthropic import Anthropic
+    return Anthropic(max_retries= 0, http_client= http_client)
+
+  def adapter_class(self, provider: str) -> type:
+    if provider == "openai":
+      from .openai_adapter import OpenAIAdapter
+      return OpenAIAdapter
+
+    if provider == "stub":
+      from .stub_adapter import StubAdapter
+      return StubAdapter
+
+    from .anthropic_adapter import AnthropicAdapter
+    return AnthropicAdapter
+
+  def close_workspace(self, workspace_path: str) -> None:
+    self.workspace_indexes.pop(workspace_path, None)
+    session = self.docker_sessions.pop(workspace_path, None)
+    if not session is None and not session.image is None:
+      session.stop()
+
+  def stats(self) -> Dict[str, int]:
+    stats = { "adapters": len(self.adapters) }
+    if not self.http_client_pool is None:
+      stats.update(self.http_client_pool.stats())
+    return stats
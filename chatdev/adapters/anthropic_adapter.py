@@ -2,9 +2,22 @@
 This module defines the `AnthropicAdapter` class which interacts with Anthropic AI models.
 
 Modules Imported:
-- `Message`, `Thread`, `Tool`, `ContentBlock`, `TextBlock`, `ToolResultBlock`, `ToolUseBlock` from `chatdev.entities`: Represents various components of workflows and tool interactions.
+- `Message`, `Thread`, `Tool`, `ContentBlock`, `TextBlock`, `ToolResultBlock`, `ToolUseBlock`, `Usage` from `chatdev.entities`: Represents various components of workflows and tool interactions.
 - `Adapter` from `.adapter`: Represents the generic adapter interface.
-- `Anthropic` from `anthropic`: Initializes the Anthropic client.
+- `ToolExecutor` from `.tool_executor`: Runs the tool calls of a message.
+- `StreamHandler` from `.stream_handler`: Receives streamed output.
+- `StreamAccumulator` from `.stream_accumulator`: Assembles streamed output into a message.
+- `ResponseCache` from `.response_cache`: Records and replays LLM responses.
+- `RateLimiter` from `.rate_limiter`: Keeps the requests within the rate limits of the provider.
+- `RetryPolicy` from `.retry_policy`: Decides whether and when failed requests are retried.
+- `ThreadCompactor` from `.thread_compactor`: Shrinks the thread sent to the provider.
+- `WorkspaceIndex` from `.workspace_index`: Lists the files of a workspace incrementally.
+- `DockerSession` from `.docker_session`: Runs commands in a long-lived container per workspace.
+- `HttpFetcher` from `.http_fetcher`: Sends the requests of the request tool.
+- `FileReader` from `.file_reader`: Reads capped ranges of files.
+- `Anthropic`, `APIConnectionError` from `anthropic`: Initializes the Anthropic client and identifies connection errors to retry.
+- `Dict`, `List`, `Optional`, `Tuple` from `typing`: Specifies dict, list, optional and tuple types.
+- `WeakKeyDictionary` from `weakref`: Caches the payloads of messages without keeping them alive.
 
 Classes:
 - `AnthropicAdapter`: Manages interactions with Anthropic AI models.
@@ -13,41 +26,140 @@ Classes:
 Attributes:
 - `client` (Anthropic): The Anthropic client.
 - `model` (str): The model identifier for the Anthropic AI.
+- `cache_control` (dict): The cache control marking the end of a cacheable prompt prefix.
+- `max_cache_breakpoints` (int): The maximum number of cache breakpoints per request allowed by the API.
+- `payloads` (WeakKeyDictionary): The message payloads converted so far, shared by all Anthropic adapters since messages don't change once appended to a thread.
 
 Methods:
-- `__init__(self, client: Anthropic, model: str)`: Initializes the AnthropicAdapter with the specified client and model.
-- `generate_llm_response(self, thread: Thread) -> None`: Generates a response from the Anthropic model based on the provided thread.
+- `__init__(self, client: Anthropic, model: str, tool_executor: Optional[ToolExecutor] = None, stream_handler: Optional[StreamHandler] = None, response_cache: Optional[ResponseCache] = None, rate_limiter: Optional[RateLimiter] = None, retry_policy: Optional[RetryPolicy] = None, compactor: Optional[ThreadCompactor] = None, workspace_indexes: Optional[Dict[str, WorkspaceIndex]] = None, docker_sessions: Optional[Dict[str, DockerSession]] = None, http_fetcher: Optional[HttpFetcher] = None, file_reader: Optional[FileReader] = None)`: Initializes the AnthropicAdapter with the specified client, model, tool executor, stream handler, response cache, rate limiter, retry policy, compactor, workspace indexes, docker sessions, HTTP fetcher and file reader.
+- `send_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]`: Sends the request to the Anthropic model and returns the response and its token usage.
+- `llm_request(self, thread: Thread) -> dict`: Builds the arguments of the messages API call for the thread, marking the tools, the latest stable prefixes of the thread and the last message as cacheable.
+- `cache_breakpoint_indices(self, thread: Thread) -> List[int]`: Returns the indices of the messages that end a cached prefix.
+- `usage_to_entity(self, usage) -> Usage`: Converts the usage reported by the API including cache reads and writes.
+- `stream_llm_response(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]`: Streams a response and stops as soon as a stop phrase appears.
+- `add_stream_event(self, accumulator: StreamAccumulator, event, usage: Usage) -> Usage`: Passes a stream event to the accumulator and returns the updated usage.
+- `stream_result(self, accumulator: StreamAccumulator, usage: Usage) -> Tuple[Message, Usage]`: Returns the streamed message and its usage.
 - `tool_to_dict(self, tool: Tool) -> dict`: Converts a Tool object to a dictionary representation.
+- `message_payload(self, message: Message) -> dict`: Returns the payload of a message, converting it only the first time it is sent.
 - `message_to_dict(self, message: Message) -> dict`: Converts a Message object to a dictionary representation.
 - `dict_to_message(self, message: dict) -> Message`: Converts a dictionary to a Message object.
 - `content_block_to_dict(self, block: ContentBlock) -> dict`: Converts a ContentBlock object to a dictionary representation.
 - `dict_to_content_block(self, block: dict) -> ContentBlock`: Converts a dictionary to a ContentBlock object.
 """
 
-from chatdev.entities import Message, Thread, Tool, ContentBlock, TextBlock, ToolResultBlock, ToolUseBlock
+from chatdev.entities import Message, Thread, Tool, ContentBlock, TextBlock, ToolResultBlock, ToolUseBlock, Usage
 from .adapter import Adapter
-from anthropic import Anthropic
+from .tool_executor import ToolExecutor
+from .stream_handler import StreamHandler
+from .stream_accumulator import StreamAccumulator
+from .response_cache import ResponseCache
+from .rate_limiter import RateLimiter
+from .retry_policy import RetryPolicy
+from .thread_compactor import ThreadCompactor
+from .workspace_index import WorkspaceIndex
+from .docker_session import DockerSession
+from .http_fetcher import HttpFetcher
+from .file_reader import FileReader
+from anthropic import Anthropic, APIConnectionError
+from typing import Dict, List, Optional, Tuple
+from weakref import WeakKeyDictionary
 
 class AnthropicAdapter(Adapter):
   client: Anthropic
   model: str
 
-  def __init__(self, client: Anthropic, model: str):
-    super().__init__()
+  connection_errors: tuple = (APIConnectionError,)
+
+  cache_control: dict = { "type": "ephemeral" }
+  max_cache_breakpoints: int = 4
+
+  payloads: WeakKeyDictionary = WeakKeyDictionary()
+
+  def __init__(self, client: Anthropic, model: str, tool_executor: Optional[ToolExecutor] = None, stream_handler: Optional[StreamHandler] = None, response_cache: Optional[ResponseCache] = None, rate_limiter: Optional[RateLimiter] = None, retry_policy: Optional[RetryPolicy] = None, compactor: Optional[ThreadCompactor] = None, workspace_indexes: Optional[Dict[str, WorkspaceIndex]] = None, docker_sessions: Optional[Dict[str, DockerSession]] = None, http_fetcher: Optional[HttpFetcher] = None, file_reader: Optional[FileReader] = None):
+    super().__init__(tool_executor= tool_executor, stream_handler= stream_handler, response_cache= response_cache, rate_limiter= rate_limiter, retry_policy= retry_policy, compactor= compactor, workspace_indexes= workspace_indexes, docker_sessions= docker_sessions, http_fetcher= http_fetcher, file_reader= file_reader)
 
     self.client = client
     self.model = model
 
-  def generate_llm_response(self, thread: Thread) -> None:
-    response = self.client.beta.tools.messages.create(
-      model= self.model,
-      max_tokens= 1000,
-      messages= [self.message_to_dict(message= message) for message in thread.messages],
-      tools= [self.tool_to_dict(tool= tool) for tool in self.tools]
+  def send_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]:
+    if not self.stream_handler is None:
+      return self.stream_llm_response(request, stop_phrases)
+
+    response = self.client.messages.create(**request)
+
+    return self.dict_to_message(response), self.usage_to_entity(response.usage)
+
+  def llm_request(self, thread: Thread) -> dict:
+    tools = [self.tool_to_dict(tool= tool) for tool in self.tools]
+    tools[-1] = { **tools[-1], "cache_control": self.cache_control }
+
+    messages = [self.message_payload(message= message) for message in thread.messages]
+    for index in self.cache_breakpoint_indices(thread):
+      content = messages[index]["content"]
+      if len(content) > 0:
+        # The payloads are cached, the marked message is a copy
+        messages[index] = { **messages[index], "content": content[:-1] + [{ **content[-1], "cache_control": self.cache_control }] }
+
+    return {
+      "model": self.model,
+      "max_tokens": 1000,
+      "messages": messages,
+      "tools": tools
+    }
+
+  def cache_breakpoint_indices(self, thread: Thread) -> List[int]:
+    # The tools take one of the four breakpoints, the last message is always one so the cache advances with the thread
+    indices = thread.cache_breakpoints[-(self.max_cache_breakpoints - 2):] + [len(thread.messages) - 1]
+    return sorted(set(index for index in indices if index >= 0))
+
+  def usage_to_entity(self, usage) -> Usage:
+    cache_read_tokens = getattr(usage, "cache_read_input_tokens", None) or 0
+    cache_write_tokens = getattr(usage, "cache_creation_input_tokens", None) or 0
+    return Usage(
+      input_tokens= usage.input_tokens + cache_read_tokens + cache_write_tokens,
+      output_tokens= usage.output_tokens,
+      cache_read_tokens= cache_read_tokens,
+      cache_write_tokens= cache_write_tokens
     )
 
-    message = self.dict_to_message(response)
-    thread.append_message(message)
+  def stream_llm_response(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]:
+    accumulator = StreamAccumulator(stream_handler= self.stream_handler, stop_phrases= stop_phrases)
+    usage = Usage()
+
+    stream = self.client.messages.create(**request, stream= True)
+    try:
+      for event in stream:
+        usage = self.add_stream_event(accumulator, event, usage)
+        if accumulator.stopped:
+          break
+    finally:
+      stream.close()
+
+    return self.stream_result(accumulator, usage)
+
+  def add_stream_event(self, accumulator: StreamAccumulator, event, usage: Usage) -> Usage:
+    if event.type == "message_start":
+      return self.usage_to_entity(event.message.usage)
+    elif event.type == "content_block_start" and event.content_block.type == "text":
+      accumulator.add_text(event.index, event.content_block.text)
+    elif event.type == "content_block_start" and event.content_block.type == "tool_use":
+      accumulator.start_tool_use(event.index, event.content_block.id, event.content_block.name)
+    elif event.type == "content_block_delta" and event.delta.type == "text_delta":
+      accumulator.add_text(event.index, event.delta.text)
+    elif event.type == "content_block_delta" and event.delta.type == "input_json_delta":
+      accumulator.add_tool_input(event.index, event.delta.partial_json)
+    elif event.type == "content_block_stop":
+      accumulator.finish_tool_use(event.index)
+    elif event.type == "message_delta":
+      usage.output_tokens = event.usage.output_tokens
+    return usage
+
+  def stream_result(self, accumulator: StreamAccumulator, usage: Usage) -> Tuple[Message, Usage]:
+    if accumulator.stopped:
+      # The final usage is only sent at the end of the stream, estimate the tokens generated until the stop
+      usage.output_tokens = max(usage.output_tokens, accumulator.text_length() // 4)
+
+    return accumulator.message(), usage
   
   def tool_to_dict(self, tool: Tool) -> dict:
     return {
@@ -56,6 +168,11 @@ class AnthropicAdapter(Adapter):
       "input_schema": tool.input_schema
     }
 
+  def message_payload(self, message: Message) -> dict:
+    if not message in self.payloads:
+      self.payloads[message] = self.message_to_dict(message= message)
+    return self.payloads[message]
+
   def message_to_dict(self, message: Message) -> dict:
     return {
       "role": message.role,
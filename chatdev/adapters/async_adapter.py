@@ -0,0 +1,174 @@
+"""
+This module contains the AsyncAdapter class, the asyncio variant of the Adapter class.
+
+Modules Imported:
+- `List`, `Optional`, `Tuple` from `typing`: Specifies list, optional and tuple types.
+- `Thread`, `Message`, `ToolUseBlock`, `ToolResultBlock`, `Usage` from `chatdev.entities`: Represents various components of workflows and tool interactions.
+- `Adapter` from `.adapter`: Represents the synchronous adapter the tools and request building are shared with.
+- `ResponseBudget` from `.response_budget`: Limits the LLM calls of a conversation.
+- `ResponseResult` from `.response_result`: Describes the outcome of a response.
+- `CallRecord` from `.call_record`: Records the timing and usage of LLM and tool calls.
+- `monotonic`, `time` from `time`: Times calls.
+- `create_subprocess_exec`, `sleep`, `to_thread` from `asyncio`: Runs subprocesses, waits for retries and runs blocking file operations without blocking the event loop.
+- `PIPE` from `asyncio.subprocess`: Captures the output of subprocesses.
+- `format_exception` from `traceback`: Formats exception traceback for error handling.
+
+Classes:
+- `AsyncAdapter`: Manages interactions with tools and AI responses on an asyncio event loop.
+
+`AsyncAdapter` Class:
+The response loop, tool execution and LLM calls are coroutines, so a single event loop can drive many workflows
+at once. Requests are built, cached and converted exactly like in `Adapter`, subclasses only implement
+`send_llm_request` as a coroutine with an async provider client. The docker and request tools run as a
+subprocess and an HTTP request on the event loop, file tools run in the default executor.
+
+Methods:
+- `generate_response(self, thread: Thread, budget: Optional[ResponseBudget] = None, stop_phrases: Optional[List[str]] = None) -> ResponseResult`: Alternates LLM calls and tool calls until the model answers without tools or the budget is exhausted.
+- `generate_llm_response(self, thread: Thread, stop_phrases: Optional[List[str]] = None) -> CallRecord`: Generates LLM response, served from the response cache if possible, appends it to the thread and returns the record of the call.
+- `send_limited_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]`: Sends the request within the rate limits and retries it on transient errors.
+- `send_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]`: Sends the request to the provider (implementation pending).
+- `execute_tools(self, thread: Thread) -> List[CallRecord]`: Executes the tool calls of the last message, appends their results and returns the records of the calls.
+- `recorded_execute_tool(self, thread: Thread, block: ToolUseBlock, records: List[CallRecord]) -> ToolResultBlock`: Safely executes a tool and adds the record of the call.
+- `safe_execute_tool(self, thread: Thread, block: ToolUseBlock) -> ToolResultBlock`: Safely executes a tool and handles errors.
+- `execute_tool(self, thread: Thread, block: ToolUseBlock) -> ToolResultBlock`: Executes a specific tool command based on the block name.
+"""
+
+from typing import List, Optional, Tuple
+from chatdev.entities import Thread, Message, ToolUseBlock, ToolResultBlock, Usage
+from .adapter import Adapter
+from .response_budget import ResponseBudget
+from .response_result import ResponseResult
+from .call_record import CallRecord
+from time import monotonic, time
+from asyncio import create_subprocess_exec, sleep, to_thread
+from asyncio.subprocess import PIPE
+from traceback import format_exception
+
+class AsyncAdapter(Adapter):
+
+  async def generate_response(self, thread: Thread, budget: Optional[ResponseBudget] = None, stop_phrases: Optional[List[str]] = None) -> ResponseResult:
+    budget = budget if not budget is None else ResponseBudget()
+    budget.start()
+    turns = 0
+    usage = Usage()
+    records = []
+
+    while True:
+      stop_reason = budget.stop_reason()
+      if not stop_reason is None:
+        return ResponseResult(turns= turns, usage= usage, stop_reason= stop_reason, records= records)
+
+      record = await self.generate_llm_response(thread, stop_phrases)
+      budget.consume(record.usage)
+      turns += 1
+      usage = usage + record.usage
+      records.append(record)
+      self.dump_thread(thread)
+
+      if len(thread.last_message_tool_use_blocks()) == 0:
+        return ResponseResult(turns= turns, usage= usage, stop_reason= "end_turn", records= records)
+
+      records.extend(await self.execute_tools(thread))
+      self.dump_thread(thread)
+
+  async def generate_llm_response(self, thread: Thread, stop_phrases: Optional[List[str]] = None) -> CallRecord:
+    started_at = time()
+    started = monotonic()
+    request = self.llm_request(self.compacted_thread(thread))
+
+    key, cached = self.cached_llm_response(request, stop_phrases)
+    if not cached is None:
+      message, usage = cached
+    else:
+      message, usage = await self.send_limited_llm_request(request, stop_phrases)
+      self.store_llm_response(key, message, usage)
+
+    thread.append_message(message)
+    return CallRecord(kind= "llm", name= self.model, started_at= started_at, seconds= monotonic() - started, usage= usage, cached= not cached is None)
+
+  async def send_limited_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]:
+    estimated_tokens = self.estimated_tokens(request)
+    attempt = 0
+
+    while True:
+      if not self.rate_limiter is None:
+        await self.rate_limiter.acquire_async(estimated_tokens)
+      try:
+        message, usage = await self.send_llm_request(request, stop_phrases)
+      except Exception as e:
+        # A failed attempt consumed no tokens, its reservation must not throttle the retry or other requests
+        if not self.rate_limiter is None:
+          self.rate_limiter.settle(estimated_tokens, 0)
+        delay = self.retry_delay(attempt, e)
+        if delay is None:
+          raise
+        await sleep(delay)
+        attempt += 1
+        continue
+
+      if not self.rate_limiter is None:
+        self.rate_limiter.settle(estimated_tokens, usage.total_tokens())
+      return message, usage
+
+  async def send_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]:
+    pass
+
+  async def execute_tools(self, thread: Thread) -> List[CallRecord]:
+    tool_use_blocks = thread.last_message_tool_use_blocks()
+    if len(tool_use_blocks) == 0:
+      return []
+
+    records = []
+    tool_result_blocks = await self.tool_executor.execute_async(tool_use_blocks, lambda block: self.recorded_execute_tool(thread, block, records))
+    thread.append_message(
+      Message(
+        role= "user",
+        content= tool_result_blocks
+      )
+    )
+    return sorted(records, key= lambda record: record.started_at)
+
+  async def recorded_execute_tool(self, thread: Thread, block: ToolUseBlock, records: List[CallRecord]) -> ToolResultBlock:
+    started_at = time()
+    started = monotonic()
+    result = await self.safe_execute_tool(thread, block)
+    records.append(CallRecord(kind= "tool", name= block.name, started_at= started_at, seconds= monotonic() - started, error= result.error))
+    return result
+
+  async def safe_execute_tool(self, thread: Thread, block: ToolUseBlock) -> ToolResultBlock:
+    try:
+      return await self.execute_tool(thread, block)
+    except Exception as e:
+      error_string = ''.join(format_exception(type(e), value=e, tb= e.__traceback__))
+      return ToolResultBlock(
+        id= block.id,
+        output= error_string,
+        error= True
+      )
+
+  async def execute_tool(self, thread: Thread, block: ToolUseBlock) -> ToolResultBlock:
+    if block.name == "docker":
+      arguments = block.input["arguments"]
+      process = await create_subprocess_exec("docker", *arguments, stdout= PIPE, stderr= PIPE, cwd= thread.workspace_path)
+      stdout, stderr = await process.communicate()
+      if not process.returncode == 0:
+        raise ChildProcessError(f"Docker tool failed: {stderr.decode(errors= 'replace')}")
+      return ToolResultBlock(
+        id= block.id,
+        output= stdout.decode(errors= 'replace')
+      )
+    elif block.name == "request":
+      method = block.input.get("method", "GET")
+      url = block.input["url"]
+      headers = block.input.get("headers", {})
+      body = block.input.get("body", None)
+
+      output, error = await self.http_fetcher.fetch_async(method, url, headers= headers, body= body)
+
+      return ToolResultBlock(
+        id= block.id,
+        output= output,
+        error= error
+      )
+    else:
+      return await to_thread(Adapter.execute_tool, self, thread, block)
@@ -0,0 +1,61 @@
+"""
+This module defines the `AsyncAdapterFactory` class which creates asyncio adapters for AI models.
+
+Modules Imported:
+- `AsyncOpenAI` from `openai`: Initializes the async OpenAI client, imported when the first OpenAI model is used.
+- `AsyncAnthropic` from `anthropic`: Initializes the async Anthropic client, imported when the first Anthropic model is used.
+- `AdapterFactory` from `.adapter_factory`: Represents the factory models are resolved with.
+- `AsyncAdapter` from `.async_adapter`: Represents the generic asyncio adapter interface.
+- `AsyncOpenAIAdapter` from `.async_openai_adapter`: Represents the asyncio adapter for OpenAI models, imported on first use.
+- `AsyncAnthropicAdapter` from `.async_anthropic_adapter`: Represents the asyncio adapter for Anthropic AI models, imported on first use.
+- `AsyncStubAdapter` from `.async_stub_adapter`: Represents the asyncio adapter answering `stub` models offline, imported on first use.
+- `StubScript` from `.stub_script`: Generates the responses of `stub` models.
+- `Any` from `typing`: Specifies any type.
+
+Classes:
+- `AsyncAdapterFactory`: Creates asyncio adapters for AI models based on the model identifier.
+
+`AsyncAdapterFactory` Class:
+Takes the same arguments as `AdapterFactory`, but with async provider clients.
+
+Attributes:
+- `clients` (Dict[str, Any]): The async client of each provider given or created so far.
+
+Methods:
+- `adapter(self, model: str) -> AsyncAdapter`: Returns the asyncio adapter of the model, creating it on first use.
+- `create_client(self, provider: str) -> Any`: Creates the async client of the provider.
+- `adapter_class(self, provider: str) -> type`: Returns the asyncio adapter class of the provider.
+"""
+
+from .adapter_factory import AdapterFactory
+from .async_adapter import AsyncAdapter
+from .stub_script import StubScript
+from typing import Any
+
+class AsyncAdapterFactory(AdapterFactory):
+  def adapter(self, model: str) -> AsyncAdapter:
+    return super().adapter(model)
+
+  def create_client(self, provider: str) -> Any:
+    if provider == "stub":
+      return StubScript()
+
+    http_client = self.http_client_pool.async_http_client() if not self.http_client_pool is None else None
+    if provider == "openai":
+      from openai import AsyncOpenAI
+      return AsyncOpenAI(max_retries= 0, http_client= http_client)
+
+    from anthropic import AsyncAnthropic
+    return AsyncAnthropic(max_retries= 0, http_client= http_client)
+
+  def adapter_class(self, provider: str) -> type:
+    if provider == "openai":
+      from .async_openai_adapter import AsyncOpenAIAdapter
+      return AsyncOpenAIAdapter
+
+    if provider == "stub":
+      from .async_stub_adapter import AsyncStubAdapter
+      return AsyncStubAdapter
+
+    from .async_anthropic_adapter import AsyncAnthropicAdapter
+    return AsyncAnthropicAdapter
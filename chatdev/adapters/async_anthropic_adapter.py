@@ -0,0 +1,55 @@
+"""
+This module defines the `AsyncAnthropicAdapter` class which interacts with Anthropic AI models on an asyncio event loop.
+
+Modules Imported:
+- `Message`, `Usage` from `chatdev.entities`: Represents the response and its token usage.
+- `AsyncAdapter` from `.async_adapter`: Represents the generic asyncio adapter interface.
+- `AnthropicAdapter` from `.anthropic_adapter`: Represents the synchronous adapter requests and responses are converted with.
+- `StreamAccumulator` from `.stream_accumulator`: Assembles streamed output into a message.
+- `AsyncAnthropic` from `anthropic`: Represents the async Anthropic client.
+- `List`, `Optional`, `Tuple` from `typing`: Specifies list, optional and tuple types.
+
+Classes:
+- `AsyncAnthropicAdapter`: Manages interactions with Anthropic AI models using the async Anthropic client.
+
+`AsyncAnthropicAdapter` Class:
+Attributes:
+- `client` (AsyncAnthropic): The async Anthropic client.
+
+Methods:
+- `send_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]`: Sends the request to the Anthropic model and returns the response and its token usage.
+- `stream_llm_response(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]`: Streams a response and stops as soon as a stop phrase appears.
+"""
+
+from chatdev.entities import Message, Usage
+from .async_adapter import AsyncAdapter
+from .anthropic_adapter import AnthropicAdapter
+from .stream_accumulator import StreamAccumulator
+from anthropic import AsyncAnthropic
+from typing import List, Optional, Tuple
+
+class AsyncAnthropicAdapter(AsyncAdapter, AnthropicAdapter):
+  client: AsyncAnthropic
+
+  async def send_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]:
+    if not self.stream_handler is None:
+      return await self.stream_llm_response(request, stop_phrases)
+
+    response = await self.client.messages.create(**request)
+
+    return self.dict_to_message(response), self.usage_to_entity(response.usage)
+
+  async def stream_llm_response(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]:
+    accumulator = StreamAccumulator(stream_handler= self.stream_handler, stop_phrases= stop_phrases)
+    usage = Usage()
+
+    stream = await self.client.messages.create(**request, stream= True)
+    try:
+      async for event in stream:
+        usage = self.add_stream_event(accumulator, event, usage)
+        if accumulator.stopped:
+          break
+    finally:
+      await stream.close()
+
+    return self.stream_result(accumulator, usage)
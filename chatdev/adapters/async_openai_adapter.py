@@ -0,0 +1,55 @@
+"""
+This module defines the `AsyncOpenAIAdapter` class which interacts with OpenAI models on an asyncio event loop.
+
+Modules Imported:
+- `Message`, `Usage` from `chatdev.entities`: Represents the response and its token usage.
+- `AsyncAdapter` from `.async_adapter`: Represents the generic asyncio adapter interface.
+- `OpenAIAdapter` from `.openai_adapter`: Represents the synchronous adapter requests and responses are converted with.
+- `StreamAccumulator` from `.stream_accumulator`: Assembles streamed output into a message.
+- `AsyncOpenAI` from `openai`: Represents the async OpenAI client.
+- `List`, `Optional`, `Tuple` from `typing`: Specifies list, optional and tuple types.
+
+Classes:
+- `AsyncOpenAIAdapter`: Manages interactions with OpenAI models using the async OpenAI client.
+
+`AsyncOpenAIAdapter` Class:
+Attributes:
+- `client` (AsyncOpenAI): The async OpenAI client.
+
+Methods:
+- `send_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]`: Sends the request to the OpenAI model and returns the response and its token usage.
+- `stream_llm_response(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]`: Streams a response and stops as soon as a stop phrase appears.
+"""
+
+from chatdev.entities import Message, Usage
+from .async_adapter import AsyncAdapter
+from .openai_adapter import OpenAIAdapter
+from .stream_accumulator import StreamAccumulator
+from openai import AsyncOpenAI
+from typing import List, Optional, Tuple
+
+class AsyncOpenAIAdapter(AsyncAdapter, OpenAIAdapter):
+  client: AsyncOpenAI
+
+  async def send_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]:
+    if not self.stream_handler is None:
+      return await self.stream_llm_response(request, stop_phrases)
+
+    response = await self.client.chat.completions.create(**request)
+
+    return self.response_to_message(response)
+
+  async def stream_llm_response(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]:
+    accumulator = StreamAccumulator(stream_handler= self.stream_handler, stop_phrases= stop_phrases)
+    usage = None
+
+    stream = await self.client.chat.completions.create(**request, stream= True, stream_options= { "include_usage": True })
+    try:
+      async for chunk in stream:
+        usage = self.add_stream_chunk(accumulator, chunk, usage)
+        if accumulator.stopped:
+          break
+    finally:
+      await stream.close()
+
+    return self.stream_result(request, accumulator, usage)
@@ -0,0 +1,30 @@
+"""
+This module defines the `AsyncStubAdapter` class which answers with a `StubScript` on an asyncio event loop.
+
+Modules Imported:
+- `Message`, `Usage` from `chatdev.entities`: Represents the response and its token usage.
+- `AsyncAdapter` from `.async_adapter`: Represents the generic asyncio adapter interface.
+- `StubAdapter` from `.stub_adapter`: Represents the synchronous adapter requests and responses are built with.
+- `List`, `Optional`, `Tuple` from `typing`: Specifies list, optional and tuple types.
+- `sleep` from `asyncio`: Simulates the latency of a response without blocking the event loop.
+
+Classes:
+- `AsyncStubAdapter`: Runs workflows offline with scripted responses on an asyncio event loop.
+
+`AsyncStubAdapter` Class:
+Methods:
+- `send_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]`: Waits for the latency of the script and returns its response.
+"""
+
+from chatdev.entities import Message, Usage
+from .async_adapter import AsyncAdapter
+from .stub_adapter import StubAdapter
+from typing import List, Optional, Tuple
+from asyncio import sleep
+
+class AsyncStubAdapter(AsyncAdapter, StubAdapter):
+  async def send_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]:
+    delay = self.client.delay()
+    if delay > 0:
+      await sleep(delay)
+    return self.scripted_response(request)
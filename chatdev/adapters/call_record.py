@@ -0,0 +1,95 @@
+"""
+This module defines the `CallRecord` class which records the timing and usage of a single LLM or tool call.
+
+Modules Imported:
+- `Optional` from `typing`: Specifies optional types.
+- `Usage` from `chatdev.entities`: Represents the tokens used by an LLM call.
+
+Classes:
+- `CallRecord`: Represents a finished LLM or tool call.
+
+`CallRecord` Class:
+Adapters create the records, the workflow manager tags them with the phase, conversation and role they belong to.
+
+Attributes:
+- `kind` (str): Either `"llm"` or `"tool"`.
+- `name` (str): The model of an LLM call or the name of the tool.
+- `started_at` (float): The wall-clock time the call started at.
+- `seconds` (float): The duration of the call.
+- `usage` (Usage): The tokens used, empty for tool calls.
+- `cached` (bool): Whether the response was served from the response cache.
+- `error` (bool): Whether the tool call failed.
+- `phase` (Optional[str]): The phase the call was made in, if any.
+- `conversation` (Optional[str]): The conversation the call was made in, if any.
+- `role` (Optional[str]): The conversation role (`"lead"` or `"assistant"`) the call was made for, if any.
+
+Methods:
+- `__init__(self, kind: str, name: str, started_at: float, seconds: float, usage: Optional[Usage] = None, cached: bool = False, error: bool = False)`: Initializes an untagged CallRecord.
+- `tag(self, phase: Optional[str], conversation: Optional[str], role: Optional[str])`: Sets the phase, conversation and role of the call.
+- `__str__(self)`: Returns a string representation of the record.
+- `dict(self) -> dict`: Returns a dictionary representation of the record.
+- `from_dict(data: dict) -> CallRecord`: Creates a record from its dictionary representation.
+"""
+
+from typing import Optional
+from chatdev.entities import Usage
+
+class CallRecord:
+  kind: str
+  name: str
+  started_at: float
+  seconds: float
+  usage: Usage
+  cached: bool
+  error: bool
+  phase: Optional[str]
+  conversation: Optional[str]
+  role: Optional[str]
+
+  def __init__(self, kind: str, name: str, started_at: float, seconds: float, usage: Optional[Usage] = None, cached: bool = False, error: bool = False):
+    self.kind = kind
+    self.name = name
+    self.started_at = started_at
+    self.seconds = seconds
+    self.usage = usage if not usage is None else Usage()
+    self.cached = cached
+    self.error = error
+    self.phase = None
+    self.conversation = None
+    self.role = None
+
+  def tag(self, phase: Optional[str], conversation: Optional[str], role: Optional[str]) -> None:
+    self.phase = phase
+    self.conversation = conversation
+    self.role = role
+
+  def __str__(self):
+    return f"CallRecord(kind= {self.kind}, name= {self.name}, seconds= {self.seconds:.3f}, usage= {self.usage}, phase= {self.phase}, conversation= {self.conversation}, role= {self.role})"
+
+  def dict(self) -> dict:
+    return {
+      "kind": self.kind,
+      "name": self.name,
+      "started_at": self.started_at,
+      "seconds": self.seconds,
+      "usage": self.usage.dict(),
+      "cached": self.cached,
+      "error": self.error,
+      "phase": self.phase,
+      "conversation": self.conversation,
+      "role": self.role
+    }
+
+  @staticmethod
+  def from_dict(data: dict) -> 'CallRecord':
+    record = CallRecord(
+      kind= data["kind"],
+      name= data["name"],
+      started_at= data["started_at"],
+      seconds= data["seconds"],
+      usage= Usage.from_dict(data["usage"]),
+      cached= data.get("cached", False),
+      error= data.get("error", False)
+    )
+    record.tag(data.get("phase"), data.get("conversation"), data.get("role"))
+    return record
@@ -0,0 +1,94 @@
+"""
+This module defines the `ConcurrentToolExecutor` class which runs independent tool calls in parallel.
+
+Modules Imported:
+- `Awaitable`, `Callable`, `List`, `Optional`, `Sequence` from `typing`: Specifies awaitable, callable, list, optional and sequence types.
+- `ToolUseBlock`, `ToolResultBlock` from `chatdev.entities`: Represents tool calls and their results.
+- `ThreadPoolExecutor`, `Future`, `wait` from `concurrent.futures`: Runs tool calls on a thread pool.
+- `Lock` from `threading`: Guards the lazy creation of the pool.
+- `Semaphore`, `Task`, `create_task`, `gather`, `wait` from `asyncio`: Runs tool coroutines concurrently with the same width.
+- `ToolExecutor` from `.tool_executor`: Represents the sequential executor and its conflict detection.
+
+Classes:
+- `ConcurrentToolExecutor`: Runs the tool calls of a message on a thread pool.
+
+`ConcurrentToolExecutor` Class:
+Tool calls mostly wait on I/O (files, docker and HTTP), so they are run on a thread pool of configurable width.
+A call that conflicts with earlier calls of the same message, e.g. a `read_file` after a `write_file` to the
+same path, waits for those calls to finish, so writes to a file stay ordered. Results are always returned in
+the order of the tool calls.
+
+Attributes:
+- `max_workers` (int): The maximum number of tool calls running at the same time.
+
+Methods:
+- `__init__(self, max_workers: int = 8)`: Initializes the executor with the given pool width.
+- `execute(self, blocks: Sequence[ToolUseBlock], execute_tool: Callable[[ToolUseBlock], ToolResultBlock]) -> List[ToolResultBlock]`: Executes all blocks concurrently and returns their results in the order of the blocks.
+- `execute_async(self, blocks: Sequence[ToolUseBlock], execute_tool: Callable[[ToolUseBlock], Awaitable[ToolResultBlock]]) -> List[ToolResultBlock]`: Executes all blocks as concurrent tasks with the same ordering and width.
+- `execute_after(self, dependencies: List[Future], execute_tool: Callable[[ToolUseBlock], ToolResultBlock], block: ToolUseBlock) -> ToolResultBlock`: Executes a block once all conflicting earlier blocks finished.
+- `execute_after_async(self, dependencies: List[Task], semaphore: Semaphore, execute_tool: Callable[[ToolUseBlock], Awaitable[ToolResultBlock]], block: ToolUseBlock) -> ToolResultBlock`: Executes a block once all conflicting earlier blocks finished and a slot is free.
+- `thread_pool(self) -> ThreadPoolExecutor`: Returns the thread pool, creating it on first use.
+- `close(self)`: Shuts down the thread pool.
+"""
+
+from typing import Awaitable, Callable, List, Optional, Sequence
+from chatdev.entities import ToolUseBlock, ToolResultBlock
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from threading import Lock
+from asyncio import Semaphore, Task, create_task, gather, wait as wait_tasks
+from .tool_executor import ToolExecutor
+
+class ConcurrentToolExecutor(ToolExecutor):
+  max_workers: int
+
+  def __init__(self, max_workers: int = 8):
+    self.max_workers = max_workers
+    self.pool: Optional[ThreadPoolExecutor] = None
+    self.pool_lock = Lock()
+
+  def execute(self, blocks: Sequence[ToolUseBlock], execute_tool: Callable[[ToolUseBlock], ToolResultBlock]) -> List[ToolResultBlock]:
+    if len(blocks) <= 1 or self.max_workers <= 1:
+      return super().execute(blocks, execute_tool)
+
+    pool = self.thread_pool()
+    futures: List[Future] = []
+    for index, block in enumerate(blocks):
+      # The pool starts tasks in submission order, so waiting on earlier futures can't deadlock
+      dependencies = [futures[earlier] for earlier in range(index) if self.conflicts(blocks[earlier], block)]
+      futures.append(pool.submit(self.execute_after, dependencies, execute_tool, block))
+
+    return [future.result() for future in futures]
+
+  async def execute_async(self, blocks: Sequence[ToolUseBlock], execute_tool: Callable[[ToolUseBlock], Awaitable[ToolResultBlock]]) -> List[ToolResultBlock]:
+    if len(blocks) <= 1 or self.max_workers <= 1:
+      return await super().execute_async(blocks, execute_tool)
+
+    semaphore = Semaphore(self.max_workers)
+    tasks: List[Task] = []
+    for index, block in enumerate(blocks):
+      dependencies = [tasks[earlier] for earlier in range(index) if self.conflicts(blocks[earlier], block)]
+      tasks.append(create_task(self.execute_after_async(dependencies, semaphore, execute_tool, block)))
+
+    return list(await gather(*tasks))
+
+  async def execute_after_async(self, dependencies: List[Task], semaphore: Semaphore, execute_tool: Callable[[ToolUseBlock], Awaitable[ToolResultBlock]], block: ToolUseBlock) -> ToolResultBlock:
+    if len(dependencies) > 0:
+      await wait_tasks(dependencies)
+    async with semaphore:
+      return await execute_tool(block)
+
+  def execute_after(self, dependencies: List[Future], execute_tool: Callable[[ToolUseBlock], ToolResultBlock], block: ToolUseBlock) -> ToolResultBlock:
+    wait(dependencies)
+    return execute_tool(block)
+
+  def thread_pool(self) -> ThreadPoolExecutor:
+    with self.pool_lock:
+      if self.pool is None:
+        self.pool = ThreadPoolExecutor(max_workers= self.max_workers, thread_name_prefix= "chatdev-tool")
+      return self.pool
+
+  def close(self) -> None:
+    with self.pool_lock:
+      if self.pool is not None:
+        self.pool.shutdown(wait= True)
+        self.pool = None
@@ -0,0 +1,138 @@
+"""
+This module defines the `DockerSession` class which keeps a long-lived container per workspace.
+
+Modules Imported:
+- `Optional`, `Tuple` from `typing`: Specifies optional and tuple types.
+- `Popen`, `PIPE`, `STDOUT`, `DEVNULL`, `run` from `subprocess`: Starts, stops and executes commands in the container.
+- `RLock`, `Timer` from `threading`: Serializes commands of a session and enforces their timeouts.
+- `ceil` from `math`: Rounds the timeout up to the whole seconds the container accepts.
+- `sha1` from `hashlib`: Derives a stable container name from the workspace path.
+- `path` from `os`: Resolves the workspace path that is mounted.
+
+Classes:
+- `DockerSession`: Runs commands in one container that lives as long as the workflow of its workspace.
+
+`DockerSession` Class:
+The container is started on the first command with the workspace mounted at `/workspace`, which is also the
+working directory of every command, so installed dependencies and build outputs survive between commands.
+Commands run through `docker exec` with stdout and stderr combined. The output is bounded: beyond `max_output`
+bytes only its beginning and end are kept. A command is killed inside the container after its timeout (if the
+image has `timeout`) and the exec client shortly after.
+
+Attributes:
+- `workspace_path` (str): The workspace mounted into the container.
+- `default_image` (str): The image started if a command doesn't name one.
+- `timeout` (float): The default seconds a command may run.
+- `max_output` (int): The maximum number of output bytes returned per command.
+- `docker_command` (str): The docker compatible executable.
+- `image` (Optional[str]): The image of the running container, `None` if no container runs.
+- `lock` (RLock): Serializes the commands of the session and its teardown.
+
+Methods:
+- `__init__(self, workspace_path: str, default_image: str = "ubuntu:24.04", timeout: float = 300, max_output: int = 50_000, docker_command: str = "docker")`: Initializes a session without starting its container.
+- `container_name(self) -> str`: Returns the name of the container of the workspace.
+- `execute(self, command: str, image: Optional[str] = None, timeout: Optional[float] = None) -> Tuple[int, str]`: Runs a shell command in the container, starting it if needed, and returns its exit code and output.
+- `start(self, image: str)`: Starts the container, replacing a leftover container of the workspace.
+- `stop(self)`: Removes the container, if any.
+- `bounded_output(self, process: Popen) -> str`: Reads the output of a process, keeping its beginning and end.
+"""
+
+from typing import Optional, Tuple
+from subprocess import Popen, PIPE, STDOUT, DEVNULL, run
+from threading import RLock, Timer
+from math import ceil
+from hashlib import sha1
+from os import path
+
+class DockerSession:
+  workspace_path: str
+  default_image: str
+  timeout: float
+  max_output: int
+  docker_command: str
+  image: Optional[str]
+  lock: RLock
+
+  # Kills the command inside the container on timeout, images without `timeout` only lose the exec client
+  timeout_script: str = 'if command -v timeout >/dev/null 2>&1; then exec timeout -s KILL "$1" sh -c "$2"; else exec sh -c "$2"; fi'
+
+  def __init__(self, workspace_path: str, default_image: str = "ubuntu:24.04", timeout: float = 300, max_output: int = 50_000, docker_command: str = "docker"):
+    self.workspace_path = workspace_path
+    self.default_image = default_image
+    self.timeout = timeout
+    self.max_output = max_output
+    self.docker_command = docker_command
+    self.image = None
+    self.lock = RLock()
+
+  def container_name(self) -> str:
+    return f"chatdev-{sha1(path.abspath(self.workspace_path).encode('utf-8')).hexdigest()[:12]}"
+
+  def execute(self, command: str, image: Optional[str] = None, timeout: Optional[float] = None) -> Tuple[int, str]:
+    timeout = timeout if not timeout is None else self.timeout
+    with self.lock:
+      if self.image is None or (not image is None and image != self.image):
+        self.start(image if not image is None else self.default_image)
+
+      with Popen(
+        [self.docker_command, "exec", self.container_name(), "sh", "-c", self.timeout_script, "sh", str(max(1, ceil(timeout))), command],
+        stdin= DEVNULL,
+        stdout= PIPE,
+        stderr= STDOUT
+      ) as process:
+        timer = Timer(timeout + 5, process.kill)
+        timer.start()
+        try:
+          output = self.bounded_output(process)
+          return_code = process.wait()
+        finally:
+          timer.cancel()
+
+      if return_code in [137, -9]:
+        output += f"\n[The command was stopped after its timeout of {timeout:g} seconds or was killed]"
+      return return_code, output
+
+  def start(self, image: str) -> None:
+    self.stop()
+    result = run(
+      [
+        self.docker_command, "run", "--detach", "--rm", "--name", self.container_name(),
+        "--volume", f"{path.abspath(self.workspace_path)}:/workspace", "--workdir", "/workspace",
+        "--entrypoint", "tail", image, "-f", "/dev/null"
+      ],
+      capture_output= True,
+      text= True
+    )
+    if not result.returncode == 0:
+      raise ChildProcessError(f"Starting the docker session with image {image} failed: {result.stderr}")
+    self.image = image
+
+  def stop(self) -> None:
+    with self.lock:
+      # A container of a crashed run may still exist even though this session never started one
+      run([self.docker_command, "rm", "--force", self.container_name()], capture_output= True)
+      self.image = None
+
+  def bounded_output(self, process: Popen) -> str:
+    head = bytearray()
+    tail = bytearray()
+    omitted = 0
+    limit = self.max_output // 2
+
+    while True:
+      chunk = process.stdout.read(65536)
+      if not chunk:
+        break
+      if len(head) < limit:
+        taken = limit - len(head)
+        head += chunk[:taken]
+        chunk = chunk[taken:]
+      tail += chunk
+      if len(tail) > limit:
+        omitted += len(tail) - limit
+        del tail[:len(tail) - limit]
+
+    output = head.decode("utf-8", errors= "replace")
+    if omitted > 0:
+      output += f"\n[... {omitted} bytes of output omitted ...]\n"
+    return output + tail.decode("utf-8", errors= "replace")
@@ -0,0 +1,161 @@
+"""
+This module defines the `FileEditor` class which applies patches to workspace files for the `edit_file` tool.
+
+Modules Imported:
+- `Dict`, `List`, `Optional`, `Tuple` from `typing`: Specifies dict, list, optional and tuple types.
+- `chmod`, `path`, `remove`, `replace`, `stat` from `os`: Replaces files atomically and keeps their permissions.
+- `NamedTemporaryFile` from `tempfile`: Writes the edited content next to the file before replacing it.
+- `compile`, `Pattern` from `re`: Parses the hunk headers of unified diffs.
+
+Classes:
+- `FileEditor`: Applies unified diffs or search/replace edits to a file.
+
+`FileEditor` Class:
+All edits of a call are validated against the current content of the file before anything is written, a single
+mismatching hunk or ambiguous search fails the whole call and leaves the file untouched. The edited content is
+written to a temporary file in the same directory that replaces the original, so readers never see a partial file.
+
+Hunks of a unified diff are applied at their stated position if their context and removed lines match there,
+otherwise at the only position in the file they match. Search/replace edits require the search text to occur
+exactly once. Added lines use the line endings of the file. A diff may only change one file, its file headers
+(`diff --git`, `index`, `---` and `+++` lines) are skipped.
+
+Methods:
+- `edit(self, file_path: str, diff: Optional[str] = None, edits: Optional[List[Dict[str, str]]] = None) -> str`: Applies a diff or edits to the file and returns a summary.
+- `apply_edits(self, content: str, edits: List[Dict[str, str]]) -> str`: Applies search/replace edits to the content.
+- `apply_diff(self, content: str, diff: str) -> Tuple[str, int, int]`: Applies a unified diff to the content and returns it with the number of removed and added lines.
+- `parse_hunks(self, diff: str) -> List[Tuple[int, List[str], List[str]]]`: Parses a unified diff of a single file into the start line, old lines and new lines of each hunk.
+- `hunk_position(self, lines: List[str], old_lines: List[str], start: int, minimum: int) -> int`: Returns the index the old lines of a hunk are found at.
+- `write_atomically(self, file_path: str, content: str)`: Replaces the content of the file atomically.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from os import chmod, path, remove, replace, stat
+from tempfile import NamedTemporaryFile
+from re import Pattern, compile
+
+class FileEditor:
+
+  hunk_header: Pattern = compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+  def edit(self, file_path: str, diff: Optional[str] = None, edits: Optional[List[Dict[str, str]]] = None) -> str:
+    if (diff is None) == (edits is None):
+      raise ValueError("Provide either a unified diff or search/replace edits")
+
+    with open(file_path, 'r', newline= "") as file:
+      content = file.read()
+
+    if not diff is None:
+      edited, removed, added = self.apply_diff(content, diff)
+      summary = f"Applied {len(self.parse_hunks(diff))} hunks, removed {removed} and added {added} lines"
+    else:
+      edited = self.apply_edits(content, edits)
+      summary = f"Applied {len(edits)} edits"
+
+    if edited == content:
+      return f"{summary}, the file is unchanged"
+    self.write_atomically(file_path, edited)
+    return summary
+
+  def apply_edits(self, content: str, edits: List[Dict[str, str]]) -> str:
+    for index, edit in enumerate(edits):
+      search = edit["search"]
+      occurrences = content.count(search) if search != "" else 0
+      if occurrences != 1:
+        found = "was not found" if occurrences == 0 else f"was found {occurrences} times"
+        raise ValueError(f"The search text of edit {index + 1} {found}, it has to match exactly one location of the current file. Include more surrounding lines to make it unique.")
+      content = content.replace(search, edit["replace"], 1)
+    return content
+
+  def apply_diff(self, content: str, diff: str) -> Tuple[str, int, int]:
+    newline = "\r\n" if "\r\n" in content else "\n"
+    ends_with_newline = content.endswith("\n") or content == ""
+    lines = content.split(newline) if content != "" else []
+    if content.endswith(newline):
+      lines.pop()
+
+    hunks = self.parse_hunks(diff)
+    if len(hunks) == 0:
+      raise ValueError("The diff contains no hunks, every hunk has to start with a header like \"@@ -12,4 +12,5 @@\"")
+
+    # Positions are validated for all hunks first, so a failing hunk leaves the file untouched
+    positions = []
+    minimum = 0
+    for index, (start, old_lines, _) in enumerate(hunks):
+      position = self.hunk_position(lines, old_lines, start, minimum)
+      if position < 0:
+        raise ValueError(f"Hunk {index + 1} (@@ -{start + 1} @@) doesn't match the current file, read the file again and create the diff from its current content")
+      positions.append(position)
+      minimum = position + len(old_lines)
+
+    for (_, old_lines, new_lines), position in reversed(list(zip(hunks, positions))):
+      lines[position:position + len(old_lines)] = new_lines
+
+    diff_lines = diff.splitlines()
+    # File headers like "--- a/file" come before the first hunk and aren't removed lines
+    hunk_lines = diff_lines[next(index for index, line in enumerate(diff_lines) if self.hunk_header.match(line)):]
+    removed = len([line for line in hunk_lines if line.startswith("-")])
+    added = len([line for line in hunk_lines if line.startswith("+")])
+
+    edited = newline.join(lines)
+    if ends_with_newline and len(lines) > 0:
+      edited += newline
+    return edited, removed, added
+
+  def parse_hunks(self, diff: str) -> List[Tuple[int, List[str], List[str]]]:
+    hunks = []
+    diff_lines = diff.splitlines()
+    files = 0
+    in_file_header = False
+    for index, line in enumerate(diff_lines):
+      header = self.hunk_header.match(line)
+      # "diff --git" or "--- a/x" followed by "+++ b/x" start the headers of a file and end the hunks of the one before
+      if line.startswith("diff --git ") or (line.startswith("--- ") and index + 1 < len(diff_lines) and diff_lines[index + 1].startswith("+++ ")):
+        if not in_file_header:
+          files += 1
+        if files > 1:
+          raise ValueError("The diff changes more than one file, but edit_file only edits file_path. Call it once per file with the hunks of that file.")
+        in_file_header = True
+      elif not header is None:
+        in_file_header = False
+        # Pure insertions state the line before them, e.g. "@@ -0,0 +1,2 @@" for the start of the file
+        old_start = int(header.group(1))
+        old_count = int(header.group(2)) if not header.group(2) is None else 1
+        hunks.append((old_start - 1 if old_count > 0 else old_start, [], []))
+      elif in_file_header or len(hunks) == 0 or line.startswith("\\"):
+        continue
+      elif line.startswith("-"):
+        hunks[-1][1].append(line[1:])
+      elif line.startswith("+"):
+        hunks[-1][2].append(line[1:])
+      else:
+        # Context lines, models often drop the leading space of empty ones
+        context = line[1:] if line.startswith(" ") else line
+        hunks[-1][1].append(context)
+        hunks[-1][2].append(context)
+    return hunks
+
+  def hunk_position(self, lines: List[str], old_lines: List[str], start: int, minimum: int) -> int:
+    if len(old_lines) == 0:
+      return start if minimum <= start <= len(lines) else -1
+    if start >= minimum and lines[start:start + len(old_lines)] == old_lines:
+      return start
+
+    matches = [
+      position for position in range(minimum, len(lines) - len(old_lines) + 1)
+      if lines[position] == old_lines[0] and lines[position:position + len(old_lines)] == old_lines
+    ]
+    return matches[0] if len(matches) == 1 else -1
+
+  def write_atomically(self, file_path: str, content: str) -> None:
+    mode = stat(file_path).st_mode
+    with NamedTemporaryFile('w', dir= path.dirname(path.abspath(file_path)), prefix= ".chatdev-edit-", delete= False, newline= "") as file:
+      temporary_path = file.name
+      try:
+        file.write(content)
+      except Exception:
+        file.close()
+        remove(temporary_path)
+        raise
+    chmod(temporary_path, mode)
+    replace(temporary_path, file_path)
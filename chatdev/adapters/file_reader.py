@@ -0,0 +1,116 @@
+"""
+This module defines the `FileReader` class which reads ranges of workspace files for the `read_file` tool.
+
+Modules Imported:
+- `Optional`, `Union` from `typing`: Specifies optional and union types.
+- `mmap`, `ACCESS_READ` from `mmap`: Maps large files into memory instead of reading them.
+- `stat` from `os`: Reads the size of files.
+
+Classes:
+- `FileReader`: Reads line or byte ranges of files, capped to a maximum size.
+
+`FileReader` Class:
+Files up to `mmap_threshold` bytes are read at once, larger files are memory-mapped so only the pages that are
+counted or returned are loaded. Every result starts with a header holding the size and line count of the file and
+the range that is shown, or why a line range can't be shown. Results longer than `max_bytes` are cut off with a notice telling how to read the rest.
+
+Attributes:
+- `max_bytes` (int): The maximum number of bytes of file content in a result.
+- `mmap_threshold` (int): The size from which files are memory-mapped.
+- `chunk_size` (int): The number of bytes counted at once when looking for lines.
+
+Methods:
+- `__init__(self, max_bytes: int = 100_000, mmap_threshold: int = 1_048_576, chunk_size: int = 1_048_576)`: Initializes a FileReader.
+- `read(self, file_path: str, start_line: Optional[int] = None, end_line: Optional[int] = None, start_byte: Optional[int] = None, end_byte: Optional[int] = None) -> str`: Returns the header and the requested range of the file.
+- `read_data(self, data: Union[bytes, mmap], size: int, start_line: Optional[int], end_line: Optional[int], start_byte: Optional[int], end_byte: Optional[int]) -> str`: Returns the header and the requested range of the file data.
+- `line_count(self, data: Union[bytes, mmap], size: int) -> int`: Counts the lines of the data.
+- `line_offset(self, data: Union[bytes, mmap], size: int, line: int) -> int`: Returns the offset of the first byte of a line.
+"""
+
+from typing import Optional, Union
+from mmap import mmap, ACCESS_READ
+from os import stat
+
+class FileReader:
+  max_bytes: int
+  mmap_threshold: int
+  chunk_size: int
+
+  def __init__(self, max_bytes: int = 100_000, mmap_threshold: int = 1_048_576, chunk_size: int = 1_048_576):
+    self.max_bytes = max_bytes
+    self.mmap_threshold = mmap_threshold
+    self.chunk_size = chunk_size
+
+  def read(self, file_path: str, start_line: Optional[int] = None, end_line: Optional[int] = None, start_byte: Optional[int] = None, end_byte: Optional[int] = None) -> str:
+    size = stat(file_path).st_size
+    with open(file_path, 'rb') as file:
+      if size < self.mmap_threshold:
+        return self.read_data(file.read(), size, start_line, end_line, start_byte, end_byte)
+      with mmap(file.fileno(), 0, access= ACCESS_READ) as data:
+        return self.read_data(data, size, start_line, end_line, start_byte, end_byte)
+
+  def read_data(self, data: Union[bytes, mmap], size: int, start_line: Optional[int], end_line: Optional[int], start_byte: Optional[int], end_byte: Optional[int]) -> str:
+    lines = self.line_count(data, size)
+    header = f"[{size} bytes, {lines} lines"
+
+    if b"\0" in data[:8192]:
+      return f"{header}, binary content is not shown]"
+
+    if not start_line is None or not end_line is None:
+      first_line = max(1, start_line or 1)
+      last_line = min(lines, end_line or lines)
+      if first_line > lines:
+        return f"{header}, start_line {first_line} exceeds the {lines} lines of the file]"
+      if last_line < first_line:
+        return f"{header}, end_line {last_line} is before start_line {first_line}]"
+      start = self.line_offset(data, size, first_line)
+      end = self.line_offset(data, size, last_line + 1)
+    else:
+      start = max(0, min(size, start_byte or 0))
+      end = max(start, min(size, end_byte if not end_byte is None else size))
+
+    truncated = end - start > self.max_bytes
+    content = data[start:min(end, start + self.max_bytes)]
+
+    if not start_line is None or not end_line is None:
+      if truncated and b"\n" in content:
+        # Only whole lines are shown, so reading on from the next line misses nothing
+        content = content[:content.rfind(b"\n") + 1]
+        shown_last_line = first_line + content.count(b"\n") - 1
+        notice = f"\n[Truncated after {self.max_bytes} bytes, continue with start_line {shown_last_line + 1}]"
+      else:
+        shown_last_line = first_line
+        notice = f"\n[Truncated after {self.max_bytes} bytes of line {first_line}, continue with start_byte {start + len(content)}]"
+      header += f", showing lines {first_line}-{shown_last_line if truncated else last_line}]"
+    elif start > 0 or end < size or truncated:
+      header += f", showing bytes {start}-{start + len(content)}]"
+      notice = f"\n[Truncated after {self.max_bytes} bytes, continue with start_byte {start + len(content)} or read a line range]"
+    else:
+      header += "]"
+      notice = ""
+
+    return f"{header}\n{content.decode('utf-8', errors= 'replace')}{notice if truncated else ''}"
+
+  def line_count(self, data: Union[bytes, mmap], size: int) -> int:
+    if size == 0:
+      return 0
+    # Slicing in chunks keeps the memory of mapped files bounded
+    newlines = sum(data[offset:offset + self.chunk_size].count(b"\n") for offset in range(0, size, self.chunk_size))
+    return newlines + (0 if data[size - 1:size] == b"\n" else 1)
+
+  def line_offset(self, data: Union[bytes, mmap], size: int, line: int) -> int:
+    remaining = line - 1
+    offset = 0
+    while remaining > 0 and offset < size:
+      chunk = data[offset:offset + self.chunk_size]
+      newlines = chunk.count(b"\n")
+      if newlines < remaining:
+        remaining -= newlines
+        offset += len(chunk)
+        continue
+
+      position = -1
+      for _ in range(remaining):
+        position = chunk.find(b"\n", position + 1)
+      return offset + position + 1
+    return min(offset, size)
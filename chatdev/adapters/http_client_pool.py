@@ -0,0 +1,118 @@
+"""
+This module defines the `HttpClientPool` class which provides the HTTP clients shared by all provider clients.
+
+Modules Imported:
+- `Dict`, `Optional` from `typing`: Specifies dict and optional types.
+- `find_spec` from `importlib.util`: Detects whether HTTP/2 support is installed.
+- `Lock` from `threading`: Guards the statistics.
+- `Client`, `AsyncClient`, `Limits`, `Timeout`, `Request` from `httpx`: Sends HTTP requests over pooled connections.
+
+Classes:
+- `HttpClientPool`: Creates one tuned synchronous and one asynchronous HTTP client and tracks their connections.
+
+`HttpClientPool` Class:
+The clients are passed to the OpenAI and Anthropic clients as `http_client`, so requests to both providers reuse
+warm keep-alive connections instead of paying a TCP and TLS handshake per turn. HTTP/2 is used if the `h2`
+package is installed. Every request is traced to count the connections that had to be opened.
+
+Attributes:
+- `limits` (Limits): The connection pool limits of the clients.
+- `timeout` (Timeout): The timeouts of the clients.
+- `http2` (bool): Whether HTTP/2 is enabled.
+- `sync_client` (Optional[Client]): The synchronous client, created on first use.
+- `async_client` (Optional[AsyncClient]): The asynchronous client, created on first use.
+- `requests` (int): The number of requests sent.
+- `connections` (int): The number of connections opened.
+- `tls_handshakes` (int): The number of TLS handshakes made.
+- `lock` (Lock): Guards the statistics.
+
+Methods:
+- `__init__(self, max_connections: int = 100, max_keepalive_connections: int = 20, keepalive_expiry: float = 60.0, connect_timeout: float = 10.0, read_timeout: float = 600.0, http2: Optional[bool] = None)`: Initializes the pool settings, HTTP/2 is enabled if available unless specified.
+- `client(self) -> Client`: Returns the shared synchronous client.
+- `async_http_client(self) -> AsyncClient`: Returns the shared asynchronous client.
+- `stats(self) -> Dict[str, int]`: Returns the request and connection statistics.
+- `trace_request(self, request: Request)`: Counts a request and traces its connection.
+- `trace_request_async(self, request: Request)`: Counts a request of the asynchronous client and traces its connection.
+- `count_trace_event(self, event_name: str)`: Counts opened connections and handshakes.
+- `close(self)`: Closes the synchronous client.
+- `aclose(self)`: Closes the asynchronous client.
+"""
+
+from typing import Dict, Optional
+from importlib.util import find_spec
+from threading import Lock
+from httpx import Client, AsyncClient, Limits, Timeout, Request
+
+class HttpClientPool:
+  limits: Limits
+  timeout: Timeout
+  http2: bool
+  sync_client: Optional[Client]
+  async_client: Optional[AsyncClient]
+  requests: int
+  connections: int
+  tls_handshakes: int
+  lock: Lock
+
+  def __init__(self, max_connections: int = 100, max_keepalive_connections: int = 20, keepalive_expiry: float = 60.0, connect_timeout: float = 10.0, read_timeout: float = 600.0, http2: Optional[bool] = None):
+    self.limits = Limits(max_connections= max_connections, max_keepalive_connections= max_keepalive_connections, keepalive_expiry= keepalive_expiry)
+    # Streamed responses may pause between chunks, so only connecting is expected to be fast
+    self.timeout = Timeout(read_timeout, connect= connect_timeout)
+    self.http2 = http2 if not http2 is None else not find_spec("h2") is None
+    self.sync_client = None
+    self.async_client = None
+    self.requests = 0
+    self.connections = 0
+    self.tls_handshakes = 0
+    self.lock = Lock()
+
+  def client(self) -> Client:
+    if self.sync_client is None:
+      self.sync_client = Client(limits= self.limits, timeout= self.timeout, http2= self.http2, event_hooks= { "request": [self.trace_request] })
+    return self.sync_client
+
+  def async_http_client(self) -> AsyncClient:
+    if self.async_client is None:
+      self.async_client = AsyncClient(limits= self.limits, timeout= self.timeout, http2= self.http2, event_hooks= { "request": [self.trace_request_async] })
+    return self.async_client
+
+  def stats(self) -> Dict[str, int]:
+    with self.lock:
+      return {
+        "requests": self.requests,
+        "connections": self.connections,
+        "reused_connections": max(0, self.requests - self.connections),
+        "tls_handshakes": self.tls_handshakes,
+        "http2": int(self.http2)
+      }
+
+  def trace_request(self, request: Request) -> None:
+    with self.lock:
+      self.requests += 1
+    request.extensions["trace"] = lambda event_name, info: self.count_trace_event(event_name)
+
+  async def trace_request_async(self, request: Request) -> None:
+    with self.lock:
+      self.requests += 1
+
+    async def trace(event_name: str, info: dict) -> None:
+      self.count_trace_event(event_name)
+    request.extensions["trace"] = trace
+
+  def count_trace_event(self, event_name: str) -> None:
+    if event_name == "connection.connect_tcp.complete":
+      with self.lock:
+        self.connections += 1
+    elif event_name == "connection.start_tls.complete":
+      with self.lock:
+        self.tls_handshakes += 1
+
+  def close(self) -> None:
+    if not self.sync_client is None:
+      self.sync_client.close()
+      self.sync_client = None
+
+  async def aclose(self) -> None:
+    if not self.async_client is None:
+      await self.async_client.aclose()
+      self.async_client = None
@@ -0,0 +1,173 @@
+"""
+This module defines the `HttpFetcher` class which sends the HTTP requests of the `request` tool.
+
+Modules Imported:
+- `Dict`, `Optional`, `Tuple` from `typing`: Specifies dict, optional and tuple types.
+- `Response`, `Timeout` from `httpx`: Represents responses and the timeouts of tool requests.
+- `Cache` from `diskcache`: Stores cacheable responses on disk.
+- `HttpClientPool` from `.http_client_pool`: Provides the pooled HTTP clients.
+- `parsedate_to_datetime` from `email.utils`: Parses `Expires` headers.
+- `dumps` from `json`: Serializes requests into cache keys.
+- `time` from `time`: Tracks the freshness of cached responses.
+
+Classes:
+- `HttpFetcher`: Sends tool requests over pooled connections with timeouts, a size cap and an optional cache.
+
+`HttpFetcher` Class:
+Requests use the clients of an `HttpClientPool`, shared by the synchronous and asyncio adapters, with their own
+shorter timeouts. Response bodies are streamed and reading stops after `max_bytes`. Bodies of binary content types
+aren't read at all, the result only names their type and size.
+
+If a cache directory is given, responses to GET requests are cached honoring `Cache-Control` and `Expires`.
+Stale responses with an `ETag` or `Last-Modified` are revalidated with a conditional request, a 304 serves the
+cached result again.
+
+Attributes:
+- `http_client_pool` (HttpClientPool): The pool providing the HTTP clients.
+- `max_bytes` (int): The maximum number of body bytes read per response.
+- `timeout` (Timeout): The timeouts of tool requests.
+- `cache` (Optional[Cache]): The on-disk cache of responses, if enabled.
+
+Methods:
+- `__init__(self, http_client_pool: Optional[HttpClientPool] = None, max_bytes: int = 200_000, connect_timeout: float = 10.0, read_timeout: float = 30.0, cache_directory: Optional[str] = None)`: Initializes the fetcher.
+- `fetch(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, body: Optional[str] = None) -> Tuple[str, bool]`: Sends a request and returns the tool output and whether it failed.
+- `fetch_async(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, body: Optional[str] = None) -> Tuple[str, bool]`: Sends a request with the asynchronous client.
+- `cached_entry(self, method: str, url: str, headers: Dict[str, str]) -> Tuple[Optional[str], Optional[dict]]`: Returns the cache key and the cached entry of a request, if any.
+- `conditional_headers(self, headers: Dict[str, str], entry: Optional[dict]) -> Dict[str, str]`: Adds the validators of a stale entry to the request headers.
+- `finish(self, key: Optional[str], entry: Optional[dict], response: Response, content: bytes, truncated: bool) -> Tuple[str, bool]`: Builds the tool output of a response and caches it if possible.
+- `output(self, response: Response, content: bytes, truncated: bool) -> str`: Formats the body of a response.
+- `textual(self, response: Response) -> bool`: Returns whether the content type of a response is text.
+- `expires_at(self, response: Response) -> Optional[float]`: Returns until when a response is fresh, `None` if it must not be stored.
+"""
+
+from typing import Dict, Optional, Tuple
+from httpx import Response, Timeout
+from diskcache import Cache
+from .http_client_pool import HttpClientPool
+from email.utils import parsedate_to_datetime
+from json import dumps
+from time import time
+
+class HttpFetcher:
+  http_client_pool: HttpClientPool
+  max_bytes: int
+  timeout: Timeout
+  cache: Optional[Cache]
+
+  text_types: Tuple[str, ...] = ("text/", "json", "xml", "javascript", "ecmascript", "yaml", "csv", "graphql", "x-www-form-urlencoded")
+
+  def __init__(self, http_client_pool: Optional[HttpClientPool] = None, max_bytes: int = 200_000, connect_timeout: float = 10.0, read_timeout: float = 30.0, cache_directory: Optional[str] = None):
+    self.http_client_pool = http_client_pool if not http_client_pool is None else HttpClientPool()
+    self.max_bytes = max_bytes
+    self.timeout = Timeout(read_timeout, connect= connect_timeout)
+    self.cache = Cache(cache_directory, size_limit= 2 ** 28) if not cache_directory is None else None
+
+  def fetch(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, body: Optional[str] = None) -> Tuple[str, bool]:
+    headers = headers or {}
+    key, entry = self.cached_entry(method, url, headers)
+    if not entry is None and entry["expires_at"] > time():
+      return entry["output"], entry["error"]
+
+    client = self.http_client_pool.client()
+    with client.stream(method, url, headers= self.conditional_headers(headers, entry), content= body, timeout= self.timeout, follow_redirects= True) as response:
+      content = bytearray()
+      truncated = False
+      if response.status_code != 304 and self.textual(response):
+        for chunk in response.iter_bytes():
+          content += chunk
+          if len(content) > self.max_bytes:
+            truncated = True
+            break
+      return self.finish(key, entry, response, bytes(content[:self.max_bytes]), truncated)
+
+  async def fetch_async(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, body: Optional[str] = None) -> Tuple[str, bool]:
+    headers = headers or {}
+    key, entry = self.cached_entry(method, url, headers)
+    if not entry is None and entry["expires_at"] > time():
+      return entry["output"], entry["error"]
+
+    client = self.http_client_pool.async_http_client()
+    async with client.stream(method, url, headers= self.conditional_headers(headers, entry), content= body, timeout= self.timeout, follow_redirects= True) as response:
+      content = bytearray()
+      truncated = False
+      if response.status_code != 304 and self.textual(response):
+        async for chunk in response.aiter_bytes():
+          content += chunk
+          if len(content) > self.max_bytes:
+            truncated = True
+            break
+      return self.finish(key, entry, response, bytes(content[:self.max_bytes]), truncated)
+
+  def cached_entry(self, method: str, url: str, headers: Dict[str, str]) -> Tuple[Optional[str], Optional[dict]]:
+    if self.cache is None or method.upper() != "GET":
+      return None, None
+    key = dumps({ "url": url, "headers": headers }, sort_keys= True)
+    return key, self.cache.get(key)
+
+  def conditional_headers(self, headers: Dict[str, str], entry: Optional[dict]) -> Dict[str, str]:
+    if entry is None:
+      return headers
+    conditional = dict(headers)
+    if not entry["etag"] is None:
+      conditional["If-None-Match"] = entry["etag"]
+    if not entry["last_modified"] is None:
+      conditional["If-Modified-Since"] = entry["last_modified"]
+    return conditional
+
+  def finish(self, key: Optional[str], entry: Optional[dict], response: Response, content: bytes, truncated: bool) -> Tuple[str, bool]:
+    if response.status_code == 304 and not entry is None:
+      # The cached result is still valid, only its freshness is renewed
+      entry = { **entry, "expires_at": self.expires_at(response) or 0.0 }
+      self.cache.set(key, entry)
+      return entry["output"], entry["error"]
+
+    output = self.output(response, content, truncated)
+    error = response.is_error
+
+    expires_at = self.expires_at(response)
+    etag = response.headers.get("etag")
+    last_modified = response.headers.get("last-modified")
+    if not key is None and response.status_code == 200 and not expires_at is None and (expires_at > time() or not etag is None or not last_modified is None):
+      self.cache.set(key, { "output": output, "error": error, "expires_at": expires_at, "etag": etag, "last_modified": last_modified })
+    return output, error
+
+  def output(self, response: Response, content: bytes, truncated: bool) -> str:
+    if not self.textual(response):
+      size = response.headers.get("content-length", "an unknown number of")
+      output = f"[Binary response of type {response.headers.get('content-type')} with {size} bytes, the content is not shown]"
+    else:
+      output = content.decode(response.encoding or "utf-8", errors= "replace")
+      if truncated:
+        output += f"\n[Truncated after {self.max_bytes} bytes of the response]"
+
+    if response.is_error:
+      return f"Request failed: {response.status_code} {response.reason_phrase}\n{output}"
+    return output
+
+  def textual(self, response: Response) -> bool:
+    content_type = response.headers.get("content-type")
+    if content_type is None:
+      return True
+    return any(text_type in content_type.lower() for text_type in self.text_types)
+
+  def expires_at(self, response: Response) -> Optional[float]:
+    directives = [directive.strip().lower() for directive in response.headers.get("cache-control", "").split(",")]
+    if "no-store" in directives:
+      return None
+    if "no-cache" in directives:
+      return 0.0
+
+    for directive in directives:
+      if directive.startswith("max-age="):
+        try:
+          return time() + int(directive.removeprefix("max-age="))
+        except ValueError:
+          return 0.0
+
+    expires = response.headers.get("expires")
+    if not expires is None:
+      try:
+        return parsedate_to_datetime(expires).timestamp()
+      except (TypeError, ValueError):
+        return 0.0
+    return 0.0
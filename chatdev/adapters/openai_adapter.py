@@ -2,12 +2,24 @@
 This module defines the `OpenAIAdapter` class which interacts with OpenAI models.
 
 Modules Imported:
-- `Message`, `Thread`, `TextBlock`, `ToolUseBlock` from `chatdev.entities`: Represents various components of workflows and tool interactions.
+- `Message`, `Thread`, `TextBlock`, `ToolUseBlock`, `Usage` from `chatdev.entities`: Represents various components of workflows and tool interactions.
 - `Adapter` from `.adapter`: Represents the generic adapter interface.
-- `OpenAI` from `openai`: Initializes the OpenAI client.
-- `List` from `typing`: Specifies list type.
+- `ToolExecutor` from `.tool_executor`: Runs the tool calls of a message.
+- `StreamHandler` from `.stream_handler`: Receives streamed output.
+- `StreamAccumulator` from `.stream_accumulator`: Assembles streamed output into a message.
+- `ResponseCache` from `.response_cache`: Records and replays LLM responses.
+- `RateLimiter` from `.rate_limiter`: Keeps the requests within the rate limits of the provider.
+- `RetryPolicy` from `.retry_policy`: Decides whether and when failed requests are retried.
+- `ThreadCompactor` from `.thread_compactor`: Shrinks the thread sent to the provider.
+- `WorkspaceIndex` from `.workspace_index`: Lists the files of a workspace incrementally.
+- `DockerSession` from `.docker_session`: Runs commands in a long-lived container per workspace.
+- `HttpFetcher` from `.http_fetcher`: Sends the requests of the request tool.
+- `FileReader` from `.file_reader`: Reads capped ranges of files.
+- `OpenAI`, `APIConnectionError` from `openai`: Initializes the OpenAI client and identifies connection errors to retry.
+- `Dict`, `List`, `Optional`, `Tuple` from `typing`: Specifies dict, list, optional and tuple types.
 - `chain` from `itertools`: Chains multiple iterables together.
 - `dumps`, `loads` from `json`: Serializes and deserializes JSON objects.
+- `WeakKeyDictionary` from `weakref`: Caches the payloads of messages without keeping them alive.
 
 Classes:
 - `OpenAIAdapter`: Manages interactions with OpenAI models.
@@ -16,37 +28,79 @@ Classes:
 Attributes:
 - `client` (OpenAI): The OpenAI client.
 - `model` (str): The model identifier for the OpenAI AI.
+- `payloads` (WeakKeyDictionary): The message payloads converted so far, shared by all OpenAI adapters since messages don't change once appended to a thread.
 
 Methods:
-- `__init__(self, client: OpenAI, model: str)`: Initializes the OpenAIAdapter with the specified client and model.
-- `generate_llm_response(self, thread: Thread) -> None`: Generates a response from the OpenAI model based on the provided thread.
+- `__init__(self, client: OpenAI, model: str, tool_executor: Optional[ToolExecutor] = None, stream_handler: Optional[StreamHandler] = None, response_cache: Optional[ResponseCache] = None, rate_limiter: Optional[RateLimiter] = None, retry_policy: Optional[RetryPolicy] = None, compactor: Optional[ThreadCompactor] = None, workspace_indexes: Optional[Dict[str, WorkspaceIndex]] = None, docker_sessions: Optional[Dict[str, DockerSession]] = None, http_fetcher: Optional[HttpFetcher] = None, file_reader: Optional[FileReader] = None)`: Initializes the OpenAIAdapter with the specified client, model, tool executor, stream handler, response cache, rate limiter, retry policy, compactor, workspace indexes, docker sessions, HTTP fetcher and file reader.
+- `send_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]`: Sends the request to the OpenAI model and returns the response and its token usage.
+- `llm_request(self, thread: Thread) -> dict`: Builds the arguments of the chat completions API call for the thread.
+- `response_to_message(self, response) -> Tuple[Message, Usage]`: Converts a chat completion into a message and its usage.
+- `stream_llm_response(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]`: Streams a response and stops as soon as a stop phrase appears.
+- `add_stream_chunk(self, accumulator: StreamAccumulator, chunk, usage: Optional[Usage]) -> Optional[Usage]`: Passes a stream chunk to the accumulator and returns the usage, once reported.
+- `stream_result(self, request: dict, accumulator: StreamAccumulator, usage: Optional[Usage]) -> Tuple[Message, Usage]`: Returns the streamed message and its usage, estimated if the stream was stopped early.
+- `usage_to_entity(self, usage) -> Usage`: Converts the usage reported by the API including cached prompt tokens.
+- `message_payloads(self, message: Message) -> List[dict]`: Returns the payloads of a message, converting it only the first time it is sent.
 - `split_messages(self, message: Message) -> List[Message]`: Splits a message into individual message components for processing.
 - `del_none(self, d)`: Deletes keys with the value `None` in a dictionary, recursively.
 """
 
-from chatdev.entities import Message, Thread, TextBlock, ToolUseBlock
+from chatdev.entities import Message, Thread, TextBlock, ToolUseBlock, Usage
 from .adapter import Adapter
-from openai import OpenAI
-from typing import List
+from .tool_executor import ToolExecutor
+from .stream_handler import StreamHandler
+from .stream_accumulator import StreamAccumulator
+from .response_cache import ResponseCache
+from .rate_limiter import RateLimiter
+from .retry_policy import RetryPolicy
+from .thread_compactor import ThreadCompactor
+from .workspace_index import WorkspaceIndex
+from .docker_session import DockerSession
+from .http_fetcher import HttpFetcher
+from .file_reader import FileReader
+from openai import OpenAI, APIConnectionError
+from typing import Dict, List, Optional, Tuple
 from itertools import chain
 from json import dumps, loads
+from weakref import WeakKeyDictionary
 
 class OpenAIAdapter(Adapter):
   client: OpenAI
   model: str
 
-  def __init__(self, client: OpenAI, model: str):
-    super().__init__()
+  connection_errors: tuple = (APIConnectionError,)
+
+  payloads: WeakKeyDictionary = WeakKeyDictionary()
+
+  def __init__(self, client: OpenAI, model: str, tool_executor: Optional[ToolExecutor] = None, stream_handler: Optional[StreamHandler] = None, response_cache: Optional[ResponseCache] = None, rate_limiter: Optional[RateLimiter] = None, retry_policy: Optional[RetryPolicy] = None, compactor: Optional[ThreadCompactor] = None, workspace_indexes: Optional[Dict[str, WorkspaceIndex]] = None, docker_sessions: Optional[Dict[str, DockerSession]] = None, http_fetcher: Optional[HttpFetcher] = None, file_reader: Optional[FileReader] = None):
+    super().__init__(tool_executor= tool_executor, stream_handler= stream_handler, response_cache= response_cache, rate_limiter= rate_limiter, retry_policy= retry_policy, compactor= compactor, workspace_indexes= workspace_indexes, docker_sessions= docker_sessions, http_fetcher= http_fetcher, file_reader= file_reader)
 
     self.client = client
     self.model = model
 
-  def generate_llm_response(self, thread: Thread) -> None:
+  def send_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]:
+    if not self.stream_handler is None:
+      return self.stream_llm_response(request, stop_phrases)
+
+    response= self.client.chat.completions.create(**request)
+
+    return self.response_to_message(response)
+
+  def response_to_message(self, response) -> Tuple[Message, Usage]:
+    choice = response.choices[0]
+    text_blocks = [TextBlock(choice.message.content)] if not choice.message.content is None else []
+    tool_use_blocks = [ToolUseBlock(id= call.id, name= call.function.name, input= loads(call.function.arguments)) for call in choice.message.tool_calls] if not choice.message.tool_calls is None else []
+    message = Message(
+      role= "assistant",
+      content= text_blocks + tool_use_blocks,
+    )
+
+    return message, self.usage_to_entity(response.usage) if not response.usage is None else Usage()
 
-    response= self.client.chat.completions.create(
-      model= self.model,
-      messages= list(chain.from_iterable([self.split_messages(message) for message in thread.messages])),
-      tools= [{
+  def llm_request(self, thread: Thread) -> dict:
+    return {
+      "model": self.model,
+      "messages": list(chain.from_iterable([self.message_payloads(message) for message in thread.messages])),
+      "tools": [{
         "type": "function",
         "function": {
           "name": tool.name,
@@ -54,16 +108,60 @@ class OpenAIAdapter(Adapter):
           "parameters": tool.input_schema
         }
       } for tool in self.tools]
+    }
+
+  def stream_llm_response(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]:
+    accumulator = StreamAccumulator(stream_handler= self.stream_handler, stop_phrases= stop_phrases)
+    usage = None
+
+    stream = self.client.chat.completions.create(**request, stream= True, stream_options= { "include_usage": True })
+    try:
+      for chunk in stream:
+        usage = self.add_stream_chunk(accumulator, chunk, usage)
+        if accumulator.stopped:
+          break
+    finally:
+      stream.close()
+
+    return self.stream_result(request, accumulator, usage)
+
+  def add_stream_chunk(self, accumulator: StreamAccumulator, chunk, usage: Optional[Usage]) -> Optional[Usage]:
+    if not chunk.usage is None:
+      usage = self.usage_to_entity(chunk.usage)
+    if len(chunk.choices) == 0:
+      return usage
+
+    delta = chunk.choices[0].delta
+    if not delta.content is None:
+      accumulator.add_text(0, delta.content)
+    for call in delta.tool_calls or []:
+      # Index 0 holds the text, tool calls follow it
+      if not call.id is None:
+        accumulator.start_tool_use(call.index + 1, call.id, call.function.name)
+      if not call.function is None and not call.function.arguments is None:
+        accumulator.add_tool_input(call.index + 1, call.function.arguments)
+    return usage
+
+  def stream_result(self, request: dict, accumulator: StreamAccumulator, usage: Optional[Usage]) -> Tuple[Message, Usage]:
+    if usage is None:
+      # Usage is only sent with the last chunk, estimate it if the stream was stopped early
+      usage = Usage(input_tokens= len(dumps(request["messages"])) // 4, output_tokens= accumulator.text_length() // 4)
+
+    return accumulator.message(), usage
+
+  def usage_to_entity(self, usage) -> Usage:
+    # OpenAI caches prompt prefixes automatically and only reports the tokens read from the cache
+    details = getattr(usage, "prompt_tokens_details", None)
+    return Usage(
+      input_tokens= usage.prompt_tokens,
+      output_tokens= usage.completion_tokens,
+      cache_read_tokens= (getattr(details, "cached_tokens", None) or 0) if not details is None else 0
     )
 
-    choice = response.choices[0]
-    text_blocks = [TextBlock(choice.message.content)] if not choice.message.content is None else []
-    tool_use_blocks = [ToolUseBlock(id= call.id, name= call.function.name, input= loads(call.function.arguments)) for call in choice.message.tool_calls] if not choice.message.tool_calls is None else []
-    message = Message(
-      role= "assistant",
-      content= text_blocks + tool_use_blocks,
-    )
-    thread.append_message(message)
+  def message_payloads(self, message: Message) -> List[dict]:
+    if not message in self.payloads:
+      self.payloads[message] = self.split_messages(message)
+    return self.payloads[message]
 
   def split_messages(self, message: Message) -> List[Message]:
 
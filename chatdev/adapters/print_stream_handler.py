@@ -0,0 +1,30 @@
+"""
+This module defines the `PrintStreamHandler` class which prints streamed LLM responses live.
+
+Modules Imported:
+- `Message`, `ToolUseBlock` from `chatdev.entities`: Represents the streamed message and its tool calls.
+- `StreamHandler` from `.stream_handler`: Represents the generic stream handler interface.
+
+Classes:
+- `PrintStreamHandler`: Prints text deltas and tool calls to stdout as they arrive.
+
+`PrintStreamHandler` Class:
+Methods:
+- `on_text(self, text: str)`: Prints the text delta without a line break.
+- `on_tool_use(self, block: ToolUseBlock)`: Prints the name and input of the tool call.
+- `on_message_end(self, message: Message)`: Prints the separator after a message.
+"""
+
+from chatdev.entities import Message, ToolUseBlock
+from .stream_handler import StreamHandler
+
+class PrintStreamHandler(StreamHandler):
+
+  def on_text(self, text: str) -> None:
+    print(text, end= "", flush= True)
+
+  def on_tool_use(self, block: ToolUseBlock) -> None:
+    print(f"\n[{block.name}] {block.input}", flush= True)
+
+  def on_message_end(self, message: Message) -> None:
+    print("\n\n=====\n", flush= True)
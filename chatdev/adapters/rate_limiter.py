@@ -0,0 +1,105 @@
+"""
+This module defines the `RateLimiter` class which keeps the requests to a provider within its rate limits.
+
+Modules Imported:
+- `Optional` from `typing`: Specifies optional types.
+- `Lock` from `threading`: Guards the buckets shared by all adapters of a provider.
+- `monotonic`, `sleep` from `time`: Measures and waits for refills.
+- `asyncio`: Waits for refills without blocking the event loop.
+
+Classes:
+- `RateLimiter`: Token buckets for requests per minute and tokens per minute.
+
+`RateLimiter` Class:
+Both buckets hold up to one minute of their limit and refill continuously. `acquire` reserves a request and its
+estimated tokens right away and waits until the buckets are no longer in debt, so waiting callers are served in
+order and the estimate is corrected with the actual usage by `settle`. A limit of `None` means unlimited.
+
+Attributes:
+- `requests_per_minute` (Optional[int]): The maximum number of requests per minute.
+- `tokens_per_minute` (Optional[int]): The maximum number of input and output tokens per minute.
+- `request_bucket` (float): The requests currently available.
+- `token_bucket` (float): The tokens currently available.
+- `refilled_at` (float): The monotonic time the buckets were last refilled.
+- `paused_until` (float): The monotonic time requests may be sent again after a provider asked to retry later.
+- `lock` (Lock): Guards the buckets.
+
+Methods:
+- `__init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None)`: Initializes a RateLimiter with full buckets.
+- `reserve(self, tokens: int) -> float`: Reserves a request with the given tokens and returns the seconds to wait before sending it.
+- `acquire(self, tokens: int)`: Reserves a request and waits until it may be sent.
+- `acquire_async(self, tokens: int)`: Reserves a request and waits on the event loop until it may be sent.
+- `settle(self, estimated_tokens: int, actual_tokens: int)`: Corrects the token bucket by the difference between estimated and actual tokens.
+- `pause(self, seconds: float)`: Holds back all requests for the given seconds.
+- `refill(self, now: float)`: Refills the buckets for the time passed.
+"""
+
+from typing import Optional
+from threading import Lock
+from time import monotonic, sleep
+import asyncio
+
+class RateLimiter:
+  requests_per_minute: Optional[int]
+  tokens_per_minute: Optional[int]
+  request_bucket: float
+  token_bucket: float
+  refilled_at: float
+  paused_until: float
+  lock: Lock
+
+  def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None):
+    self.requests_per_minute = requests_per_minute
+    self.tokens_per_minute = tokens_per_minute
+    self.request_bucket = float(requests_per_minute or 0)
+    self.token_bucket = float(tokens_per_minute or 0)
+    self.refilled_at = monotonic()
+    self.paused_until = 0.0
+    self.lock = Lock()
+
+  def reserve(self, tokens: int) -> float:
+    with self.lock:
+      now = monotonic()
+      self.refill(now)
+      wait = max(0.0, self.paused_until - now)
+
+      if not self.requests_per_minute is None:
+        self.request_bucket -= 1
+        if self.request_bucket < 0:
+          wait = max(wait, -self.request_bucket * 60 / self.requests_per_minute)
+
+      if not self.tokens_per_minute is None:
+        # A request larger than the whole bucket can never fit, it only waits for a full bucket
+        self.token_bucket -= min(tokens, self.tokens_per_minute)
+        if self.token_bucket < 0:
+          wait = max(wait, -self.token_bucket * 60 / self.tokens_per_minute)
+
+      return wait
+
+  def acquire(self, tokens: int) -> None:
+    wait = self.reserve(tokens)
+    if wait > 0:
+      sleep(wait)
+
+  async def acquire_async(self, tokens: int) -> None:
+    wait = self.reserve(tokens)
+    if wait > 0:
+      await asyncio.sleep(wait)
+
+  def settle(self, estimated_tokens: int, actual_tokens: int) -> None:
+    if self.tokens_per_minute is None:
+      return
+    with self.lock:
+      self.token_bucket += min(estimated_tokens, self.tokens_per_minute) - actual_tokens
+
+  def pause(self, seconds: float) -> None:
+    with self.lock:
+      self.paused_until = max(self.paused_until, monotonic() + seconds)
+
+  def refill(self, now: float) -> None:
+    elapsed = now - self.refilled_at
+    self.refilled_at = now
+    if not self.requests_per_minute is None:
+      self.request_bucket = min(float(self.requests_per_minute), self.request_bucket + elapsed * self.requests_per_minute / 60)
+    if not self.tokens_per_minute is None:
+      self.token_bucket = min(float(self.tokens_per_minute), self.token_bucket + elapsed * self.tokens_per_minute / 60)
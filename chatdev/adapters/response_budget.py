@@ -0,0 +1,74 @@
+"""
+This module defines the `ResponseBudget` class which limits how much work an adapter may do for a conversation.
+
+Modules Imported:
+- `Optional` from `typing`: Specifies optional types.
+- `monotonic` from `time`: Measures elapsed wall-clock time.
+- `Usage` from `chatdev.entities`: Represents the tokens consumed so far.
+
+Classes:
+- `ResponseBudget`: Tracks turns, wall-clock time and tokens against configurable limits.
+
+`ResponseBudget` Class:
+A budget is shared by all `Adapter.generate_response` calls of a conversation, so a runaway chain of tool
+calls is cut off once any limit is reached. A limit of `None` means unlimited.
+
+Attributes:
+- `max_turns` (Optional[int]): The maximum number of LLM calls.
+- `max_seconds` (Optional[float]): The maximum wall-clock time in seconds, measured from the first call.
+- `max_tokens` (Optional[int]): The maximum number of input and output tokens.
+- `turns` (int): The number of LLM calls made so far.
+- `usage` (Usage): The tokens used so far.
+- `started_at` (Optional[float]): The monotonic time of the first call, if any.
+
+Methods:
+- `__init__(self, max_turns: Optional[int] = 100, max_seconds: Optional[float] = None, max_tokens: Optional[int] = None)`: Initializes a budget with the given limits.
+- `renewed(self) -> ResponseBudget`: Returns a fresh budget with the same limits.
+- `start(self)`: Starts the wall-clock deadline, if it isn't running yet.
+- `consume(self, usage: Usage)`: Records a finished LLM call.
+- `stop_reason(self) -> Optional[str]`: Returns the name of the exhausted limit, if any.
+"""
+
+from typing import Optional
+from time import monotonic
+from chatdev.entities import Usage
+
+class ResponseBudget:
+  max_turns: Optional[int]
+  max_seconds: Optional[float]
+  max_tokens: Optional[int]
+  turns: int
+  usage: Usage
+  started_at: Optional[float]
+
+  def __init__(self, max_turns: Optional[int] = 100, max_seconds: Optional[float] = None, max_tokens: Optional[int] = None):
+    self.max_turns = max_turns
+    self.max_seconds = max_seconds
+    self.max_tokens = max_tokens
+    self.turns = 0
+    self.usage = Usage()
+    self.started_at = None
+
+  def renewed(self) -> 'ResponseBudget':
+    return ResponseBudget(
+      max_turns= self.max_turns,
+      max_seconds= self.max_seconds,
+      max_tokens= self.max_tokens
+    )
+
+  def start(self) -> None:
+    if self.started_at is None:
+      self.started_at = monotonic()
+
+  def consume(self, usage: Usage) -> None:
+    self.turns += 1
+    self.usage = self.usage + usage
+
+  def stop_reason(self) -> Optional[str]:
+    if not self.max_turns is None and self.turns >= self.max_turns:
+      return "max_turns"
+    if not self.max_seconds is None and not self.started_at is None and monotonic() - self.started_at >= self.max_seconds:
+      return "deadline"
+    if not self.max_tokens is None and self.usage.total_tokens() >= self.max_tokens:
+      return "max_tokens"
+    return None
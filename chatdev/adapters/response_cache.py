@@ -0,0 +1,75 @@
+"""
+This module defines the `ResponseCache` class which records and replays LLM responses on disk.
+
+Modules Imported:
+- `List`, `Optional`, `Tuple` from `typing`: Specifies list, optional and tuple types.
+- `Message`, `Usage` from `chatdev.entities`: Represents the cached responses.
+- `Cache` from `diskcache`: Stores the responses on disk with size-based eviction.
+- `dumps` from `json`: Serializes requests canonically.
+- `sha256` from `hashlib`: Hashes the canonical requests into cache keys.
+
+Classes:
+- `ResponseCache`: Caches LLM responses keyed on the full request sent to the provider.
+
+`ResponseCache` Class:
+The key is a hash of the canonical JSON of the provider request (model, messages, tools and parameters) and the
+stop phrases. In `"record"` mode responses are served from the cache if present and stored otherwise. In
+`"replay"` mode every response must come from the cache and a miss raises a `LookupError`, so whole workflow
+runs can be repeated without any network access.
+
+Attributes:
+- `mode` (str): Either `"record"` or `"replay"`.
+- `cache` (Cache): The on-disk cache, evicting the least recently used responses beyond its size limit.
+
+Methods:
+- `__init__(self, directory: str = ".chatdev-cache", mode: str = "record", size_limit: int = 2 ** 30)`: Initializes the cache in the given directory.
+- `key(self, request: dict, stop_phrases: Optional[List[str]] = None) -> str`: Returns the cache key of a request.
+- `get(self, key: str) -> Optional[Tuple[Message, Usage]]`: Returns the cached response, if any.
+- `set(self, key: str, message: Message, usage: Usage)`: Stores a response, unless replaying.
+- `close(self)`: Closes the on-disk cache.
+"""
+
+from typing import List, Optional, Tuple
+from chatdev.entities import Message, Usage
+from diskcache import Cache
+from json import dumps
+from hashlib import sha256
+
+class ResponseCache:
+  mode: str
+  cache: Cache
+
+  modes: List[str] = ["record", "replay"]
+
+  def __init__(self, directory: str = ".chatdev-cache", mode: str = "record", size_limit: int = 2 ** 30):
+    if not mode in self.modes:
+      raise ValueError(f"Invalid response cache mode {mode}, expected one of {', '.join(self.modes)}")
+
+    self.mode = mode
+    self.cache = Cache(directory, size_limit= size_limit, eviction_policy= "least-recently-used")
+
+  def key(self, request: dict, stop_phrases: Optional[List[str]] = None) -> str:
+    canonical = dumps(
+      { "request": request, "stop_phrases": stop_phrases or [] },
+      sort_keys= True,
+      separators= (",", ":"),
+      ensure_ascii= False,
+      default= str
+    )
+    return sha256(canonical.encode("utf-8")).hexdigest()
+
+  def get(self, key: str) -> Optional[Tuple[Message, Usage]]:
+    entry = self.cache.get(key)
+    if entry is None:
+      if self.mode == "replay":
+        raise LookupError(f"No recorded response for request {key}")
+      return None
+    return Message.from_dict(entry["message"]), Usage.from_dict(entry["usage"])
+
+  def set(self, key: str, message: Message, usage: Usage) -> None:
+    if self.mode == "replay":
+      return
+    self.cache.set(key, { "message": message.dict(), "usage": usage.dict() })
+
+  def close(self) -> None:
+    self.cache.close()
@@ -0,0 +1,46 @@
+"""
+This module defines the `ResponseRequest` class which describes a response a workflow step waits for.
+
+Modules Imported:
+- `List`, `Optional` from `typing`: Specifies list and optional types.
+- `Thread` from `chatdev.entities`: Represents the thread the response is appended to.
+- `Adapter` from `.adapter`: Represents the adapter generating the response.
+- `ResponseBudget` from `.response_budget`: Limits the LLM calls of the response.
+
+Classes:
+- `ResponseRequest`: Represents the arguments of a single `generate_response` call.
+
+`ResponseRequest` Class:
+Workflow steps yield requests instead of calling the adapter, so the same steps can be driven synchronously
+or on an asyncio event loop.
+
+Attributes:
+- `adapter` (Adapter): The adapter generating the response.
+- `thread` (Thread): The thread the response is appended to.
+- `budget` (ResponseBudget): The budget of the response.
+- `stop_phrases` (Optional[List[str]]): Phrases that end a streamed response.
+
+Methods:
+- `__init__(self, adapter: Adapter, thread: Thread, budget: ResponseBudget, stop_phrases: Optional[List[str]] = None)`: Initializes a ResponseRequest.
+- `__str__(self)`: Returns a string representation of the request.
+"""
+
+from typing import List, Optional
+from chatdev.entities import Thread
+from .adapter import Adapter
+from .response_budget import ResponseBudget
+
+class ResponseRequest:
+  adapter: Adapter
+  thread: Thread
+  budget: ResponseBudget
+  stop_phrases: Optional[List[str]]
+
+  def __init__(self, adapter: Adapter, thread: Thread, budget: ResponseBudget, stop_phrases: Optional[List[str]] = None):
+    self.adapter = adapter
+    self.thread = thread
+    self.budget = budget
+    self.stop_phrases = stop_phrases
+
+  def __str__(self):
+    return f"ResponseRequest(adapter= {type(self.adapter).__name__}, stop_phrases= {self.stop_phrases})"
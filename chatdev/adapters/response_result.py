@@ -0,0 +1,46 @@
+"""
+This module defines the `ResponseResult` class which describes the outcome of `Adapter.generate_response`.
+
+Modules Imported:
+- `List`, `Optional` from `typing`: Specifies list and optional types.
+- `Usage` from `chatdev.entities`: Represents the tokens used for the response.
+- `CallRecord` from `.call_record`: Records the timing and usage of a single call.
+
+Classes:
+- `ResponseResult`: Represents the outcome of generating a response including all tool calls.
+
+`ResponseResult` Class:
+Attributes:
+- `turns` (int): The number of LLM calls made for the response.
+- `usage` (Usage): The tokens used by these calls.
+- `stop_reason` (str): Why the response ended, `"end_turn"` if the model answered without tool calls,
+  otherwise the exhausted budget limit (`"max_turns"`, `"deadline"` or `"max_tokens"`).
+- `records` (List[CallRecord]): The records of all LLM and tool calls made for the response.
+
+Methods:
+- `__init__(self, turns: int, usage: Usage, stop_reason: str, records: Optional[List[CallRecord]] = None)`: Initializes a ResponseResult.
+- `exhausted(self) -> bool`: Returns whether the response was cut off by the budget.
+- `__str__(self)`: Returns a string representation of the result.
+"""
+
+from typing import List, Optional
+from chatdev.entities import Usage
+from .call_record import CallRecord
+
+class ResponseResult:
+  turns: int
+  usage: Usage
+  stop_reason: str
+  records: List[CallRecord]
+
+  def __init__(self, turns: int, usage: Usage, stop_reason: str, records: Optional[List[CallRecord]] = None):
+    self.turns = turns
+    self.usage = usage
+    self.stop_reason = stop_reason
+    self.records = records if not records is None else []
+
+  def exhausted(self) -> bool:
+    return self.stop_reason != "end_turn"
+
+  def __str__(self):
+    return f"ResponseResult(turns= {self.turns}, usage= {self.usage}, stop_reason= {self.stop_reason})"
@@ -0,0 +1,92 @@
+"""
+This module defines the `RetryPolicy` class which decides whether and when a failed LLM request is retried.
+
+Modules Imported:
+- `Optional`, `Set` from `typing`: Specifies optional and set types.
+- `random` from `random`: Jitters the backoff.
+- `parsedate_to_datetime` from `email.utils`: Parses retry-after dates.
+- `datetime`, `timezone` from `datetime`: Converts retry-after dates into delays.
+
+Classes:
+- `RetryPolicy`: Exponential backoff with full jitter that honors the retry-after headers of the provider.
+
+`RetryPolicy` Class:
+Rate limits (429), timeouts, conflicts and server errors (5xx) are retried, as well as errors the adapter reports
+as connection errors. The delay of attempt `n` is a random value up to `base_delay * 2 ** n`, capped at
+`max_delay`, unless the provider sent `retry-after-ms` or `retry-after`, which is used instead.
+
+Attributes:
+- `max_attempts` (int): The maximum number of attempts per request, including the first one.
+- `base_delay` (float): The maximum delay in seconds after the first attempt.
+- `max_delay` (float): The maximum delay in seconds.
+- `retry_status_codes` (Set[int]): The HTTP status codes that are retried besides server errors.
+
+Methods:
+- `__init__(self, max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 60.0)`: Initializes a RetryPolicy.
+- `delay(self, attempt: int, error: Exception, connection_error: bool = False) -> Optional[float]`: Returns the seconds to wait before the next attempt, `None` if the error is not retried.
+- `retryable(self, error: Exception, connection_error: bool) -> bool`: Returns whether the error is transient.
+- `retry_after(self, error: Exception) -> Optional[float]`: Returns the delay requested by the provider, if any.
+- `status_code(error: Exception) -> Optional[int]`: Returns the HTTP status code of an error, if any.
+"""
+
+from typing import Optional, Set
+from random import random
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+class RetryPolicy:
+  max_attempts: int
+  base_delay: float
+  max_delay: float
+
+  retry_status_codes: Set[int] = { 408, 409, 429 }
+
+  def __init__(self, max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+    self.max_attempts = max_attempts
+    self.base_delay = base_delay
+    self.max_delay = max_delay
+
+  def delay(self, attempt: int, error: Exception, connection_error: bool = False) -> Optional[float]:
+    if attempt + 1 >= self.max_attempts or not self.retryable(error, connection_error):
+      return None
+
+    retry_after = self.retry_after(error)
+    if not retry_after is None:
+      return min(retry_after, self.max_delay)
+    return random() * min(self.max_delay, self.base_delay * 2 ** attempt)
+
+  def retryable(self, error: Exception, connection_error: bool) -> bool:
+    status_code = self.status_code(error)
+    if status_code is None:
+      return connection_error
+    return status_code in self.retry_status_codes or status_code >= 500
+
+  def retry_after(self, error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is None:
+      return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if not retry_after_ms is None:
+      try:
+        return max(0.0, float(retry_after_ms) / 1000)
+      except ValueError:
+        pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after is None:
+      try:
+        return max(0.0, float(retry_after))
+      except ValueError:
+        pass
+      try:
+        return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+      except (TypeError, ValueError):
+        pass
+    return None
+
+  @staticmethod
+  def status_code(error: Exception) -> Optional[int]:
+    status_code = getattr(error, "status_code", None)
+    return status_code if isinstance(status_code, int) else None
@@ -0,0 +1,111 @@
+"""
+This module defines the `StreamAccumulator` class which assembles a streamed LLM response into a message.
+
+Modules Imported:
+- `Dict`, `List`, `Optional` from `typing`: Specifies dictionary, list and optional types.
+- `Message`, `ContentBlock`, `TextBlock`, `ToolUseBlock` from `chatdev.entities`: Represents the assembled message.
+- `StreamHandler` from `.stream_handler`: Receives the output while it is streamed.
+- `loads` from `json`: Parses the streamed tool inputs.
+
+Classes:
+- `StreamAccumulator`: Collects provider-independent stream events and detects stop phrases.
+
+`StreamAccumulator` Class:
+Provider adapters translate their stream events into calls of the accumulator, which forwards the output to the
+stream handler. As soon as the text contains one of the stop phrases, the text is cut after the phrase, all later
+content blocks are dropped and `stopped` is set, so the adapter can close the stream and save the trailing tokens.
+
+Attributes:
+- `stream_handler` (StreamHandler): Receives the output while it is streamed.
+- `stop_phrases` (List[str]): Phrases that end the generation as soon as they appear.
+- `stopped` (bool): Whether a stop phrase was found.
+- `stop_index` (Optional[int]): The index of the text block the stop phrase was found in.
+
+Methods:
+- `__init__(self, stream_handler: Optional[StreamHandler], stop_phrases: Optional[List[str]] = None)`: Initializes the accumulator.
+- `add_text(self, index: int, text: str) -> bool`: Adds a text delta to the block at the index and returns whether a stop phrase was found.
+- `start_tool_use(self, index: int, id: str, name: str)`: Starts a tool call block at the index.
+- `add_tool_input(self, index: int, partial_json: str)`: Adds a part of the JSON input of the tool call at the index.
+- `finish_tool_use(self, index: int)`: Parses the input of the tool call at the index and reports it.
+- `text_length(self) -> int`: Returns the number of text characters received.
+- `message(self) -> Message`: Returns the assembled assistant message.
+"""
+
+from typing import Dict, List, Optional
+from chatdev.entities import Message, ContentBlock, TextBlock, ToolUseBlock
+from .stream_handler import StreamHandler
+from json import loads
+
+class StreamAccumulator:
+  stream_handler: StreamHandler
+  stop_phrases: List[str]
+  stopped: bool
+
+  def __init__(self, stream_handler: Optional[StreamHandler], stop_phrases: Optional[List[str]] = None):
+    self.stream_handler = stream_handler if not stream_handler is None else StreamHandler()
+    self.stop_phrases = stop_phrases if not stop_phrases is None else []
+    self.stopped = False
+    self.stop_index: Optional[int] = None
+    self.texts: Dict[int, str] = {}
+    self.tool_uses: Dict[int, dict] = {}
+    self.finished_tool_uses: Dict[int, ToolUseBlock] = {}
+    self.stream_handler.on_message_start()
+
+  def add_text(self, index: int, text: str) -> bool:
+    if self.stopped or text == "":
+      return self.stopped
+
+    previous = self.texts.get(index, "")
+    combined = previous + text
+    stop_ends = [combined.find(phrase) + len(phrase) for phrase in self.stop_phrases if phrase in combined]
+    if len(stop_ends) > 0:
+      combined = combined[:min(stop_ends)]
+      self.stopped = True
+      self.stop_index = index
+
+    self.texts[index] = combined
+    self.stream_handler.on_text(combined[len(previous):])
+    return self.stopped
+
+  def start_tool_use(self, index: int, id: str, name: str) -> None:
+    if self.stopped:
+      return
+    self.tool_uses[index] = { "id": id, "name": name, "input": "" }
+
+  def add_tool_input(self, index: int, partial_json: str) -> None:
+    if self.stopped or not index in self.tool_uses:
+      return
+    self.tool_uses[index]["input"] += partial_json
+
+  def finish_tool_use(self, index: int) -> None:
+    if not index in self.tool_uses or index in self.finished_tool_uses:
+      return
+    tool_use = self.tool_uses[index]
+    block = ToolUseBlock(
+      id= tool_use["id"],
+      name= tool_use["name"],
+      input= loads(tool_use["input"]) if tool_use["input"] != "" else {}
+    )
+    self.finished_tool_uses[index] = block
+    self.stream_handler.on_tool_use(block)
+
+  def text_length(self) -> int:
+    return sum(len(text) for text in self.texts.values())
+
+  def message(self) -> Message:
+    for index in self.tool_uses:
+      if self.stop_index is None or index < self.stop_index:
+        self.finish_tool_use(index)
+
+    blocks: Dict[int, ContentBlock] = {}
+    for index, text in self.texts.items():
+      blocks[index] = TextBlock(text= text)
+    for index, block in self.finished_tool_uses.items():
+      blocks[index] = block
+
+    message = Message(
+      role= "assistant",
+      content= [blocks[index] for index in sorted(blocks) if self.stop_index is None or index <= self.stop_index]
+    )
+    self.stream_handler.on_message_end(message)
+    return message
@@ -0,0 +1,35 @@
+"""
+This module defines the `StreamHandler` class which receives the output of streamed LLM responses.
+
+Modules Imported:
+- `Message`, `ToolUseBlock` from `chatdev.entities`: Represents the streamed message and its tool calls.
+
+Classes:
+- `StreamHandler`: Receives text deltas and tool calls while a response is generated.
+
+`StreamHandler` Class:
+Adapters with a stream handler request streamed responses and call the handler as soon as output arrives.
+All methods do nothing by default, subclasses override what they need.
+
+Methods:
+- `on_message_start(self)`: Called when the model starts a new message.
+- `on_text(self, text: str)`: Called for every text delta.
+- `on_tool_use(self, block: ToolUseBlock)`: Called once the input of a tool call is complete.
+- `on_message_end(self, message: Message)`: Called with the complete message.
+"""
+
+from chatdev.entities import Message, ToolUseBlock
+
+class StreamHandler:
+
+  def on_message_start(self) -> None:
+    pass
+
+  def on_text(self, text: str) -> None:
+    pass
+
+  def on_tool_use(self, block: ToolUseBlock) -> None:
+    pass
+
+  def on_message_end(self, message: Message) -> None:
+    pass
@@ -0,0 +1,96 @@
+"""
+This module defines the `StubAdapter` class which answers with a `StubScript` instead of a model.
+
+Modules Imported:
+- `Message`, `Thread`, `Usage` from `chatdev.entities`: Represents the thread, the responses and their token usage.
+- `Adapter` from `.adapter`: Represents the generic adapter interface.
+- `StubScript` from `.stub_script`: Generates the scripted responses.
+- `ToolExecutor` from `.tool_executor`: Runs the tool calls of a message.
+- `StreamHandler` from `.stream_handler`: Receives streamed output.
+- `ResponseCache` from `.response_cache`: Records and replays LLM responses.
+- `RateLimiter` from `.rate_limiter`: Keeps the requests within the rate limits.
+- `RetryPolicy` from `.retry_policy`: Decides whether and when failed requests are retried.
+- `ThreadCompactor` from `.thread_compactor`: Shrinks the thread sent to the script.
+- `WorkspaceIndex` from `.workspace_index`: Lists the files of a workspace incrementally.
+- `DockerSession` from `.docker_session`: Runs commands in a long-lived container per workspace.
+- `HttpFetcher` from `.http_fetcher`: Sends the requests of the request tool.
+- `FileReader` from `.file_reader`: Reads capped ranges of files.
+- `Dict`, `List`, `Optional`, `Tuple` from `typing`: Specifies dict, list, optional and tuple types.
+- `WeakKeyDictionary` from `weakref`: Caches the payloads of messages without keeping them alive.
+- `sleep` from `time`: Simulates the latency of a response.
+
+Classes:
+- `StubAdapter`: Runs workflows offline with scripted responses, e.g. to measure the overhead of ChatDev itself.
+
+`StubAdapter` Class:
+The script takes the place of the provider client. Requests contain the messages in the format of `Message.dict()`
+and go through the response cache, rate limiter and retries like those of the provider adapters. Everything but the
+model runs for real, including the tools. With a stream handler, responses are replayed to it after the latency.
+
+Attributes:
+- `client` (StubScript): The script answering the requests.
+- `model` (str): The model identifier, any identifier starting with `stub`.
+- `payloads` (WeakKeyDictionary): The message payloads converted so far, shared by all stub adapters.
+
+Methods:
+- `__init__(self, client: Optional[StubScript] = None, model: str = "stub", tool_executor: Optional[ToolExecutor] = None, stream_handler: Optional[StreamHandler] = None, response_cache: Optional[ResponseCache] = None, rate_limiter: Optional[RateLimiter] = None, retry_policy: Optional[RetryPolicy] = None, compactor: Optional[ThreadCompactor] = None, workspace_indexes: Optional[Dict[str, WorkspaceIndex]] = None, docker_sessions: Optional[Dict[str, DockerSession]] = None, http_fetcher: Optional[HttpFetcher] = None, file_reader: Optional[FileReader] = None)`: Initializes the StubAdapter with a script, immediate responses without tool calls by default.
+- `llm_request(self, thread: Thread) -> dict`: Builds the request with the messages of the thread.
+- `message_payload(self, message: Message) -> dict`: Returns the payload of a message, converting it only the first time it is sent.
+- `send_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]`: Waits for the latency of the script and returns its response.
+- `scripted_response(self, request: dict) -> Tuple[Message, Usage]`: Returns the response of the script and its estimated usage.
+"""
+
+from chatdev.entities import Message, Thread, Usage
+from .adapter import Adapter
+from .stub_script import StubScript
+from .tool_executor import ToolExecutor
+from .stream_handler import StreamHandler
+from .response_cache import ResponseCache
+from .rate_limiter import RateLimiter
+from .retry_policy import RetryPolicy
+from .thread_compactor import ThreadCompactor
+from .workspace_index import WorkspaceIndex
+from .docker_session import DockerSession
+from .http_fetcher import HttpFetcher
+from .file_reader import FileReader
+from typing import Dict, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+from time import sleep
+
+class StubAdapter(Adapter):
+  client: StubScript
+  model: str
+
+  payloads: WeakKeyDictionary = WeakKeyDictionary()
+
+  def __init__(self, client: Optional[StubScript] = None, model: str = "stub", tool_executor: Optional[ToolExecutor] = None, stream_handler: Optional[StreamHandler] = None, response_cache: Optional[ResponseCache] = None, rate_limiter: Optional[RateLimiter] = None, retry_policy: Optional[RetryPolicy] = None, compactor: Optional[ThreadCompactor] = None, workspace_indexes: Optional[Dict[str, WorkspaceIndex]] = None, docker_sessions: Optional[Dict[str, DockerSession]] = None, http_fetcher: Optional[HttpFetcher] = None, file_reader: Optional[FileReader] = None):
+    super().__init__(tool_executor= tool_executor, stream_handler= stream_handler, response_cache= response_cache, rate_limiter= rate_limiter, retry_policy= retry_policy, compactor= compactor, workspace_indexes= workspace_indexes, docker_sessions= docker_sessions, http_fetcher= http_fetcher, file_reader= file_reader)
+
+    self.client = client if not client is None else StubScript()
+    self.model = model
+
+  def llm_request(self, thread: Thread) -> dict:
+    return {
+      "model": self.model,
+      "messages": [self.message_payload(message) for message in thread.messages]
+    }
+
+  def message_payload(self, message: Message) -> dict:
+    if not message in self.payloads:
+      self.payloads[message] = message.dict()
+    return self.payloads[message]
+
+  def send_llm_request(self, request: dict, stop_phrases: Optional[List[str]]) -> Tuple[Message, Usage]:
+    delay = self.client.delay()
+    if delay > 0:
+      sleep(delay)
+    return self.scripted_response(request)
+
+  def scripted_response(self, request: dict) -> Tuple[Message, Usage]:
+    message = self.client.respond(request["messages"])
+    self.replay_to_stream_handler(message)
+
+    # About four characters per token, like the estimates of the rate limiter
+    input_characters = sum(len(StubScript.text(payload)) for payload in request["messages"])
+    output_characters = sum(len(block.text) for block in message.text_blocks())
+    return message, Usage(input_tokens= input_characters // 4, output_tokens= output_characters // 4)
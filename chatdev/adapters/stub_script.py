@@ -0,0 +1,130 @@
+"""
+This module defines the `StubScript` class which answers LLM requests offline, following the workflow protocol.
+
+Modules Imported:
+- `Message`, `TextBlock`, `ToolUseBlock` from `chatdev.entities`: Represents the scripted responses.
+- `Callable`, `List`, `Optional` from `typing`: Specifies callable, list and optional types.
+- `Random` from `random`: Draws latencies and reply texts reproducibly.
+- `Lock` from `threading`: Guards the random generator of concurrent requests.
+- `log` from `math`: Converts the median of log-normal latencies.
+
+Classes:
+- `StubScript`: Generates scripted responses with configurable latencies and tool calls.
+
+`StubScript` Class:
+Scripts answer like a model that follows the workflow instructions: the sanity check and phase starts are
+answered with "SUCCESS", every conversation turn first makes the scripted tool calls, one per response, and then
+replies with text. The lead ends a conversation with "END CONVERSATION" after `turns_per_conversation` switches.
+Responses only depend on the messages of the current turn, so the same script serves the `StubAdapter` and servers
+mimicking the provider APIs. Messages are given in the format of `Message.dict()`.
+
+Attributes:
+- `tool_calls` (List[dict]): The tool calls of every conversation turn, with the `name` and `input` of a tool.
+- `turns_per_conversation` (int): The number of switches after which a conversation ends.
+- `reply_length` (int): The approximate number of characters of every text reply.
+- `latency` (Callable[[Random], float]): Draws the seconds a response takes.
+- `random` (Random): The seeded generator of latencies and reply texts.
+- `lock` (Lock): Guards the random generator.
+
+Methods:
+- `__init__(self, tool_calls: Optional[List[dict]] = None, turns_per_conversation: int = 2, reply_length: int = 400, latency: Optional[Callable[[Random], float]] = None, seed: int = 0)`: Initializes a script, responses are immediate by default.
+- `fixed(seconds: float) -> Callable[[Random], float]`: Returns a constant latency.
+- `uniform(low: float, high: float) -> Callable[[Random], float]`: Returns a uniformly distributed latency.
+- `lognormal(median: float, sigma: float) -> Callable[[Random], float]`: Returns a log-normally distributed latency, with the long tail of real providers.
+- `delay(self) -> float`: Draws the latency of a response.
+- `respond(self, messages: List[dict]) -> Message`: Returns the response to the messages.
+- `turn_start(self, messages: List[dict]) -> int`: Returns the index of the last message that isn't a tool result.
+- `switches(self, messages: List[dict], turn_start: int) -> int`: Returns the number of switches since the conversation started.
+- `reply(self, seed: int) -> str`: Returns a reply text.
+- `text(message: dict) -> str`: Returns the text of a message.
+"""
+
+from chatdev.entities import Message, TextBlock, ToolUseBlock
+from typing import Callable, List, Optional
+from random import Random
+from threading import Lock
+from math import log
+
+class StubScript:
+  tool_calls: List[dict]
+  turns_per_conversation: int
+  reply_length: int
+  latency: Callable[[Random], float]
+  random: Random
+  lock: Lock
+
+  words: List[str] = ["the", "workflow", "module", "returns", "input", "output", "file", "test", "builds", "and", "requirements", "design", "we", "should", "implement", "function", "class", "with", "a", "review"]
+
+  def __init__(self, tool_calls: Optional[List[dict]] = None, turns_per_conversation: int = 2, reply_length: int = 400, latency: Optional[Callable[[Random], float]] = None, seed: int = 0):
+    self.tool_calls = tool_calls if not tool_calls is None else []
+    self.turns_per_conversation = turns_per_conversation
+    self.reply_length = reply_length
+    self.latency = latency if not latency is None else StubScript.fixed(0.0)
+    self.random = Random(seed)
+    self.lock = Lock()
+
+  @staticmethod
+  def fixed(seconds: float) -> Callable[[Random], float]:
+    return lambda random: seconds
+
+  @staticmethod
+  def uniform(low: float, high: float) -> Callable[[Random], float]:
+    return lambda random: random.uniform(low, high)
+
+  @staticmethod
+  def lognormal(median: float, sigma: float) -> Callable[[Random], float]:
+    return lambda random: random.lognormvariate(log(median), sigma)
+
+  def delay(self) -> float:
+    with self.lock:
+      return self.latency(self.random)
+
+  def respond(self, messages: List[dict]) -> Message:
+    turn_start = self.turn_start(messages)
+    prompt = StubScript.text(messages[turn_start]).strip() if turn_start >= 0 else ""
+
+    if not prompt.startswith("START CONVERSATION") and prompt != "SWITCH":
+      return Message(role= "assistant", content= [TextBlock(text= "SUCCESS")])
+
+    calls = sum(1 for message in messages[turn_start + 1:] if message["role"] == "assistant" and any(block["type"] == "tool_use" for block in message["content"]))
+    if calls < len(self.tool_calls):
+      call = self.tool_calls[calls]
+      return Message(role= "assistant", content= [ToolUseBlock(id= f"stub_{len(messages)}_{calls}", name= call["name"], input= call["input"])])
+
+    text = f"Stub:\n\n{self.reply(len(messages))}"
+    if self.switches(messages, turn_start) >= self.turns_per_conversation:
+      text += "\n\nEND CONVERSATION"
+    return Message(role= "assistant", content= [TextBlock(text= text)])
+
+  def turn_start(self, messages: List[dict]) -> int:
+    for index in range(len(messages) - 1, -1, -1):
+      if messages[index]["role"] == "user" and any(block["type"] == "text" for block in messages[index]["content"]):
+        return index
+    return -1
+
+  def switches(self, messages: List[dict], turn_start: int) -> int:
+    switches = 0
+    for index in range(turn_start, -1, -1):
+      if messages[index]["role"] != "user":
+        continue
+      text = StubScript.text(messages[index]).strip()
+      if text.startswith("START CONVERSATION"):
+        break
+      if text == "SWITCH":
+        switches += 1
+    return switches
+
+  def reply(self, seed: int) -> str:
+    # Seeded by the position in the thread, so replays and provider servers produce the same texts
+    random = Random(seed)
+    words = []
+    length = 0
+    while length < self.reply_length:
+      word = random.choice(self.words)
+      words.append(word)
+      length += len(word) + 1
+    return " ".join(words)
+
+  @staticmethod
+  def text(message: dict) -> str:
+    return "\n".join(block["text"] for block in message["content"] if block["type"] == "text")
@@ -0,0 +1,173 @@
+"""
+This module defines the `ThreadCompactor` class which shrinks the thread sent to a provider.
+
+Modules Imported:
+- `Dict`, `List`, `Optional`, `Tuple` from `typing`: Specifies dict, list, optional and tuple types.
+- `Thread`, `ThreadSection`, `Message`, `TextBlock`, `ToolResultBlock` from `chatdev.entities`: Represents the thread and its parts.
+- `WeakKeyDictionary` from `weakref`: Caches the token estimates of messages without keeping them alive.
+- `dumps` from `json`: Serializes messages to estimate their tokens.
+
+Classes:
+- `ThreadCompactor`: Builds a compacted view of a thread before each LLM call.
+
+`ThreadCompactor` Class:
+The thread itself is never changed, so the journal on disk keeps the full history, only the view passed to
+`llm_request` is smaller. The strategies are applied in order:
+
+1. Completed sections (conversations) are replaced by their first message and a summary of their outcome, the
+   last text of the section and the files written in it. A section is only summarized once it has ended, so the
+   prefix stays the same for every later call and remains cacheable.
+2. If the view exceeds the token ceiling of the model, large tool results outside of the most recent messages are
+   replaced by stubs, oldest first.
+3. If it still exceeds the ceiling, the oldest summarized sections are dropped.
+
+Cache breakpoints are carried over to the view if the message they point to is still in it.
+
+Attributes:
+- `summarize_sections` (bool): Whether completed sections are summarized.
+- `keep_recent_messages` (int): The number of most recent messages whose tool results are never stubbed.
+- `stub_length` (int): The minimum length of tool results that are stubbed.
+- `token_limits` (Dict[str, int]): The context window per model name prefix, the longest matching prefix wins.
+- `ceiling_ratio` (float): The share of the context window the view may use, the rest is left for the response.
+- `token_estimates` (WeakKeyDictionary): The token estimates of the messages seen so far.
+
+Methods:
+- `__init__(self, summarize_sections: bool = True, keep_recent_messages: int = 6, stub_length: int = 400, token_limits: Optional[Dict[str, int]] = None, ceiling_ratio: float = 0.8)`: Initializes a ThreadCompactor.
+- `compact(self, thread: Thread, model: str) -> Thread`: Returns the compacted view of the thread for the model.
+- `token_ceiling(self, model: str) -> Optional[int]`: Returns the maximum number of tokens of the view for the model, if known.
+- `summarized_entries(self, thread: Thread) -> List[Tuple[int, Message]]`: Returns the messages with completed sections summarized, paired with their original index.
+- `section_summary(self, thread: Thread, section: ThreadSection) -> Message`: Summarizes a completed section.
+- `stub_tool_results(self, entries: List[Tuple[int, Message]], ceiling: int) -> List[Tuple[int, Message]]`: Replaces large, old tool results by stubs until the entries fit the ceiling.
+- `drop_sections(self, thread: Thread, entries: List[Tuple[int, Message]], ceiling: int) -> List[Tuple[int, Message]]`: Drops the oldest summarized sections until the entries fit the ceiling.
+- `estimated_tokens(self, message: Message) -> int`: Roughly estimates the tokens of a message.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from chatdev.entities import Thread, ThreadSection, Message, TextBlock, ToolResultBlock
+from weakref import WeakKeyDictionary
+from json import dumps
+
+class ThreadCompactor:
+  summarize_sections: bool
+  keep_recent_messages: int
+  stub_length: int
+  token_limits: Dict[str, int]
+  ceiling_ratio: float
+  token_estimates: WeakKeyDictionary
+
+  default_token_limits: Dict[str, int] = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-4": 8192,
+    "gpt-4-turbo": 128000,
+    "gpt-4o": 128000,
+    "claude-": 200000
+  }
+
+  def __init__(self, summarize_sections: bool = True, keep_recent_messages: int = 6, stub_length: int = 400, token_limits: Optional[Dict[str, int]] = None, ceiling_ratio: float = 0.8):
+    self.summarize_sections = summarize_sections
+    self.keep_recent_messages = keep_recent_messages
+    self.stub_length = stub_length
+    self.token_limits = token_limits if not token_limits is None else dict(self.default_token_limits)
+    self.ceiling_ratio = ceiling_ratio
+    self.token_estimates = WeakKeyDictionary()
+
+  def compact(self, thread: Thread, model: str) -> Thread:
+    entries = self.summarized_entries(thread) if self.summarize_sections else list(enumerate(thread.messages))
+
+    ceiling = self.token_ceiling(model)
+    if not ceiling is None:
+      entries = self.stub_tool_results(entries, ceiling)
+      entries = self.drop_sections(thread, entries, ceiling)
+
+    compacted = Thread(workspace_path= thread.workspace_path, messages= [message for _, message in entries])
+    positions = { index: position for position, (index, _) in enumerate(entries) }
+    compacted.cache_breakpoints = [positions[index] for index in thread.cache_breakpoints if index in positions]
+    return compacted
+
+  def token_ceiling(self, model: str) -> Optional[int]:
+    prefixes = [prefix for prefix in self.token_limits if model.startswith(prefix)]
+    if len(prefixes) == 0:
+      return None
+    return int(self.token_limits[max(prefixes, key= len)] * self.ceiling_ratio)
+
+  def summarized_entries(self, thread: Thread) -> List[Tuple[int, Message]]:
+    summaries = {
+      section.start: section for section in thread.completed_sections()
+      if section.end - section.start >= 2
+    }
+
+    entries = []
+    index = 0
+    while index < len(thread.messages):
+      if index in summaries:
+        section = summaries[index]
+        entries.append((section.start, thread.messages[section.start]))
+        entries.append((section.end, self.section_summary(thread, section)))
+        index = section.end + 1
+      else:
+        entries.append((index, thread.messages[index]))
+        index += 1
+    return entries
+
+  def section_summary(self, thread: Thread, section: ThreadSection) -> Message:
+    messages = thread.messages[section.start:section.end + 1]
+
+    outcome = next((
+      message.first_text_block().text for message in reversed(messages)
+      if message.role == "assistant" and not message.first_text_block() is None
+    ), "")
+    files = list(dict.fromkeys(
+      block.input["file_path"] for message in messages for block in message.tool_use_blocks()
+      if block.name in ["write_file", "edit_file"] and "file_path" in block.input
+    ))
+
+    summary = f"{outcome}\n\n(The {len(messages) - 1} messages of the completed conversation {section.name} were summarized to this final message."
+    if len(files) > 0:
+      summary += f" Files written: {', '.join(files)}. Read them again if you need their content."
+    return Message(role= "assistant", content= [TextBlock(text= summary + ")")])
+
+  def stub_tool_results(self, entries: List[Tuple[int, Message]], ceiling: int) -> List[Tuple[int, Message]]:
+    tokens = sum(self.estimated_tokens(message) for _, message in entries)
+    entries = list(entries)
+
+    for position in range(max(0, len(entries) - self.keep_recent_messages)):
+      if tokens <= ceiling:
+        break
+
+      index, message = entries[position]
+      if not any(isinstance(block, ToolResultBlock) and len(str(block.output)) >= self.stub_length for block in message.content):
+        continue
+
+      stubbed = Message(role= message.role, content= [
+        ToolResultBlock(
+          id= block.id,
+          output= f"[{len(str(block.output))} characters of tool output were removed to save context, repeat the tool call if you still need it]",
+          error= block.error
+        ) if isinstance(block, ToolResultBlock) and len(str(block.output)) >= self.stub_length else block
+        for block in message.content
+      ])
+      tokens += self.estimated_tokens(stubbed) - self.estimated_tokens(message)
+      entries[position] = (index, stubbed)
+
+    return entries
+
+  def drop_sections(self, thread: Thread, entries: List[Tuple[int, Message]], ceiling: int) -> List[Tuple[int, Message]]:
+    tokens = sum(self.estimated_tokens(message) for _, message in entries)
+
+    for section in thread.completed_sections():
+      if tokens <= ceiling:
+        break
+      # Summarized sections are exactly their first message and the summary, both can go without breaking tool call pairs
+      dropped = [(index, message) for index, message in entries if index == section.start or index == section.end]
+      if len(dropped) != 2:
+        continue
+      tokens -= sum(self.estimated_tokens(message) for _, message in dropped)
+      entries = [entry for entry in entries if not entry in dropped]
+
+    return entries
+
+  def estimated_tokens(self, message: Message) -> int:
+    if not message in self.token_estimates:
+      # About four characters per token
+      self.token_estimates[message] = len(dumps(message.dict(), default= str)) // 4
+    return self.token_estimates[message]
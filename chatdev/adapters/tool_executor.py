@@ -0,0 +1,70 @@
+"""
+This module defines the `ToolExecutor` class which runs the tool calls of a single message.
+
+Modules Imported:
+- `Awaitable`, `Callable`, `List`, `Optional`, `Sequence`, `Set` from `typing`: Specifies awaitable, callable, list, optional, sequence and set types.
+- `ToolUseBlock`, `ToolResultBlock` from `chatdev.entities`: Represents tool calls and their results.
+- `normpath` from `os.path`: Normalizes file paths so that different spellings of a path conflict.
+
+Classes:
+- `ToolExecutor`: Runs tool calls one after another and detects conflicting file access between them.
+
+`ToolExecutor` Class:
+Attributes:
+- `read_tools` (Set[str]): The tools that only read the file of their `file_path`.
+- `write_tools` (Set[str]): The tools that modify the files they access.
+- `workspace_tools` (Set[str]): The tools that access the whole workspace, like docker commands mounting it.
+
+Methods:
+- `execute(self, blocks: Sequence[ToolUseBlock], execute_tool: Callable[[ToolUseBlock], ToolResultBlock]) -> List[ToolResultBlock]`: Executes all blocks and returns their results in the order of the blocks.
+- `execute_async(self, blocks: Sequence[ToolUseBlock], execute_tool: Callable[[ToolUseBlock], Awaitable[ToolResultBlock]]) -> List[ToolResultBlock]`: Executes all blocks with a coroutine function and returns their results in the order of the blocks.
+- `file_access(self, block: ToolUseBlock) -> Optional[Set[str]]`: Returns the file paths read or written by a block, `None` meaning the whole workspace.
+- `writes(self, block: ToolUseBlock) -> bool`: Returns whether a block modifies the files it accesses.
+- `conflicts(self, first: ToolUseBlock, second: ToolUseBlock) -> bool`: Returns whether two blocks have to run in their original order.
+- `close(self)`: Releases resources held by the executor.
+"""
+
+from typing import Awaitable, Callable, List, Optional, Sequence, Set
+from chatdev.entities import ToolUseBlock, ToolResultBlock
+from os.path import normpath
+
+class ToolExecutor:
+
+  read_tools: Set[str] = {"read_file", "list_files"}
+  # A docker session command may change any file of the workspace
+  write_tools: Set[str] = {"write_file", "edit_file", "docker_session"}
+  # A docker command may mount and read any file of the workspace, but only a docker session is treated as writing
+  workspace_tools: Set[str] = {"docker", "docker_session"}
+
+  def execute(self, blocks: Sequence[ToolUseBlock], execute_tool: Callable[[ToolUseBlock], ToolResultBlock]) -> List[ToolResultBlock]:
+    return [execute_tool(block) for block in blocks]
+
+  async def execute_async(self, blocks: Sequence[ToolUseBlock], execute_tool: Callable[[ToolUseBlock], Awaitable[ToolResultBlock]]) -> List[ToolResultBlock]:
+    return [await execute_tool(block) for block in blocks]
+
+  def file_access(self, block: ToolUseBlock) -> Optional[Set[str]]:
+    if block.name in self.workspace_tools:
+      return None
+    if block.name not in self.read_tools and block.name not in self.write_tools:
+      return set()
+    if not isinstance(block.input, dict) or not isinstance(block.input.get("file_path"), str):
+      return None
+    return {normpath(block.input["file_path"])}
+
+  def writes(self, block: ToolUseBlock) -> bool:
+    return block.name in self.write_tools
+
+  def conflicts(self, first: ToolUseBlock, second: ToolUseBlock) -> bool:
+    if not self.writes(first) and not self.writes(second):
+      return False
+
+    first_access = self.file_access(first)
+    second_access = self.file_access(second)
+    if first_access is None:
+      return second_access is None or len(second_access) > 0
+    if second_access is None:
+      return len(first_access) > 0
+    return len(first_access & second_access) > 0
+
+  def close(self) -> None:
+    pass
@@ -0,0 +1,143 @@
+"""
+This module defines the `UsageReport` class which aggregates the call records of a workflow run.
+
+Modules Imported:
+- `Dict`, `List`, `Optional`, `Tuple` from `typing`: Specifies dict, list, optional and tuple types.
+- `Usage` from `chatdev.entities`: Represents aggregated token usage.
+- `CallRecord` from `.call_record`: Represents a single LLM or tool call.
+- `makedirs`, `path`, `replace` from `os`: Writes the report atomically.
+- `dumps`, `loads` from `json`: Serializes and deserializes the report.
+
+Classes:
+- `UsageReport`: Aggregates tokens, estimated cost and latency per phase, conversation, role and model.
+
+`UsageReport` Class:
+Costs are estimated from `prices`, the USD per million input, output, cache read and cache write tokens per
+model name prefix (the longest matching prefix wins). Models without a price have a cost of `None`.
+
+Attributes:
+- `records` (List[CallRecord]): All records of the run, in the order they were added.
+- `prices` (Dict[str, Tuple[float, float, float, float]]): The prices per model name prefix.
+
+Methods:
+- `__init__(self, prices: Optional[Dict[str, Tuple[float, float, float, float]]] = None)`: Initializes an empty report.
+- `add(self, records: List[CallRecord])`: Adds the records of a response.
+- `cost(self, model: str, usage: Usage) -> Optional[float]`: Returns the estimated cost of the usage in USD, if the model has a price.
+- `summary(self, records: List[CallRecord]) -> dict`: Aggregates tokens, cost and latency of the records.
+- `grouped(self, *keys: str) -> List[dict]`: Returns the summaries of the LLM calls grouped by the given record attributes.
+- `dict(self) -> dict`: Returns the report with totals, groups per phase, conversation, role and model, per tool and all records.
+- `write(self, file_path: str)`: Writes the report as JSON.
+- `percentile(values: List[float], percentile: float) -> float`: Returns a percentile of the values.
+- `load(file_path: str, prices: Optional[Dict[str, Tuple[float, float, float, float]]] = None) -> UsageReport`: Reads the records of a written report, e.g. to continue it in a resumed run.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from chatdev.entities import Usage
+from .call_record import CallRecord
+from os import makedirs, path, replace
+from json import dumps, loads
+
+class UsageReport:
+  records: List[CallRecord]
+  prices: Dict[str, Tuple[float, float, float, float]]
+
+  default_prices: Dict[str, Tuple[float, float, float, float]] = {
+    "gpt-4o": (2.5, 10.0, 1.25, 2.5),
+    "gpt-4o-mini": (0.15, 0.6, 0.075, 0.15),
+    "gpt-4-turbo": (10.0, 30.0, 10.0, 10.0),
+    "claude-3-opus": (15.0, 75.0, 1.5, 18.75),
+    "claude-3-5-sonnet": (3.0, 15.0, 0.3, 3.75),
+    "claude-3-sonnet": (3.0, 15.0, 0.3, 3.75),
+    "claude-3-haiku": (0.25, 1.25, 0.03, 0.3)
+  }
+
+  def __init__(self, prices: Optional[Dict[str, Tuple[float, float, float, float]]] = None):
+    self.records = []
+    self.prices = prices if not prices is None else dict(self.default_prices)
+
+  def add(self, records: List[CallRecord]) -> None:
+    self.records.extend(records)
+
+  def cost(self, model: str, usage: Usage) -> Optional[float]:
+    prefixes = [prefix for prefix in self.prices if model.startswith(prefix)]
+    if len(prefixes) == 0:
+      return None
+
+    input_price, output_price, cache_read_price, cache_write_price = self.prices[max(prefixes, key= len)]
+    uncached_tokens = usage.input_tokens - usage.cache_read_tokens - usage.cache_write_tokens
+    return (
+      uncached_tokens * input_price
+      + usage.output_tokens * output_price
+      + usage.cache_read_tokens * cache_read_price
+      + usage.cache_write_tokens * cache_write_price
+    ) / 1_000_000
+
+  def summary(self, records: List[CallRecord]) -> dict:
+    usage = Usage()
+    for record in records:
+      usage = usage + record.usage
+
+    costs = [self.cost(record.name, record.usage) for record in records if record.kind == "llm" and not record.cached]
+    seconds = sorted(record.seconds for record in records)
+
+    return {
+      "calls": len(records),
+      "cached_calls": len([record for record in records if record.cached]),
+      "errors": len([record for record in records if record.error]),
+      "usage": usage.dict(),
+      "cost": sum(cost for cost in costs if not cost is None) if any(not cost is None for cost in costs) else None,
+      "seconds": sum(seconds),
+      "p50_seconds": self.percentile(seconds, 0.5),
+      "p95_seconds": self.percentile(seconds, 0.95),
+      "max_seconds": seconds[-1] if len(seconds) > 0 else 0.0
+    }
+
+  def grouped(self, *keys: str) -> List[dict]:
+    groups: Dict[tuple, List[CallRecord]] = {}
+    for record in self.records:
+      if record.kind == "llm":
+        groups.setdefault(tuple(getattr(record, key) for key in keys), []).append(record)
+
+    return [
+      { **dict(zip(keys, group)), **self.summary(records) }
+      for group, records in groups.items()
+    ]
+
+  def dict(self) -> dict:
+    llm_records = [record for record in self.records if record.kind == "llm"]
+    tool_records = [record for record in self.records if record.kind == "tool"]
+    tools: Dict[str, List[CallRecord]] = {}
+    for record in tool_records:
+      tools.setdefault(record.name, []).append(record)
+
+    return {
+      "llm": self.summary(llm_records),
+      "tools": self.summary(tool_records),
+      "phases": self.grouped("phase"),
+      "conversations": self.grouped("phase", "conversation"),
+      "roles": self.grouped("phase", "conversation", "role", "name"),
+      "models": self.grouped("name"),
+      "tool_names": [{ "name": name, **self.summary(records) } for name, records in tools.items()],
+      "records": [record.dict() for record in self.records]
+    }
+
+  def write(self, file_path: str) -> None:
+    makedirs(path.dirname(file_path) or ".", exist_ok= True)
+    with open(f"{file_path}.tmp", 'w') as file:
+      file.write(dumps(self.dict(), indent= 2))
+    replace(f"{file_path}.tmp", file_path)
+
+  @staticmethod
+  def percentile(values: List[float], percentile: float) -> float:
+    if len(values) == 0:
+      return 0.0
+    return values[min(len(values) - 1, int(percentile * len(values)))]
+
+  @staticmethod
+  def load(file_path: str, prices: Optional[Dict[str, Tuple[float, float, float, float]]] = None) -> 'UsageReport':
+    with open(file_path, 'r') as file:
+      data = loads(file.read())
+
+    report = UsageReport(prices= prices)
+    report.add([CallRecord.from_dict(record) for record in data["records"]])
+    return report
@@ -0,0 +1,188 @@
+"""
+This module defines the `WorkspaceIndex` class which keeps an incrementally updated listing of a workspace.
+
+Modules Imported:
+- `Callable`, `Dict`, `List`, `Optional`, `Set`, `Tuple`, `TypeVar` from `typing`: Specifies callable, dict, list, optional, set, tuple and generic types.
+- `GitIgnoreSpec` from `pathspec`: Matches paths against `.gitignore` patterns.
+- `path`, `scandir`, `stat` from `os`: Lists directories and checks their modification times.
+- `Lock` from `threading`: Guards the cached listing against concurrent tool calls.
+- `insort` from `bisect`: Keeps cached listings sorted when writes are recorded.
+
+Classes:
+- `WorkspaceIndex`: Lists the files of a workspace, skipping ignored directories and reusing unchanged directory listings.
+
+`WorkspaceIndex` Class:
+The listing of every directory is cached together with the modification time of the directory. Adding, removing
+or renaming an entry changes the modification time, so a listing only stats every indexed directory and scans
+just the ones that changed. Files written by the tools themselves are written through `record_write`, which keeps
+the cached listing of their directory current without a rescan. It compares the modification times from before the
+write with the cached ones, a directory something else changed since its last scan, e.g. a docker session, is
+dropped from the cache and rescanned by the next listing instead.
+
+Directories in `ignored_directories` and directories ignored by a `.gitignore` (of the workspace or any indexed
+directory below it) are never entered. Files of the workflow itself (`.chatdev-*`) are never listed.
+
+Attributes:
+- `workspace_path` (str): The root of the workspace.
+- `ignored_directories` (Set[str]): Names of directories that are never entered.
+- `directories` (Dict[str, Tuple[int, List[str], List[str]]]): The cached modification time, files and subdirectories per relative directory path.
+- `gitignores` (Dict[str, Tuple[int, Optional[GitIgnoreSpec]]]): The cached modification time and patterns of the `.gitignore` per relative directory path.
+- `lock` (Lock): Guards the cached listings.
+
+Methods:
+- `__init__(self, workspace_path: str, ignored_directories: Optional[Set[str]] = None)`: Initializes an empty index of the workspace.
+- `files(self) -> List[str]`: Returns the paths of all files that aren't ignored, relative to the workspace.
+- `record_write(self, file_path: str, write: Callable[[], T]) -> T`: Calls `write` to write a file and adds the file to the cached listing, returns the result of `write`.
+- `modified(self, directory: str) -> Optional[int]`: Returns the modification time of a directory, `None` if it doesn't exist.
+- `listing(self, directory: str) -> Optional[Tuple[List[str], List[str]]]`: Returns the files and subdirectories of a directory, scanning it only if it changed.
+- `gitignore(self, directory: str, files: List[str]) -> Optional[GitIgnoreSpec]`: Returns the `.gitignore` patterns of a directory, if any.
+- `ignored(self, file_path: str, is_directory: bool, specs: List[Tuple[str, GitIgnoreSpec]]) -> bool`: Returns whether a path is ignored by the given `.gitignore` patterns.
+- `absolute_path(self, directory: str) -> str`: Returns the path of a relative directory on disk.
+"""
+
+from typing import Callable, Dict, List, Optional, Set, Tuple, TypeVar
+from pathspec import GitIgnoreSpec
+from os import path, scandir, stat
+from threading import Lock
+from bisect import insort
+
+T = TypeVar("T")
+
+class WorkspaceIndex:
+  workspace_path: str
+  ignored_directories: Set[str]
+  directories: Dict[str, Tuple[int, List[str], List[str]]]
+  gitignores: Dict[str, Tuple[int, Optional[GitIgnoreSpec]]]
+  lock: Lock
+
+  default_ignored_directories: Set[str] = {
+    ".git", ".hg", ".svn", "node_modules", "bower_components", ".venv", "venv", "__pycache__",
+    ".mypy_cache", ".pytest_cache", ".tox", ".gradle", ".idea", ".next", ".chatdev-cache"
+  }
+
+  def __init__(self, workspace_path: str, ignored_directories: Optional[Set[str]] = None):
+    self.workspace_path = workspace_path
+    self.ignored_directories = ignored_directories if not ignored_directories is None else set(self.default_ignored_directories)
+    self.directories = {}
+    self.gitignores = {}
+    self.lock = Lock()
+
+  def files(self) -> List[str]:
+    with self.lock:
+      files_list = []
+      visited = set()
+      pending: List[Tuple[str, List[Tuple[str, GitIgnoreSpec]]]] = [("", [])]
+
+      while len(pending) > 0:
+        directory, specs = pending.pop()
+        visited.add(directory)
+        listing = self.listing(directory)
+        if listing is None:
+          continue
+
+        files, subdirectories = listing
+        spec = self.gitignore(directory, files)
+        if not spec is None:
+          specs = specs + [(directory, spec)]
+
+        for file in files:
+          file_path = path.join(directory, file)
+          if not file.startswith(".chatdev-") and not self.ignored(file_path, False, specs):
+            files_list.append(file_path)
+
+        for subdirectory in reversed(subdirectories):
+          subdirectory_path = path.join(directory, subdirectory)
+          if not subdirectory in self.ignored_directories and not self.ignored(subdirectory_path, True, specs):
+            pending.append((subdirectory_path, specs))
+
+      # Listings of directories that were removed or became ignored would otherwise be kept forever
+      for directory in [directory for directory in self.directories if not directory in visited]:
+        del self.directories[directory]
+        self.gitignores.pop(directory, None)
+
+      return files_list
+
+  def record_write(self, file_path: str, write: Callable[[], T]) -> T:
+    parts = path.normpath(file_path).lstrip("/").split("/")
+    if parts[0] == "..":
+      return write()
+
+    with self.lock:
+      directories = ["/".join(parts[:depth]) for depth in range(len(parts))]
+      modified_before = [self.modified(directory) for directory in directories]
+      result = write()
+
+      for depth, name in enumerate(parts):
+        directory = directories[depth]
+        cached = self.directories.get(directory)
+        if cached is None:
+          continue
+
+        if cached[0] != modified_before[depth]:
+          # Something else changed the directory since it was scanned, only a rescan shows what
+          del self.directories[directory]
+          continue
+
+        _, files, subdirectories = cached
+        entries = files if depth == len(parts) - 1 else subdirectories
+        if not name in entries:
+          insort(entries, name)
+        # Only the write changed the directory, its new modification time must not cause a rescan
+        self.directories[directory] = (self.modified(directory), files, subdirectories)
+      return result
+
+  def modified(self, directory: str) -> Optional[int]:
+    try:
+      return stat(self.absolute_path(directory)).st_mtime_ns
+    except FileNotFoundError:
+      return None
+
+  def listing(self, directory: str) -> Optional[Tuple[List[str], List[str]]]:
+    modified = self.modified(directory)
+    if modified is None:
+      return None
+
+    cached = self.directories.get(directory)
+    if not cached is None and cached[0] == modified:
+      return cached[1], cached[2]
+
+    files = []
+    subdirectories = []
+    with scandir(self.absolute_path(directory)) as entries:
+      for entry in entries:
+        if entry.is_dir(follow_symlinks= False):
+          subdirectories.append(entry.name)
+        else:
+          files.append(entry.name)
+    files.sort()
+    subdirectories.sort()
+
+    self.directories[directory] = (modified, files, subdirectories)
+    return files, subdirectories
+
+  def gitignore(self, directory: str, files: List[str]) -> Optional[GitIgnoreSpec]:
+    if not ".gitignore" in files:
+      self.gitignores.pop(directory, None)
+      return None
+
+    gitignore_path = path.join(self.absolute_path(directory), ".gitignore")
+    # Editing a .gitignore doesn't change the modification time of its directory, so it is checked on its own
+    modified = stat(gitignore_path).st_mtime_ns
+    cached = self.gitignores.get(directory)
+    if not cached is None and cached[0] == modified:
+      return cached[1]
+
+    with open(gitignore_path, 'r', errors= "replace") as file:
+      spec = GitIgnoreSpec.from_lines(file.read().splitlines())
+    self.gitignores[directory] = (modified, spec)
+    return spec
+
+  def ignored(self, file_path: str, is_directory: bool, specs: List[Tuple[str, GitIgnoreSpec]]) -> bool:
+    for directory, spec in specs:
+      relative_path = path.relpath(file_path, directory) if directory != "" else file_path
+      if spec.match_file(relative_path + "/" if is_directory else relative_path):
+        return True
+    return False
+
+  def absolute_path(self, directory: str) -> str:
+    return path.join(self.workspace_path, directory) if directory != "" else self.workspace_path
@@ -0,0 +1,100 @@
+"""
+This module contains the AsyncWorkflowManager class responsible for executing AI workflows on an asyncio event loop.
+
+Modules Imported:
+- `Thread`, `Workflow` from `chatdev.entities`: Represents workflows and their thread execution.
+- `AsyncAdapterFactory`, `ResponseBudget` from `chatdev.adapters`: Manages asyncio adapter initialization and limits the LLM calls per conversation.
+- `WorkflowManager` from `.workflow_manager`: Provides the workflow steps.
+- `ResponseRequest`, `ResponseResult` from `chatdev.adapters`: Describes the responses of the steps.
+- `BranchRequest` from `.branch_request`: Asks for conversations to be run concurrently.
+- `create_task`, `gather`, `wait`, `FIRST_EXCEPTION` from `asyncio`: Runs the branches of concurrent conversations and cancels them once one fails.
+- `Generator`, `List`, `Optional`, `Union` from `typing`: Specifies generator, list, optional and union types.
+
+Classes:
+- `AsyncWorkflowManager`: Manages and executes AI workflows on an asyncio event loop.
+
+`AsyncWorkflowManager` Class:
+Attributes:
+- `adapter_factory` (AsyncAdapterFactory): The factory to create asyncio adapters.
+
+Methods:
+- `__init__(self, adapter_factory: AsyncAdapterFactory, budget: Optional[ResponseBudget] = None, max_concurrent_conversations: int = 1, scoped_threads: bool = False)`: Initializes the AsyncWorkflowManager with the adapter factory, conversation budget, concurrency and thread mode.
+- `execute(self, workflow: Workflow, input: str, workspace_path: Optional[str]) -> Thread`: Executes the provided workflow with specified input and workspace path and returns its thread.
+- `resume(self, workspace_path: str, workflow: Optional[Workflow] = None) -> Thread`: Continues the run in the workspace from its last checkpoint and returns its thread.
+- `run(self, steps: Generator[Union[ResponseRequest, BranchRequest], Union[ResponseResult, List[Thread]], Thread]) -> Thread`: Awaits the responses the steps ask for and returns the thread.
+- `run_branches(self, request: BranchRequest) -> List[Thread]`: Runs the steps of the branches as concurrent tasks and returns their threads, cancelling all of them once one fails.
+"""
+
+from chatdev.entities import Thread, Workflow
+from chatdev.adapters import AsyncAdapterFactory, ResponseBudget, ResponseRequest, ResponseResult
+from .workflow_manager import WorkflowManager
+from .branch_request import BranchRequest
+from asyncio import create_task, gather, wait, FIRST_EXCEPTION
+from typing import Generator, List, Optional, Union
+
+class AsyncWorkflowManager(WorkflowManager):
+  """
+  An AsyncWorkflowManager executes an AI workflow as a coroutine.
+
+  It runs the same steps as the WorkflowManager, but awaits every response, so many workflows
+  can run concurrently on a single event loop. Each concurrent workflow needs its own Workflow object.
+  """
+
+  adapter_factory: AsyncAdapterFactory
+
+  def __init__(self, adapter_factory: AsyncAdapterFactory, budget: Optional[ResponseBudget] = None, max_concurrent_conversations: int = 1, scoped_threads: bool = False):
+    """
+    Creates a new AsyncWorkflowManager with the given asyncio adapter factory, the budget each conversation may spend,
+    the number of independent conversations that may run at the same time and whether conversations run on scoped threads.
+    """
+    super().__init__(adapter_factory= adapter_factory, budget= budget, max_concurrent_conversations= max_concurrent_conversations, scoped_threads= scoped_threads)
+
+  async def execute(self, workflow: Workflow, input: str, workspace_path: Optional[str]) -> Thread:
+    """
+    Executes the workflow with the given input and returns its thread.
+    """
+    return await self.run(self.steps(workflow, input, workspace_path))
+
+  async def resume(self, workspace_path: str, workflow: Optional[Workflow] = None) -> Thread:
+    """
+    Continues the run in the workspace from its last checkpoint and returns its thread.
+    """
+    return await self.run(self.resumed_steps(workspace_path, workflow))
+
+  async def run(self, steps: Generator[Union[ResponseRequest, BranchRequest], Union[ResponseResult, List[Thread]], Thread]) -> Thread:
+    """
+    Awaits the responses the steps ask for until they end and returns the thread.
+    """
+    try:
+      request = next(steps)
+      while True:
+        if isinstance(request, BranchRequest):
+          result = await self.run_branches(request)
+        else:
+          result = await request.adapter.generate_response(request.thread, request.budget, request.stop_phrases)
+        request = steps.send(result)
+    except StopIteration as stop:
+      return stop.value
+    finally:
+      steps.close()
+
+  async def run_branches(self, request: BranchRequest) -> List[Thread]:
+    """
+    Runs the steps of every branch as a task on the event loop and returns the threads of the branches in order.
+
+    Once a branch fails the other tasks are cancelled and awaited before the failure is raised, so the workflow
+    doesn't close the workspace under them and they don't keep spending LLM calls.
+    """
+    tasks = [create_task(self.run(branch)) for branch in request.branches]
+    try:
+      await wait(tasks, return_when= FIRST_EXCEPTION)
+    finally:
+      pending = [task for task in tasks if not task.done()]
+      for task in pending:
+        task.cancel()
+      await gather(*pending, return_exceptions= True)
+
+    failures = [task.exception() for task in tasks if not task.cancelled() and not task.exception() is None]
+    if len(failures) > 0:
+      raise failures[0]
+    return [task.result() for task in tasks]
@@ -0,0 +1,113 @@
+"""
+This module contains the BatchRunner class responsible for executing many workflow inputs concurrently.
+
+Modules Imported:
+- `AsyncWorkflowManager` from `.async_workflow_manager`: Executes a single workflow on the event loop.
+- `workflows` from `chatdev.workflows`: Maps workflow names to workflows.
+- `Semaphore`, `gather` from `asyncio`: Bounds and awaits the concurrently running jobs.
+- `deepcopy` from `copy`: Gives every job its own copy of the workflow.
+- `dumps`, `loads` from `json`: Serializes and deserializes JSON objects.
+- `monotonic`, `time` from `time`: Measures the timing of jobs.
+- `format_exception` from `traceback`: Formats exception traceback for failed jobs.
+- `List` from `typing`: Specifies list types.
+
+Classes:
+- `BatchRunner`: Executes the jobs of a JSONL file with a bounded number of concurrent workflows.
+
+`BatchRunner` Class:
+Every line of the jobs file is a job `{"workflow": <name>, "input": <input>, "workspace_path": <path>}`,
+`workspace_path` and an `id` are optional. For each job a line
+`{"id", "workflow", "workspace_path", "status", "error", "started_at", "seconds", "messages"}` is appended to the
+results file once the job ended, so a failing job neither stops the batch nor loses the finished results.
+
+Attributes:
+- `workflow_manager` (AsyncWorkflowManager): The manager executing the workflows.
+- `max_concurrency` (int): The maximum number of workflows running at the same time.
+
+Methods:
+- `__init__(self, workflow_manager: AsyncWorkflowManager, max_concurrency: int = 4)`: Initializes the BatchRunner.
+- `run(self, jobs_path: str, results_path: str) -> List[dict]`: Executes all jobs of the jobs file and returns their results.
+- `read_jobs(self, jobs_path: str) -> List[dict]`: Reads the jobs, skipping empty lines.
+- `run_job(self, index: int, job: dict) -> dict`: Executes a single job and returns its result.
+"""
+
+from .async_workflow_manager import AsyncWorkflowManager
+from chatdev.workflows import workflows
+from asyncio import Semaphore, gather
+from copy import deepcopy
+from json import dumps, loads
+from time import monotonic, time
+from traceback import format_exception
+from typing import List
+
+class BatchRunner:
+  """
+  A BatchRunner executes the jobs of a JSONL file concurrently.
+  """
+
+  workflow_manager: AsyncWorkflowManager
+  max_concurrency: int
+
+  def __init__(self, workflow_manager: AsyncWorkflowManager, max_concurrency: int = 4):
+    """
+    Creates a new BatchRunner running at most `max_concurrency` workflows at the same time.
+    """
+    self.workflow_manager = workflow_manager
+    self.max_concurrency = max_concurrency
+
+  async def run(self, jobs_path: str, results_path: str) -> List[dict]:
+    """
+    Executes all jobs of the jobs file and appends their results to the results file as they finish.
+    """
+    jobs = self.read_jobs(jobs_path)
+    semaphore = Semaphore(self.max_concurrency)
+
+    with open(results_path, 'a') as results_file:
+      async def run_bounded(index: int, job: dict) -> dict:
+        async with semaphore:
+          result = await self.run_job(index, job)
+        results_file.write(dumps(result) + "\n")
+        results_file.flush()
+        return result
+
+      return await gather(*[run_bounded(index, job) for index, job in enumerate(jobs)])
+
+  def read_jobs(self, jobs_path: str) -> List[dict]:
+    """
+    Reads the jobs of the jobs file.
+    """
+    with open(jobs_path, 'r') as file:
+      return [loads(line) for line in file if line.strip() != ""]
+
+  async def run_job(self, index: int, job: dict) -> dict:
+    """
+    Executes a single job, failures are reported in the result instead of raised.
+    """
+    result = {
+      "id": job.get("id", index),
+      "workflow": job.get("workflow"),
+      "workspace_path": job.get("workspace_path"),
+      "status": "success",
+      "error": None,
+      "started_at": time(),
+      "seconds": 0.0,
+      "messages": 0
+    }
+    started = monotonic()
+
+    try:
+      if not job.get("workflow") in workflows:
+        raise KeyError(f"Unknown workflow '{job.get('workflow')}', known workflows are {', '.join(workflows)}")
+
+      # Workflows keep their progress, so concurrent jobs must not share one
+      workflow = deepcopy(workflows[job["workflow"]])
+      thread = await self.workflow_manager.execute(workflow, job["input"], job.get("workspace_path"))
+
+      result["workspace_path"] = thread.workspace_path
+      result["messages"] = len(thread.messages)
+    except Exception as e:
+      result["status"] = "failure"
+      result["error"] = ''.join(format_exception(type(e), value=e, tb= e.__traceback__))
+
+    result["seconds"] = monotonic() - started
+    return result
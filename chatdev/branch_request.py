@@ -0,0 +1,36 @@
+"""
+This module defines the `BranchRequest` class which asks for conversations to be run concurrently.
+
+Modules Imported:
+- `Generator`, `List` from `typing`: Specifies generator and list types.
+- `Thread` from `chatdev.entities`: Represents the thread branch every conversation runs on.
+- `ResponseRequest`, `ResponseResult` from `chatdev.adapters`: Describes the responses of the branches.
+
+Classes:
+- `BranchRequest`: Represents the steps of conversations that run concurrently.
+
+`BranchRequest` Class:
+Workflow steps yield a branch request instead of a `ResponseRequest` when independent conversations can run at the
+same time. The caller runs the steps of every branch to their end, concurrently, and sends back the threads they
+returned in the order of the branches.
+
+Attributes:
+- `branches` (List[Generator[ResponseRequest, ResponseResult, Thread]]): The steps of every branch.
+
+Methods:
+- `__init__(self, branches: List[Generator[ResponseRequest, ResponseResult, Thread]])`: Initializes a BranchRequest.
+- `__str__(self)`: Returns a string representation of the request.
+"""
+
+from typing import Generator, List
+from chatdev.entities import Thread
+from chatdev.adapters import ResponseRequest, ResponseResult
+
+class BranchRequest:
+  branches: List[Generator[ResponseRequest, ResponseResult, Thread]]
+
+  def __init__(self, branches: List[Generator[ResponseRequest, ResponseResult, Thread]]):
+    self.branches = branches
+
+  def __str__(self):
+    return f"BranchRequest(branches= {len(self.branches)})"
@@ -5,8 +5,11 @@ from .workflow_phase import WorkflowPhase
 from .workflow import Workflow
 from .message import Message
 from .thread import Thread
+from .thread_journal import ThreadJournal
+from .thread_section import ThreadSection
 from .tool import Tool
 from .content_blocks.content_block import ContentBlock
 from .content_blocks.text_block import TextBlock
 from .content_blocks.tool_result_block import ToolResultBlock
 from .content_blocks.tool_use_block import ToolUseBlock
+from .usage import Usage
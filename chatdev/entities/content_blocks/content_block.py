@@ -5,19 +5,27 @@ Classes:
 - `ContentBlock`: Represents a content block in the workflow messages.
 
 `ContentBlock` Class:
+Content blocks are slotted and immutable, their attributes are set once by the constructor of the subclass.
+
 Attributes:
-- `type` (str): The type of content block.
+- `type` (str): The type of content block, a class attribute of every subclass.
 
 Methods:
-- `__init__(self, type: str)`: Initializes a ContentBlock with the specified type.
+- `__setattr__(self, name: str, value)`: Rejects changes of the content block.
+- `__delattr__(self, name: str)`: Rejects changes of the content block.
 - `dict(self) -> dict`: Placeholder method for returning the dictionary representation of the content block.
 """
 
 class ContentBlock:
+  __slots__ = ()
+
   type: str
 
-  def __init__(self, type: str):
-    self.type = type
+  def __setattr__(self, name: str, value):
+    raise AttributeError(f"{type(self).__name__} is immutable, {name} can't be set")
+
+  def __delattr__(self, name: str):
+    raise AttributeError(f"{type(self).__name__} is immutable, {name} can't be deleted")
 
   def dict(self) -> dict:
     pass
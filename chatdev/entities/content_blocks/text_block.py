@@ -9,6 +9,7 @@ Classes:
 
 `TextBlock` Class:
 Attributes:
+- `type` (str): The type of the block, `text`.
 - `text` (str): The text content of the block.
 
 Methods:
@@ -20,17 +21,19 @@ Methods:
 from .content_block import ContentBlock
 
 class TextBlock(ContentBlock):
+  __slots__ = ("text",)
+
+  type: str = "text"
   text: str
 
   def __init__(self, text: str):
-    super().__init__(type= "text")
-
-    self.text = text
+    object.__setattr__(self, "text", text)
 
   def __str__(self):
     return f"TextBlock(text= {self.text})"
   
   def dict(self) -> dict:
     return {
+      "type": self.type,
       "text": self.text
     }
@@ -4,12 +4,14 @@ This module defines the `ToolResultBlock` class which represents a block of tool
 Modules Imported:
 - `ContentBlock` from `.content_block`: Represents a generic content block in a message.
 - `Any` from `typing`: Specifies any type for the output.
+- `intern` from `sys`: Shares the strings of tool call identifiers.
 
 Classes:
 - `ToolResultBlock`: Represents a block of tool result content in the workflow messages.
 
 `ToolResultBlock` Class:
 Attributes:
+- `type` (str): The type of the block, `tool_result`.
 - `id` (str): The identifier for the tool result block.
 - `output` (Any): The output of the tool result.
 - `error` (bool): Indicates whether the tool result contains an error (default is `False`).
@@ -22,24 +24,28 @@ Methods:
 
 from .content_block import ContentBlock
 from typing import Any
+from sys import intern
 
 class ToolResultBlock(ContentBlock):
+  __slots__ = ("id", "output", "error")
+
+  type: str = "tool_result"
   id: str
   output: Any
   error: bool
 
   def __init__(self, id: str, output: Any, error: bool = False):
-    super().__init__(type= "tool_result")
-
-    self.id = id
-    self.output = output
-    self.error = error
+    object.__setattr__(self, "id", intern(id))
+    object.__setattr__(self, "output", output)
+    object.__setattr__(self, "error", error)
 
   def __str__(self):
     return f"ToolResultBlock(id= {self.id}, output= {self.output})"
 
   def dict(self) -> dict:
     return {
+      "type": self.type,
       "id": self.id,
-      "output": self.output
+      "output": self.output,
+      "error": self.error
     }
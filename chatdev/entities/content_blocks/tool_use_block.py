@@ -4,12 +4,14 @@ This module defines the `ToolUseBlock` class which represents a block of tool us
 Modules Imported:
 - `ContentBlock` from `.content_block`: Represents a generic content block in a message.
 - `Any` from `typing`: Specifies any type for the input.
+- `intern` from `sys`: Shares the strings of tool names and identifiers.
 
 Classes:
 - `ToolUseBlock`: Represents a block of tool use content in the workflow messages.
 
 `ToolUseBlock` Class:
 Attributes:
+- `type` (str): The type of the block, `tool_use`.
 - `id` (str): The identifier for the tool use block.
 - `name` (str): The name of the tool used.
 - `input` (Any): The input provided to the tool.
@@ -22,24 +24,28 @@ Methods:
 
 from .content_block import ContentBlock
 from typing import Any
+from sys import intern
 
 class ToolUseBlock(ContentBlock):
+  __slots__ = ("id", "name", "input")
+
+  type: str = "tool_use"
   id: str
   name: str
   input: Any
 
   def __init__(self, id: str, name: str, input: Any):
-    super().__init__(type= "tool_use")
-
-    self.id = id
-    self.name = name
-    self.input = input
+    # The tool names repeat across all messages, identifiers are shared with the result of the call
+    object.__setattr__(self, "id", intern(id))
+    object.__setattr__(self, "name", intern(name))
+    object.__setattr__(self, "input", input)
 
   def __str__(self):
     return f"ToolUseBlock(id= {self.id}, name= {self.name}, input= {self.input})"
 
   def dict(self) -> dict:
     return {
+      "type": self.type,
       "id": self.id,
       "name": self.name,
       "input": self.input
@@ -2,7 +2,8 @@
 This module defines the `Message` class representing a message exchanged in the workflow.
 
 Modules Imported:
-- `List`, `Optional` from `typing`: Specifies list and optional types.
+- `Optional`, `Sequence`, `Tuple` from `typing`: Specifies optional, sequence and tuple types.
+- `intern` from `sys`: Shares the strings of roles.
 - `ContentBlock` from `.content_blocks.content_block`: Represents a generic content block in a message.
 - `TextBlock` from `.content_blocks.text_block`: Represents a block of text content in a message.
 - `ToolUseBlock` from `.content_blocks.tool_use_block`: Represents a block of tool use content in a message.
@@ -12,48 +13,72 @@ Classes:
 - `Message`: Represents a message in the workflow.
 
 `Message` Class:
+Messages are slotted and immutable, they don't change once appended to a thread. The content blocks are indexed
+by type when the message is created. Messages can be weakly referenced, so caches keyed by message don't keep
+them alive.
+
 Attributes:
 - `role` (str): The role responsible for the message.
-- `content` (List[ContentBlock]): List of content blocks associated with the message.
+- `content` (Tuple[ContentBlock, ...]): The content blocks associated with the message.
+- `text_content` (Tuple[TextBlock, ...]): The text blocks of the content.
+- `tool_use_content` (Tuple[ToolUseBlock, ...]): The tool use blocks of the content.
+- `tool_result_content` (Tuple[ToolResultBlock, ...]): The tool result blocks of the content.
 
 Methods:
-- `__init__(self, role: str, content: List[ContentBlock])`: Initializes a Message with role and content blocks.
-- `text_blocks(self) -> List[TextBlock]`: Returns a list of text blocks in the message.
+- `__init__(self, role: str, content: Sequence[ContentBlock])`: Initializes a Message with role and content blocks.
+- `__setattr__(self, name: str, value)`: Rejects changes of the message.
+- `__delattr__(self, name: str)`: Rejects changes of the message.
+- `text_blocks(self) -> Tuple[TextBlock, ...]`: Returns the text blocks in the message.
 - `first_text_block(self) -> Optional[TextBlock]`: Returns the first text block in the message, if any.
-- `tool_use_blocks(self) -> List[ToolUseBlock]`: Returns a list of tool use blocks in the message.
-- `tool_result_blocks(self) -> List[ToolResultBlock]`: Returns a list of tool result blocks in the message.
+- `tool_use_blocks(self) -> Tuple[ToolUseBlock, ...]`: Returns the tool use blocks in the message.
+- `tool_result_blocks(self) -> Tuple[ToolResultBlock, ...]`: Returns the tool result blocks in the message.
 - `__str__(self)`: Returns a string representation of the message.
 - `dict(self) -> dict`: Returns a dictionary representation of the message.
+- `from_dict(data: dict) -> Message`: Creates a message from its dictionary representation.
+- `content_block_from_dict(block: dict) -> ContentBlock`: Creates a content block from its dictionary representation.
 """
 
-from typing import List, Optional
+from typing import Optional, Sequence, Tuple
+from sys import intern
 from .content_blocks.content_block import ContentBlock
 from .content_blocks.text_block import TextBlock
 from .content_blocks.tool_use_block import ToolUseBlock
 from .content_blocks.tool_result_block import ToolResultBlock
 
 class Message:
+  __slots__ = ("role", "content", "text_content", "tool_use_content", "tool_result_content", "__weakref__")
+
   role: str
-  content: List[ContentBlock]
+  content: Tuple[ContentBlock, ...]
+  text_content: Tuple[TextBlock, ...]
+  tool_use_content: Tuple[ToolUseBlock, ...]
+  tool_result_content: Tuple[ToolResultBlock, ...]
+
+  def __init__(self, role: str, content: Sequence[ContentBlock]):
+    content = tuple(content)
+    object.__setattr__(self, "role", intern(role))
+    object.__setattr__(self, "content", content)
+    object.__setattr__(self, "text_content", tuple(block for block in content if isinstance(block, TextBlock)))
+    object.__setattr__(self, "tool_use_content", tuple(block for block in content if isinstance(block, ToolUseBlock)))
+    object.__setattr__(self, "tool_result_content", tuple(block for block in content if isinstance(block, ToolResultBlock)))
 
-  def __init__(self, role: str, content: List[ContentBlock]):
-    self.role = role
-    self.content = content
+  def __setattr__(self, name: str, value):
+    raise AttributeError(f"Message is immutable, {name} can't be set")
 
-  def text_blocks(self) -> List[TextBlock]:
-    return [block for block in self.content if isinstance(block, TextBlock)]
+  def __delattr__(self, name: str):
+    raise AttributeError(f"Message is immutable, {name} can't be deleted")
+
+  def text_blocks(self) -> Tuple[TextBlock, ...]:
+    return self.text_content
   
   def first_text_block(self) -> Optional[TextBlock]:
-    for block in self.content:
-      if isinstance(block, TextBlock):
-        return block
-    return None
+    return self.text_content[0] if self.text_content else None
   
-  def tool_use_blocks(self) -> List[ToolUseBlock]:
-    return [block for block in self.content if isinstance(block, ToolUseBlock)]
+  def tool_use_blocks(self) -> Tuple[ToolUseBlock, ...]:
+    return self.tool_use_content
 
-  def tool_result_blocks(self) -> List[ToolResultBlock]:
-    return [block for block in self.content if isinstance(block, ToolResultBlock)]
+  def tool_result_blocks(self) -> Tuple[ToolResultBlock, ...]:
+    return self.tool_result_content
 
   def __str__(self):
     content_str = ", ".join([block.__str__() for block in self.content])
@@ -64,3 +89,31 @@ class Message:
       "role": self.role,
       "content": [block.dict() for block in self.content]
     }
+
+  @staticmethod
+  def from_dict(data: dict) -> 'Message':
+    return Message(
+      role= data["role"],
+      content= [Message.content_block_from_dict(block) for block in data["content"]]
+    )
+
+  @staticmethod
+  def content_block_from_dict(block: dict) -> ContentBlock:
+    if block["type"] == "text":
+      return TextBlock(
+        text= block["text"]
+      )
+    elif block["type"] == "tool_use":
+      return ToolUseBlock(
+        id= block["id"],
+        name= block["name"],
+        input= block["input"]
+      )
+    elif block["type"] == "tool_result":
+      return ToolResultBlock(
+        id= block["id"],
+        output= block["output"],
+        error= block.get("error", False)
+      )
+    else:
+      raise ValueError(f"Unknown content block type {block['type']}")
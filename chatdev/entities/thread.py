@@ -2,44 +2,70 @@
 This module defines the `Thread` class representing a sequence of messages exchanged in the workflow.
 
 Modules Imported:
-- `List`, `Optional` from `typing`: Specifies list and optional types.
+- `List`, `Optional`, `Tuple` from `typing`: Specifies list, optional and tuple types.
 - `Message` from `.message`: Represents a message in the thread.
 - `Tool` from `.tool`: Represents a tool used in the thread (unused in class but imported).
 - `TextBlock` from `.content_blocks.text_block`: Represents a block of text content in a message.
 - `ToolUseBlock` from `.content_blocks.tool_use_block`: Represents a block of tool use content in a message.
+- `ThreadSection` from `.thread_section`: Represents a range of messages, e.g. a conversation.
 
 Classes:
 - `Thread`: Represents a sequence of messages in the workflow.
 
 `Thread` Class:
+Threads are slotted, only their messages and markers grow as the workflow runs. Concurrent conversations run on
+branches of the thread, which are merged back in the order of the workflow.
+
 Attributes:
 - `workspace_path` (str): Path to the workspace directory.
 - `messages` (List[Message]): List of messages associated with the thread.
+- `journal` (Optional[ThreadJournal]): The journal the thread is persisted to, if any.
+- `cache_breakpoints` (List[int]): Indices of messages that end a stable prefix of the thread, e.g. a completed conversation.
+- `sections` (List[ThreadSection]): The named ranges of messages, e.g. the conversations, in order.
 
 Methods:
-- `__init__(self, workspace_path: str, messages: List[Message])`: Initializes a Thread with workspace path and messages.
+- `__init__(self, workspace_path: str, messages: List[Message], journal: Optional[ThreadJournal] = None)`: Initializes a Thread with workspace path, messages and an optional journal.
 - `append_message(self, message: Message)`: Appends a message to the thread.
 - `append_text_message(self, text: str)`: Appends a text message to the thread.
+- `mark_cache_breakpoint(self)`: Marks the last message as the end of a prefix that won't change anymore.
+- `start_section(self, name: str) -> ThreadSection`: Starts a section with the next message.
+- `end_section(self)`: Ends the current section with the last message.
+- `completed_sections(self) -> List[ThreadSection]`: Returns the sections that have ended.
+- `branch(self) -> Thread`: Returns a thread continuing from the messages of this thread, without its journal.
+- `merge(self, branch: Thread, start: int)`: Appends the messages, sections and cache breakpoints a branch added after `start`.
 - `last_message(self) -> Optional[Message]`: Returns the last message in the thread, if any.
-- `last_message_tool_use_blocks(self) -> List[ToolUseBlock]`: Returns tool use blocks from the last message, if any.
+- `last_message_tool_use_blocks(self) -> Tuple[ToolUseBlock, ...]`: Returns tool use blocks from the last message, if any.
 - `last_message_text(self) -> Optional[str]`: Returns text content from the first text block of the last message, if any.
 - `__str__(self)`: Returns a string representation of the thread.
 - `dict(self) -> dict`: Returns a dictionary representation of the thread.
+- `from_dict(data: dict) -> Thread`: Creates a thread from its dictionary representation.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple, TYPE_CHECKING
 from .message import Message
 from .tool import Tool
 from .content_blocks.text_block import TextBlock
 from .content_blocks.tool_use_block import ToolUseBlock
+from .thread_section import ThreadSection
+
+if TYPE_CHECKING:
+  from .thread_journal import ThreadJournal
 
 class Thread:
+  __slots__ = ("workspace_path", "messages", "journal", "cache_breakpoints", "sections")
+
   workspace_path: str
   messages: List[Message]
+  journal: Optional['ThreadJournal']
+  cache_breakpoints: List[int]
+  sections: List[ThreadSection]
 
-  def __init__(self, workspace_path: str, messages: List[Message]):
+  def __init__(self, workspace_path: str, messages: List[Message], journal: Optional['ThreadJournal'] = None):
     self.workspace_path = workspace_path
     self.messages = messages
+    self.journal = journal
+    self.cache_breakpoints = []
+    self.sections = []
 
   def append_message(self, message: Message):
     self.messages.append(message)
@@ -51,13 +77,44 @@ class Thread:
       ])
     )
 
+  def mark_cache_breakpoint(self):
+    if len(self.messages) > 0 and (len(self.cache_breakpoints) == 0 or self.cache_breakpoints[-1] != len(self.messages) - 1):
+      self.cache_breakpoints.append(len(self.messages) - 1)
+
+  def start_section(self, name: str) -> ThreadSection:
+    self.end_section()
+    section = ThreadSection(name= name, start= len(self.messages))
+    self.sections.append(section)
+    return section
+
+  def end_section(self):
+    if len(self.sections) > 0 and not self.sections[-1].completed():
+      self.sections[-1].end = len(self.messages) - 1
+
+  def completed_sections(self) -> List[ThreadSection]:
+    return [section for section in self.sections if section.completed()]
+
+  def branch(self) -> 'Thread':
+    # Messages are immutable, so branches share them and only copy the lists
+    branch = Thread(workspace_path= self.workspace_path, messages= list(self.messages))
+    branch.cache_breakpoints = list(self.cache_breakpoints)
+    branch.sections = [ThreadSection(name= section.name, start= section.start, end= section.end) for section in self.sections]
+    return branch
+
+  def merge(self, branch: 'Thread', start: int):
+    self.end_section()
+    offset = len(self.messages) - start
+    self.messages.extend(branch.messages[start:])
+    self.sections.extend(ThreadSection(name= section.name, start= section.start + offset, end= section.end + offset if section.completed() else None) for section in branch.sections if section.start >= start)
+    self.cache_breakpoints.extend(breakpoint + offset for breakpoint in branch.cache_breakpoints if breakpoint >= start)
+
   def last_message(self) -> Optional[Message]:
     return self.messages[-1] if self.messages else None
   
-  def last_message_tool_use_blocks(self) -> List[ToolUseBlock]:
+  def last_message_tool_use_blocks(self) -> Tuple[ToolUseBlock, ...]:
     message = self.last_message()
     if message is None:
-      return []
+      return ()
     return message.tool_use_blocks()
   
   def last_message_text(self) -> Optional[str]:
@@ -78,3 +135,10 @@ class Thread:
       "workspace_path": self.workspace_path,
       "messages": [message.dict() for message in self.messages]
     }
+
+  @staticmethod
+  def from_dict(data: dict) -> 'Thread':
+    return Thread(
+      workspace_path= data["workspace_path"],
+      messages= [Message.from_dict(message) for message in data["messages"]]
+    )
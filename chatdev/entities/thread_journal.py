@@ -0,0 +1,131 @@
+"""
+This module defines the `ThreadJournal` class which persists a thread as an append-only journal.
+
+Modules Imported:
+- `Optional` from `typing`: Specifies optional types.
+- `Thread` from `.thread`: Represents the thread that is persisted.
+- `Message` from `.message`: Represents a single journal entry.
+- `makedirs`, `path`, `remove`, `replace` from `os`: Manages file and directory operations.
+- `dumps`, `loads` from `json`: Serializes and deserializes JSON objects.
+
+Classes:
+- `ThreadJournal`: Persists the messages of a thread into a JSONL journal and a compacted snapshot.
+
+`ThreadJournal` Class:
+Every message is written exactly once as a line `{"index": <position>, "message": <message>}` to
+`.chatdev-<name>.jsonl`. Once the journal holds at least as many messages as the snapshot (and at least
+`snapshot_interval`), all messages are compacted into `.chatdev-<name>.json` and the journal is truncated.
+Snapshots grow geometrically, so persisting a message costs amortized O(1) instead of O(history).
+
+Attributes:
+- `workspace_path` (str): Path to the workspace directory the journal files are stored in.
+- `name` (str): The name of the journal, used for its file names.
+- `snapshot_interval` (int): Minimum number of journal entries before a snapshot is written.
+- `snapshot_count` (Optional[int]): Number of messages in the snapshot, `None` until the journal was first synced.
+- `journal_count` (int): Number of messages in the journal after the snapshot.
+
+Methods:
+- `__init__(self, workspace_path: str, name: str = "thread", snapshot_interval: int = 50)`: Initializes a ThreadJournal.
+- `journal_path(self) -> str`: Returns the path of the JSONL journal.
+- `snapshot_path(self) -> str`: Returns the path of the snapshot.
+- `persisted_count(self) -> int`: Returns the number of messages that are persisted.
+- `sync(self, thread: Thread)`: Appends all messages that are not persisted yet to the journal.
+- `compact(self, thread: Thread)`: Writes a snapshot of the whole thread and truncates the journal.
+- `remove(self)`: Deletes the journal and snapshot files, e.g. of a merged branch.
+- `load(workspace_path: str, name: str = "thread") -> Thread`: Reconstructs a thread from snapshot and journal.
+"""
+
+from typing import Optional
+from .thread import Thread
+from .message import Message
+from os import makedirs, path, remove, replace
+from json import dumps, loads
+
+class ThreadJournal:
+  workspace_path: str
+  name: str
+  snapshot_interval: int
+  snapshot_count: Optional[int]
+  journal_count: int
+
+  def __init__(self, workspace_path: str, name: str = "thread", snapshot_interval: int = 50):
+    self.workspace_path = workspace_path
+    self.name = name
+    self.snapshot_interval = snapshot_interval
+    self.snapshot_count = None
+    self.journal_count = 0
+
+  def journal_path(self) -> str:
+    return f"{self.workspace_path}/.chatdev-{self.name}.jsonl"
+
+  def snapshot_path(self) -> str:
+    return f"{self.workspace_path}/.chatdev-{self.name}.json"
+
+  def persisted_count(self) -> int:
+    return (self.snapshot_count or 0) + self.journal_count
+
+  def sync(self, thread: Thread) -> None:
+    if self.snapshot_count is None or len(thread.messages) < self.persisted_count():
+      self.compact(thread)
+      return
+
+    start = self.persisted_count()
+    if start == len(thread.messages):
+      return
+
+    with open(self.journal_path(), 'a') as file:
+      for index in range(start, len(thread.messages)):
+        file.write(dumps({ "index": index, "message": thread.messages[index].dict() }) + "\n")
+    self.journal_count += len(thread.messages) - start
+
+    if self.journal_count >= max(self.snapshot_interval, self.snapshot_count):
+      self.compact(thread)
+
+  def compact(self, thread: Thread) -> None:
+    makedirs(self.workspace_path, exist_ok= True)
+    snapshot_path = self.snapshot_path()
+    with open(f"{snapshot_path}.tmp", 'w') as file:
+      file.write(dumps({
+        "workspace_path": thread.workspace_path,
+        "message_count": len(thread.messages),
+        "messages": [message.dict() for message in thread.messages]
+      }))
+    replace(f"{snapshot_path}.tmp", snapshot_path)
+
+    # The snapshot is durable at this point, stale journal lines are skipped by `load` if truncation fails
+    open(self.journal_path(), 'w').close()
+    self.snapshot_count = len(thread.messages)
+    self.journal_count = 0
+
+  def remove(self) -> None:
+    for file_path in [self.journal_path(), self.snapshot_path()]:
+      if path.exists(file_path):
+        remove(file_path)
+    self.snapshot_count = None
+    self.journal_count = 0
+
+  @staticmethod
+  def load(workspace_path: str, name: str = "thread") -> Thread:
+    journal = ThreadJournal(workspace_path= workspace_path, name= name)
+    thread = Thread(workspace_path= workspace_path, messages= [], journal= journal)
+
+    if path.exists(journal.snapshot_path()):
+      with open(journal.snapshot_path(), 'r') as file:
+        thread.messages = Thread.from_dict(loads(file.read())).messages
+
+    if path.exists(journal.journal_path()):
+      with open(journal.journal_path(), 'r') as file:
+        for line in file:
+          try:
+            entry = loads(line)
+          except ValueError:
+            # A torn last line from an interrupted write ends the journal
+            break
+          if entry["index"] < len(thread.messages):
+            continue
+          if entry["index"] > len(thread.messages):
+            break
+          thread.messages.append(Message.from_dict(entry["message"]))
+
+    # The journal stays unsynced, so the first `sync` rewrites the snapshot and drops stale or torn lines
+    return thread
@@ -0,0 +1,55 @@
+"""
+This module defines the `ThreadSection` class representing a range of messages of a thread, e.g. a conversation.
+
+Modules Imported:
+- `Optional` from `typing`: Specifies optional types.
+
+Classes:
+- `ThreadSection`: Represents a named range of messages in a thread.
+
+`ThreadSection` Class:
+Attributes:
+- `name` (str): The name of the section, e.g. the name of the conversation.
+- `start` (int): The index of the first message of the section.
+- `end` (Optional[int]): The index of the last message of the section, `None` while the section is in progress.
+
+Methods:
+- `__init__(self, name: str, start: int, end: Optional[int] = None)`: Initializes a ThreadSection.
+- `completed(self) -> bool`: Returns whether the section has ended.
+- `__str__(self)`: Returns a string representation of the section.
+- `dict(self) -> dict`: Returns a dictionary representation of the section.
+- `from_dict(data: dict) -> ThreadSection`: Creates a section from its dictionary representation.
+"""
+
+from typing import Optional
+
+class ThreadSection:
+  name: str
+  start: int
+  end: Optional[int]
+
+  def __init__(self, name: str, start: int, end: Optional[int] = None):
+    self.name = name
+    self.start = start
+    self.end = end
+
+  def completed(self) -> bool:
+    return not self.end is None
+
+  def __str__(self):
+    return f"ThreadSection(name= {self.name}, start= {self.start}, end= {self.end})"
+
+  def dict(self) -> dict:
+    return {
+      "name": self.name,
+      "start": self.start,
+      "end": self.end
+    }
+
+  @staticmethod
+  def from_dict(data: dict) -> 'ThreadSection':
+    return ThreadSection(
+      name= data["name"],
+      start= data["start"],
+      end= data.get("end")
+    )
@@ -0,0 +1,68 @@
+"""
+This module defines the `Usage` class representing the tokens used by LLM calls.
+
+Classes:
+- `Usage`: Represents the token usage of one or more LLM calls.
+
+`Usage` Class:
+Attributes:
+- `input_tokens` (int): The number of tokens sent to the model, including cached ones.
+- `output_tokens` (int): The number of tokens generated by the model.
+- `cache_read_tokens` (int): The number of input tokens read from the provider's prompt cache.
+- `cache_write_tokens` (int): The number of input tokens written to the provider's prompt cache.
+
+Methods:
+- `__init__(self, input_tokens: int = 0, output_tokens: int = 0, cache_read_tokens: int = 0, cache_write_tokens: int = 0)`: Initializes a Usage with the given token counts.
+- `total_tokens(self) -> int`: Returns the sum of input and output tokens.
+- `cache_miss_tokens(self) -> int`: Returns the number of input tokens that were not read from the cache.
+- `__add__(self, other: Usage) -> Usage`: Returns the combined usage of two usages.
+- `__str__(self)`: Returns a string representation of the usage.
+- `dict(self) -> dict`: Returns a dictionary representation of the usage.
+- `from_dict(data: dict) -> Usage`: Creates a usage from its dictionary representation.
+"""
+
+class Usage:
+  input_tokens: int
+  output_tokens: int
+  cache_read_tokens: int
+  cache_write_tokens: int
+
+  def __init__(self, input_tokens: int = 0, output_tokens: int = 0, cache_read_tokens: int = 0, cache_write_tokens: int = 0):
+    self.input_tokens = input_tokens
+    self.output_tokens = output_tokens
+    self.cache_read_tokens = cache_read_tokens
+    self.cache_write_tokens = cache_write_tokens
+
+  def total_tokens(self) -> int:
+    return self.input_tokens + self.output_tokens
+
+  def cache_miss_tokens(self) -> int:
+    return self.input_tokens - self.cache_read_tokens
+
+  def __add__(self, other: 'Usage') -> 'Usage':
+    return Usage(
+      input_tokens= self.input_tokens + other.input_tokens,
+      output_tokens= self.output_tokens + other.output_tokens,
+      cache_read_tokens= self.cache_read_tokens + other.cache_read_tokens,
+      cache_write_tokens= self.cache_write_tokens + other.cache_write_tokens
+    )
+
+  def __str__(self):
+    return f"Usage(input_tokens= {self.input_tokens}, output_tokens= {self.output_tokens}, cache_read_tokens= {self.cache_read_tokens}, cache_write_tokens= {self.cache_write_tokens})"
+
+  def dict(self) -> dict:
+    return {
+      "input_tokens": self.input_tokens,
+      "output_tokens": self.output_tokens,
+      "cache_read_tokens": self.cache_read_tokens,
+      "cache_write_tokens": self.cache_write_tokens
+    }
+
+  @staticmethod
+  def from_dict(data: dict) -> 'Usage':
+    return Usage(
+      input_tokens= data.get("input_tokens", 0),
+      output_tokens= data.get("output_tokens", 0),
+      cache_read_tokens= data.get("cache_read_tokens", 0),
+      cache_write_tokens= data.get("cache_write_tokens", 0)
+    )
@@ -4,7 +4,7 @@ This module defines the `Workflow` class which contains the phases to be run in
 Modules Imported:
 - `WorkflowPhase`, `WorkflowConversation`, `WorkflowRole`, `WorkflowArtifact` from `.workflow_phase`, `.workflow_conversation`, `.workflow_role`, `.workflow_artifact`:
   Represent the respective components of a workflow.
-- `List`, `Set` from `typing`: Specifies list and set types.
+- `List`, `Optional` from `typing`: Specifies list and optional types.
 
 Classes:
 - `Workflow`: Represents a collection of phases in an AI workflow.
@@ -15,12 +15,14 @@ Attributes:
 - `description` (str): The description of the workflow.
 - `phases` (List[WorkflowPhase]): The list of phases in the workflow.
 - `current_phase_index` (int): The index pointing to the current phase in the workflow.
+- `rendered_gpt_str` (Optional[str]): The memoized result of `gpt_str`.
 
 Methods:
 - `__init__(self, name: str, description: str, phases: List[WorkflowPhase])`: Initializes a Workflow with name, description, and phases.
-- `roles(self) -> Set[WorkflowRole]`: Returns a set of all roles involved in this workflow.
-- `artifacts(self) -> Set[WorkflowArtifact]`: Returns a set of all artifacts involved in this workflow.
-- `conversations(self) -> Set[WorkflowConversation]`: Returns a set of all conversations involved in this workflow.
+- `roles(self) -> List[WorkflowRole]`: Returns a list of all unique roles involved in this workflow in definition order.
+- `artifacts(self) -> List[WorkflowArtifact]`: Returns a list of all unique artifacts involved in this workflow in definition order.
+- `conversations(self) -> List[WorkflowConversation]`: Returns a list of all unique conversations involved in this workflow in definition order.
+- `gpt_str(self) -> str`: Returns the description of roles, artifacts, conversations and phases that ChatGPT will receive.
 - `current_phase(self) -> WorkflowPhase`: Returns the current phase in this workflow.
 - `next_phase(self)`: Moves to the next phase in this workflow.
 - `ended(self) -> bool`: Returns whether this workflow has ended.
@@ -34,7 +36,7 @@ from .workflow_phase import WorkflowPhase
 from .workflow_conversation import WorkflowConversation
 from .workflow_role import WorkflowRole
 from .workflow_artifact import WorkflowArtifact
-from typing import List, Set
+from typing import List, Optional
 
 class Workflow:
   """
@@ -50,24 +52,42 @@ class Workflow:
     self.description = description
     self.phases = phases
     self.current_phase_index = 0
+    self.rendered_gpt_str: Optional[str] = None
 
-  def roles(self) -> Set[WorkflowRole]:
+  def roles(self) -> List[WorkflowRole]:
     """
-    Returns a set of all roles involved in this workflow.
+    Returns a list of all unique roles involved in this workflow in definition order.
     """
-    return {role for phase in self.phases for role in phase.roles()}
+    return list(dict.fromkeys(role for phase in self.phases for role in phase.roles()))
 
-  def artifacts(self) -> Set[WorkflowArtifact]:
+  def artifacts(self) -> List[WorkflowArtifact]:
     """
-    Returns a set of all artifacts involved in this workflow.
+    Returns a list of all unique artifacts involved in this workflow in definition order.
     """
-    return {artifact for phase in self.phases for artifact in phase.artifacts()}
+    return list(dict.fromkeys(artifact for phase in self.phases for artifact in phase.artifacts()))
 
-  def conversations(self) -> Set[WorkflowConversation]:
+  def conversations(self) -> List[WorkflowConversation]:
     """
-    Returns a set of all conversations involved in this workflow.
+    Returns a list of all unique conversations involved in this workflow in definition order.
     """
-    return {conversation for phase in self.phases for conversation in phase.conversations}
+    return list(dict.fromkeys(conversation for phase in self.phases for conversation in phase.conversations))
+
+  def gpt_str(self) -> str:
+    """
+    This is the string representation that ChatGPT will receive.
+
+    It only depends on the definition of the workflow, so it is rendered once and byte-identical across runs.
+    """
+    if self.rendered_gpt_str is None:
+      eol = '\n'
+      self.rendered_gpt_str = (
+        f"These are the roles you are to impersonate:\n{eol.join([role.gpt_str() for role in self.roles()])}\n\n"
+        f"These are the artifacts that are referenced as inputs and outputs in conversations:\n{eol.join([artifact.gpt_str() for artifact in self.artifacts()])}\n\n"
+        f"These are the conversations you are to hold. They are referenced in phases:\n{eol.join([conversation.gpt_str() for conversation in self.conversations()])}\n\n"
+        f"These are the phases you are going through:\n{eol.join([phase.gpt_str() for phase in self.phases])}\n\n"
+        f"Here is a general description of the workflow for context:\n{self.description}"
+      )
+    return self.rendered_gpt_str
   
   def current_phase(self) -> WorkflowPhase:
     """
@@ -1,4 +1,4 @@
-from typing import Set
+from typing import List
 from . import WorkflowArtifact, WorkflowRole
 
 class WorkflowConversation:
@@ -35,17 +35,17 @@ class WorkflowConversation:
     self.input = input
     self.output = output
 
-  def roles(self) -> Set[WorkflowRole]:
+  def roles(self) -> List[WorkflowRole]:
     """
-    Returns a set of all roles involved in this conversation.
+    Returns a list of all unique roles involved in this conversation, lead first.
     """
-    return {self.lead, self.assistant}
+    return list(dict.fromkeys([self.lead, self.assistant]))
 
-  def artifacts(self) -> Set[WorkflowArtifact]:
+  def artifacts(self) -> List[WorkflowArtifact]:
     """
-    Returns a set of all artifacts involved in this conversation.
+    Returns a list of all unique artifacts involved in this conversation, input first.
     """
-    return {self.input, self.output}
+    return list(dict.fromkeys([self.input, self.output]))
   
   def gpt_str(self) -> str:
     """
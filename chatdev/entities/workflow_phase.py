@@ -1,4 +1,4 @@
-from typing import List, Set
+from typing import List
 from . import WorkflowRole, WorkflowArtifact, WorkflowConversation
 
 class WorkflowPhase:
@@ -44,17 +44,17 @@ class WorkflowPhase:
     self.conversations = conversations
     self.current_conversation_index = 0
   
-  def roles(self) -> Set[WorkflowRole]:
+  def roles(self) -> List[WorkflowRole]:
     """
-    Returns a set of all roles involved in this phase.
+    Returns a list of all unique roles involved in this phase in definition order.
     """
-    return {role for conversation in self.conversations for role in conversation.roles()}
+    return list(dict.fromkeys(role for conversation in self.conversations for role in conversation.roles()))
   
-  def artifacts(self) -> Set[WorkflowArtifact]:
+  def artifacts(self) -> List[WorkflowArtifact]:
     """
-    Returns a set of all artifacts involved in this phase.
+    Returns a list of all unique artifacts involved in this phase in definition order.
     """
-    return {artifacts for conversation in self.conversations for artifacts in conversation.artifacts()}
+    return list(dict.fromkeys(artifact for conversation in self.conversations for artifact in conversation.artifacts()))
   
   def current_conversation(self) -> WorkflowConversation:
     """
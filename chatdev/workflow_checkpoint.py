@@ -0,0 +1,161 @@
+"""
+This module contains the WorkflowCheckpoint class which records how far a workflow run got.
+
+Modules Imported:
+- `List`, `Optional` from `typing`: Specifies list and optional types.
+- `Thread`, `ThreadJournal`, `ThreadSection`, `Workflow` from `chatdev.entities`: Represents the workflow and the thread that is restored.
+- `makedirs`, `path`, `replace` from `os`: Writes the checkpoint atomically.
+- `dumps`, `loads` from `json`: Serializes and deserializes the checkpoint.
+
+Classes:
+- `WorkflowCheckpoint`: Represents the progress of a workflow run, persisted in its workspace.
+
+`WorkflowCheckpoint` Class:
+A checkpoint is written after the sanity check, after every phase start and after every turn of a conversation.
+It refers to the thread journal by the number of messages that belong to the checkpoint, messages journaled after
+it (e.g. of a response that was cut off by a crash) are dropped when the thread is restored.
+
+Attributes:
+- `workflow_name` (str): The name of the workflow.
+- `phase_names` (List[str]): The names of the phases of the workflow, to tell workflows with the same name apart.
+- `input` (str): The input the workflow was started with.
+- `workspace_path` (str): The workspace of the run.
+- `phase_index` (int): The index of the current phase.
+- `phase_started` (bool): Whether the current phase was started.
+- `conversation_index` (int): The index of the current conversation in the current phase.
+- `conversation_turn` (Optional[int]): The number of SWITCH turns done in the current conversation, `None` if it wasn't started.
+- `current_role` (str): The role answering the next SWITCH of the current conversation.
+- `message_count` (int): The number of messages of the thread at the checkpoint.
+- `sections` (List[ThreadSection]): The sections of the thread at the checkpoint.
+- `cache_breakpoints` (List[int]): The cache breakpoints of the thread at the checkpoint.
+
+Methods:
+- `__init__(self, workflow_name: str, phase_names: List[str], input: str, workspace_path: str)`: Initializes a checkpoint at the start of the workflow.
+- `update(self, workflow: Workflow, thread: Thread, phase_started: bool, conversation_turn: Optional[int] = None, current_role: str = "assistant")`: Moves the checkpoint to the current state of the run.
+- `matches(self, workflow: Workflow) -> bool`: Returns whether the checkpoint belongs to the workflow.
+- `restore_workflow(self, workflow: Workflow)`: Moves the workflow to the phase and conversation of the checkpoint.
+- `restore_thread(self) -> Thread`: Loads the thread from its journal as it was at the checkpoint.
+- `save(self)`: Writes the checkpoint into the workspace.
+- `dict(self) -> dict`: Returns a dictionary representation of the checkpoint.
+- `checkpoint_path(workspace_path: str) -> str`: Returns the path of the checkpoint of a workspace.
+- `load(workspace_path: str) -> WorkflowCheckpoint`: Reads the checkpoint of a workspace.
+"""
+
+from typing import List, Optional
+from chatdev.entities import Thread, ThreadJournal, ThreadSection, Workflow
+from os import makedirs, path, replace
+from json import dumps, loads
+
+class WorkflowCheckpoint:
+  workflow_name: str
+  phase_names: List[str]
+  input: str
+  workspace_path: str
+  phase_index: int
+  phase_started: bool
+  conversation_index: int
+  conversation_turn: Optional[int]
+  current_role: str
+  message_count: int
+  sections: List[ThreadSection]
+  cache_breakpoints: List[int]
+
+  def __init__(self, workflow_name: str, phase_names: List[str], input: str, workspace_path: str):
+    self.workflow_name = workflow_name
+    self.phase_names = phase_names
+    self.input = input
+    self.workspace_path = workspace_path
+    self.phase_index = 0
+    self.phase_started = False
+    self.conversation_index = 0
+    self.conversation_turn = None
+    self.current_role = "assistant"
+    self.message_count = 0
+    self.sections = []
+    self.cache_breakpoints = []
+
+  def update(self, workflow: Workflow, thread: Thread, phase_started: bool, conversation_turn: Optional[int] = None, current_role: str = "assistant") -> None:
+    self.phase_index = workflow.current_phase_index
+    self.phase_started = phase_started
+    self.conversation_index = workflow.current_phase().current_conversation_index if not workflow.ended() else 0
+    self.conversation_turn = conversation_turn
+    self.current_role = current_role
+    self.message_count = len(thread.messages)
+    self.sections = [ThreadSection.from_dict(section.dict()) for section in thread.sections]
+    self.cache_breakpoints = list(thread.cache_breakpoints)
+
+  def matches(self, workflow: Workflow) -> bool:
+    return workflow.name == self.workflow_name and [phase.name for phase in workflow.phases] == self.phase_names
+
+  def restore_workflow(self, workflow: Workflow) -> None:
+    workflow.current_phase_index = self.phase_index
+    for index, phase in enumerate(workflow.phases):
+      if index < self.phase_index:
+        phase.current_conversation_index = len(phase.conversations)
+      elif index == self.phase_index:
+        phase.current_conversation_index = self.conversation_index
+      else:
+        phase.current_conversation_index = 0
+
+  def restore_thread(self) -> Thread:
+    thread = ThreadJournal.load(self.workspace_path)
+    if len(thread.messages) < self.message_count:
+      raise RuntimeError(f"The journal of {self.workspace_path} holds {len(thread.messages)} messages, the checkpoint expects {self.message_count}")
+
+    # Messages after the checkpoint belong to a turn that didn't finish, it is repeated
+    del thread.messages[self.message_count:]
+    thread.sections = [ThreadSection.from_dict(section.dict()) for section in self.sections]
+    thread.cache_breakpoints = list(self.cache_breakpoints)
+    return thread
+
+  def save(self) -> None:
+    makedirs(self.workspace_path, exist_ok= True)
+    checkpoint_path = self.checkpoint_path(self.workspace_path)
+    with open(f"{checkpoint_path}.tmp", 'w') as file:
+      file.write(dumps(self.dict()))
+    replace(f"{checkpoint_path}.tmp", checkpoint_path)
+
+  def dict(self) -> dict:
+    return {
+      "workflow_name": self.workflow_name,
+      "phase_names": self.phase_names,
+      "input": self.input,
+      "workspace_path": self.workspace_path,
+      "phase_index": self.phase_index,
+      "phase_started": self.phase_started,
+      "conversation_index": self.conversation_index,
+      "conversation_turn": self.conversation_turn,
+      "current_role": self.current_role,
+      "message_count": self.message_count,
+      "sections": [section.dict() for section in self.sections],
+      "cache_breakpoints": self.cache_breakpoints
+    }
+
+  @staticmethod
+  def checkpoint_path(workspace_path: str) -> str:
+    return f"{workspace_path}/.chatdev-checkpoint.json"
+
+  @staticmethod
+  def load(workspace_path: str) -> 'WorkflowCheckpoint':
+    checkpoint_path = WorkflowCheckpoint.checkpoint_path(workspace_path)
+    if not path.exists(checkpoint_path):
+      raise FileNotFoundError(f"No checkpoint found in {workspace_path}")
+
+    with open(checkpoint_path, 'r') as file:
+      data = loads(file.read())
+
+    checkpoint = WorkflowCheckpoint(
+      workflow_name= data["workflow_name"],
+      phase_names= data["phase_names"],
+      input= data["input"],
+      workspace_path= workspace_path
+    )
+    checkpoint.phase_index = data["phase_index"]
+    checkpoint.phase_started = data["phase_started"]
+    checkpoint.conversation_index = data["conversation_index"]
+    checkpoint.conversation_turn = data["conversation_turn"]
+    checkpoint.current_role = data["current_role"]
+    checkpoint.message_count = data["message_count"]
+    checkpoint.sections = [ThreadSection.from_dict(section) for section in data["sections"]]
+    checkpoint.cache_breakpoints = data["cache_breakpoints"]
+    return checkpoint
@@ -2,10 +2,18 @@
 This module contains the WorkflowManager class responsible for executing AI workflows.
 
 Modules Imported:
-- `Thread`, `Workflow` from `chatdev.entities`: Represents workflows and their thread execution.
-- `AdapterFactory` from `chatdev.adapters`: Manages adapter initialization.
+- `Message`, `TextBlock`, `Thread`, `ThreadJournal`, `Workflow`, `WorkflowPhase`, `WorkflowConversation` from `chatdev.entities`: Represents workflows, their thread execution and the journals of thread branches.
+- `Adapter`, `AdapterFactory`, `ResponseBudget`, `ResponseRequest`, `ResponseResult`, `UsageReport`, `ToolExecutor` from `chatdev.adapters`: Generates responses, manages adapter initialization, limits the LLM calls per conversation, describes the responses of the steps, aggregates their usage and names the tools writing files.
+- `WorkflowCheckpoint` from `.workflow_checkpoint`: Records the progress of a run so it can be resumed.
+- `WorkflowScheduler` from `.workflow_scheduler`: Finds the conversations that can run concurrently.
+- `BranchRequest` from `.branch_request`: Asks for conversations to be run concurrently.
+- `ThreadPoolExecutor`, `CancelledError`, `FIRST_EXCEPTION`, `wait` from `concurrent.futures`: Runs concurrent conversations on threads and stops them once one fails.
+- `Event` from `threading`: Tells the branches of a failed branch to stop.
+- `workflows` from `chatdev.workflows`: Maps workflow names to workflows, to find the workflow of a checkpoint.
 - `generate` from `nanoid`: Generates unique IDs for workflows.
-- `Optional` from `typing`: Specifies optional types.
+- `deepcopy` from `copy`: Copies registered workflows before moving them to a checkpoint.
+- `path` from `os`: Checks for an existing usage report when resuming.
+- `Generator`, `List`, `Optional`, `Tuple`, `Union` from `typing`: Specifies generator, list, optional, tuple and union types.
 
 Classes:
 - `WorkflowManager`: Manages and executes AI workflows.
@@ -13,18 +21,47 @@ Classes:
 `WorkflowManager` Class:
 Attributes:
 - `adapter_factory` (AdapterFactory): The factory to create specific adapters for tools.
+- `budget` (ResponseBudget): The limits every conversation gets a fresh copy of.
+- `max_concurrent_conversations` (int): The maximum number of independent conversations run at the same time, 1 (the default) runs them one by one. Concurrent conversations share the stream handler of the adapters, so their streams interleave.
+- `scoped_threads` (bool): Whether every conversation runs on its own thread seeded with the instructions and a brief of its input.
+- `artifact_summary_length` (int): The maximum number of characters of the input artifact summary in a scoped thread.
+- `answer_stop_phrases` (List[str]): Phrases that end streamed answers to the sanity check and phase starts.
+- `conversation_stop_phrases` (List[str]): Phrases that end streamed conversation messages.
+- `report_file_name` (str): The file in the workspace the usage report is written to.
 
 Methods:
-- `__init__(self, adapter_factory: AdapterFactory)`: Initializes the WorkflowManager with the adapter factory.
-- `execute(self, workflow: Workflow, input: str, workspace_path: Optional[str])`: Executes the provided workflow with specified input and workspace path.
+- `__init__(self, adapter_factory: AdapterFactory, budget: Optional[ResponseBudget] = None, max_concurrent_conversations: int = 1, scoped_threads: bool = False)`: Initializes the WorkflowManager with the adapter factory, conversation budget, concurrency and thread mode.
+- `execute(self, workflow: Workflow, input: str, workspace_path: Optional[str]) -> Thread`: Executes the provided workflow with specified input and workspace path and returns its thread.
+- `resume(self, workspace_path: str, workflow: Optional[Workflow] = None) -> Thread`: Continues the run in the workspace from its last checkpoint and returns its thread.
+- `run(self, steps: Generator[Union[ResponseRequest, BranchRequest], Union[ResponseResult, List[Thread]], Thread], stopped: Optional[Event] = None) -> Thread`: Generates the responses the steps ask for, runs their branches concurrently and returns the thread.
+- `run_branches(self, request: BranchRequest) -> List[Thread]`: Runs the steps of the branches on threads and returns their threads, stopping all of them once one fails.
+- `steps(self, workflow: Workflow, input: str, workspace_path: Optional[str], checkpoint: Optional[WorkflowCheckpoint] = None) -> Generator[Union[ResponseRequest, BranchRequest], Union[ResponseResult, List[Thread]], Thread]`: Runs the workflow from the start or the checkpoint, yielding every response it needs instead of generating it.
+- `resumed_steps(self, workspace_path: str, workflow: Optional[Workflow] = None) -> Generator[Union[ResponseRequest, BranchRequest], Union[ResponseResult, List[Thread]], Thread]`: Loads the checkpoint of the workspace and returns the steps continuing from it.
+- `checkpoint_workflow(self, checkpoint: WorkflowCheckpoint) -> Workflow`: Finds the workflow of a checkpoint.
+- `instructions(self, workflow: Workflow, input: str) -> str`: Returns the initial message explaining the workflow.
+- `phases(self, workflow: Workflow, thread: Thread, adapter: Adapter, report: UsageReport, checkpoint: WorkflowCheckpoint) -> Generator[Union[ResponseRequest, BranchRequest], Union[ResponseResult, List[Thread]], None]`: Runs the remaining phases and conversations, independent conversations concurrently on branches of the thread.
+- `scoped_thread(self, scheduler: WorkflowScheduler, thread: Thread, position: Tuple[int, int]) -> Thread`: Returns the scoped thread of a conversation.
+- `artifact_brief(self, scheduler: WorkflowScheduler, thread: Thread, position: Tuple[int, int]) -> str`: Describes the input artifact of a conversation.
+- `conversation(self, workflow: Workflow, phase: WorkflowPhase, conversation: WorkflowConversation, thread: Thread, report: UsageReport, checkpoint: Optional[WorkflowCheckpoint] = None) -> Generator[ResponseRequest, ResponseResult, Thread]`: Runs a single conversation on the thread.
+- `save_checkpoint(self, checkpoint: WorkflowCheckpoint, workflow: Workflow, thread: Thread, adapter: Adapter, report: UsageReport, phase_started: bool, conversation_turn: Optional[int] = None, current_role: str = "assistant")`: Persists the thread and the usage report and saves the checkpoint.
+- `record(self, report: UsageReport, result: ResponseResult, phase: Optional[str], conversation: Optional[str], role: Optional[str])`: Tags the call records of a response and adds them to the report.
+- `write_report(self, report: UsageReport, thread: Thread)`: Writes the usage report next to the thread.
 
 The class further provides methods to manage different phases and conversations within the workflow and handle tool commands.
 """
 
-from chatdev.entities import Thread, Workflow
-from chatdev.adapters import AdapterFactory
+from chatdev.entities import Message, TextBlock, Thread, ThreadJournal, Workflow, WorkflowPhase, WorkflowConversation
+from chatdev.adapters import Adapter, AdapterFactory, ResponseBudget, ResponseRequest, ResponseResult, UsageReport, ToolExecutor
+from chatdev.workflows import workflows
+from .workflow_checkpoint import WorkflowCheckpoint
+from .workflow_scheduler import WorkflowScheduler
+from .branch_request import BranchRequest
+from concurrent.futures import ThreadPoolExecutor, CancelledError, FIRST_EXCEPTION, wait
+from threading import Event
 from nanoid import generate
-from typing import Optional
+from copy import deepcopy
+from os import path
+from typing import Generator, List, Optional, Tuple, Union
 
 class WorkflowManager:
   """
@@ -34,26 +71,162 @@ class WorkflowManager:
   """
 
   adapter_factory: AdapterFactory
+  budget: ResponseBudget
+  max_concurrent_conversations: int
+  scoped_threads: bool
 
-  def __init__(self, adapter_factory: AdapterFactory):
+  answer_stop_phrases: List[str] = ["SUCCESS", "FAILURE"]
+  conversation_stop_phrases: List[str] = ["END CONVERSATION"]
+  report_file_name: str = ".chatdev-report.json"
+  artifact_summary_length: int = 4000
+
+  def __init__(self, adapter_factory: AdapterFactory, budget: Optional[ResponseBudget] = None, max_concurrent_conversations: int = 1, scoped_threads: bool = False):
     """
-    Creates a new WorkflowManager with the given OpenAI client, model, assistant ID, description, and phases.
+    Creates a new WorkflowManager with the given adapter factory, the budget each conversation may spend, the
+    number of independent conversations that may run at the same time and whether conversations run on scoped threads.
+
+    Scoped threads keep the prompts of a conversation independent of the conversations before it, the thread of
+    the workflow still records all messages and is what checkpoints restore.
     """
     self.adapter_factory = adapter_factory
+    self.budget = budget if not budget is None else ResponseBudget()
+    self.max_concurrent_conversations = max_concurrent_conversations
+    self.scoped_threads = scoped_threads
 
   def execute(self, workflow: Workflow, input: str, workspace_path: Optional[str]) -> Thread:
     """
-    Executes the workflow with the given input.
+    Executes the workflow with the given input and returns its thread.
+    """
+    return self.run(self.steps(workflow, input, workspace_path))
+
+  def resume(self, workspace_path: str, workflow: Optional[Workflow] = None) -> Thread:
+    """
+    Continues the run in the workspace from its last checkpoint and returns its thread.
+
+    The workflow is looked up by the name and phases stored in the checkpoint unless it is given.
+    """
+    return self.run(self.resumed_steps(workspace_path, workflow))
+
+  def run(self, steps: Generator[Union[ResponseRequest, BranchRequest], Union[ResponseResult, List[Thread]], Thread], stopped: Optional[Event] = None) -> Thread:
+    """
+    Generates the responses the steps ask for until they end and returns the thread.
+
+    If `stopped` is set, e.g. because a sibling branch failed, the steps are cancelled before their next response.
+    """
+    try:
+      request = next(steps)
+      while True:
+        if not stopped is None and stopped.is_set():
+          raise CancelledError("A concurrent branch failed")
+        if isinstance(request, BranchRequest):
+          result = self.run_branches(request)
+        else:
+          result = request.adapter.generate_response(request.thread, request.budget, request.stop_phrases)
+        request = steps.send(result)
+    except StopIteration as stop:
+      return stop.value
+    finally:
+      # Runs the cleanup of the steps right away if a response failed
+      steps.close()
+
+  def run_branches(self, request: BranchRequest) -> List[Thread]:
+    """
+    Runs the steps of every branch on its own thread and returns the threads of the branches in order.
+
+    Once a branch fails the others stop after their current response and the failure is raised, so the workflow
+    doesn't close the workspace under them and they don't keep spending LLM calls.
+    """
+    stopped = Event()
+    with ThreadPoolExecutor(max_workers= len(request.branches), thread_name_prefix= "chatdev-branch") as pool:
+      futures = [pool.submit(self.run, branch, stopped) for branch in request.branches]
+      wait(futures, return_when= FIRST_EXCEPTION)
+      stopped.set()
+
+    failures = [future.exception() for future in futures if not future.exception() is None and not isinstance(future.exception(), CancelledError)]
+    if len(failures) > 0:
+      raise failures[0]
+    return [future.result() for future in futures]
+
+  def resumed_steps(self, workspace_path: str, workflow: Optional[Workflow] = None) -> Generator[Union[ResponseRequest, BranchRequest], Union[ResponseResult, List[Thread]], Thread]:
+    """
+    Loads the checkpoint of the workspace and returns the steps continuing from it.
+    """
+    checkpoint = WorkflowCheckpoint.load(workspace_path)
+    workflow = workflow if not workflow is None else self.checkpoint_workflow(checkpoint)
+    if not checkpoint.matches(workflow):
+      raise ValueError(f"The checkpoint in {workspace_path} belongs to workflow {checkpoint.workflow_name}, not {workflow.name}")
+
+    return self.steps(workflow, checkpoint.input, workspace_path, checkpoint)
+
+  def checkpoint_workflow(self, checkpoint: WorkflowCheckpoint) -> Workflow:
+    """
+    Finds the workflow of the checkpoint in the workflow registry.
+    """
+    for workflow in workflows.values():
+      if checkpoint.matches(workflow):
+        return deepcopy(workflow)
+    raise LookupError(f"No known workflow matches the checkpoint of workflow {checkpoint.workflow_name}")
+
+  def steps(self, workflow: Workflow, input: str, workspace_path: Optional[str], checkpoint: Optional[WorkflowCheckpoint] = None) -> Generator[Union[ResponseRequest, BranchRequest], Union[ResponseResult, List[Thread]], Thread]:
+    """
+    Runs the workflow with the given input, from the start or from the given checkpoint.
+
+    Every response is yielded as a `ResponseRequest` and the caller sends back its `ResponseResult`,
+    so the workflow logic is shared by the synchronous and the asyncio manager. Concurrent conversations are
+    yielded as a `BranchRequest` and the caller sends back the threads of its branches. A checkpoint is saved
+    after the sanity check, every phase start and every conversation turn. The workspace is closed in the
+    adapter factory at the end, stopping its docker session. Returns the thread.
     """
-    id = generate(size=10)
-    thread_workspace_path = workspace_path if not workspace_path is None else f"workspaces/{id}"
-    thread = Thread(workspace_path=thread_workspace_path, messages=[])
+    if not checkpoint is None:
+      checkpoint.restore_workflow(workflow)
+      thread = checkpoint.restore_thread()
+      report_path = f"{thread.workspace_path}/{self.report_file_name}"
+      report = UsageReport.load(report_path) if path.exists(report_path) else UsageReport()
+      print(f"\n=== Resuming {workflow.name} with {len(thread.messages)} messages ===\n")
+    else:
+      id = generate(size=10)
+      thread_workspace_path = workspace_path if not workspace_path is None else f"workspaces/{id}"
+      thread = Thread(workspace_path=thread_workspace_path, messages=[])
+      checkpoint = WorkflowCheckpoint(workflow_name= workflow.name, phase_names= [phase.name for phase in workflow.phases], input= input, workspace_path= thread_workspace_path)
+      report = UsageReport()
+
+    if workflow.ended():
+      return thread
 
     model = workflow.current_phase().current_conversation().lead.model
     adapter = self.adapter_factory.adapter(model)
 
-    eol = '\n'
-    instructions = f'''
+    try:
+      if len(thread.messages) == 0:
+        thread.append_text_message(self.instructions(workflow, input))
+
+        result = yield ResponseRequest(adapter, thread, self.budget.renewed(), self.answer_stop_phrases)
+        self.record(report, result, None, None, None)
+
+        # An exhausted budget may end the response on tool results, which have no text to check
+        if result.exhausted():
+          raise RuntimeError(f"Sanity check failed, the response stopped early: {result.stop_reason}")
+        if not (thread.last_message_text() or "").endswith("SUCCESS"):
+          raise RuntimeError(f"Sanity check failed, response was '{thread.last_message_text() or ''}'")
+
+        # The instructions never change, so they are the first prefix providers can cache
+        thread.mark_cache_breakpoint()
+        self.save_checkpoint(checkpoint, workflow, thread, adapter, report, phase_started= False)
+
+      yield from self.phases(workflow, thread, adapter, report, checkpoint)
+
+      self.write_report(report, thread)
+    finally:
+      # Docker sessions and file indexes live as long as the workflow, also if it fails
+      self.adapter_factory.close_workspace(thread.workspace_path)
+
+    return thread
+
+  def instructions(self, workflow: Workflow, input: str) -> str:
+    """
+    Returns the initial message explaining the roleplay, the workflow and the input.
+    """
+    return f'''
       You are roleplaying a multiple people in a workflow, e.g. a company working on things in a process.
       In each response you always only represent a single person.
       The roleplay is structured in phases and each phase has a conversation.
@@ -101,20 +274,7 @@ class WorkflowManager:
       <the message>
       ```
       
-      These are the roles you are to impersonate:
-      {eol.join([role.gpt_str() for role in workflow.roles()])}
-
-      These are the artifacts that are referenced as inputs and outputs in conversations:
-      {eol.join([artifact.gpt_str() for artifact in workflow.artifacts()])}
-
-      These are the conversations you are to hold. They are referenced in phases:
-      {eol.join([conversation.gpt_str() for conversation in workflow.conversations()])}
-
-      These are the phases you are going through:
-      {eol.join([phase.gpt_str() for phase in workflow.phases])}
-
-      Here is a general description of the workflow for context:
-      {workflow.description}
+      {workflow.gpt_str()}
 
       This is the instruction you will handle with the workflow:
       ({input})
@@ -125,58 +285,213 @@ class WorkflowManager:
       Answer, this once, with only "SUCCESS" if you understood everything and with only "FAILURE" if you didn't.
     '''
 
-    thread.append_text_message(instructions)
-
-    adapter.generate_response(thread)
+  def phases(self, workflow: Workflow, thread: Thread, adapter: Adapter, report: UsageReport, checkpoint: WorkflowCheckpoint) -> Generator[Union[ResponseRequest, BranchRequest], Union[ResponseResult, List[Thread]], None]:
+    """
+    Runs the remaining phases of the workflow, continuing a started phase or conversation of the checkpoint.
 
-    if not thread.last_message_text().endswith("SUCCESS"):
-      raise RuntimeError(f"Sanity check failed, response was '{thread.last_message_text()}'")
+    Consecutive conversations of a phase that don't depend on each other's artifacts run concurrently on branches
+    of the thread, which are merged in the order of the workflow. The checkpoint is saved once all of them ended.
+    With scoped threads every conversation runs on a scoped thread instead and phases are started in them.
+    """
+    scheduler = WorkflowScheduler(workflow)
 
     while not workflow.ended():
       phase = workflow.current_phase()
 
-      print(f"\n=== Phase {phase.name} ===\n")
-      thread.append_text_message(f'''
-        START PHASE {phase.name}
-      ''')
+      if not checkpoint.phase_started:
+        print(f"\n=== Phase {phase.name} ===\n")
 
-      adapter.generate_response(thread)
+        if not self.scoped_threads:
+          thread.append_text_message(f'''
+            START PHASE {phase.name}
+          ''')
 
-      if not thread.last_message_text().endswith("SUCCESS"):
-        raise RuntimeError(f"Failed start of phase {phase.name}, last message: {thread.last_message_text()}")
+          result = yield ResponseRequest(adapter, thread, self.budget.renewed(), self.answer_stop_phrases)
+          self.record(report, result, phase.name, None, None)
+
+          if result.exhausted():
+            raise RuntimeError(f"Failed start of phase {phase.name}, the response stopped early: {result.stop_reason}")
+          if not (thread.last_message_text() or "").endswith("SUCCESS"):
+            raise RuntimeError(f"Failed start of phase {phase.name}, last message: {thread.last_message_text() or ''}")
+        self.save_checkpoint(checkpoint, workflow, thread, adapter, report, phase_started= True)
       
       while not workflow.phase_ended():
-        conversation = workflow.current_conversation()
-        print(f"\n=== Conversation {conversation.name} ===\n")
+        # A conversation resumed in the middle continues on its own
+        conversations = scheduler.next_conversations(self.max_concurrent_conversations) if checkpoint.conversation_turn is None else [workflow.current_conversation()]
+
+        if not checkpoint.conversation_turn is None or (len(conversations) == 1 and not self.scoped_threads):
+          yield from self.conversation(workflow, phase, conversations[0], thread, report, checkpoint)
+        else:
+          if len(conversations) > 1:
+            print(f"\n=== Conversations {', '.join(conversation.name for conversation in conversations)} run concurrently ===\n")
+
+          if self.scoped_threads:
+            # Scoped threads only share the instructions and their answer with the thread
+            start = thread.cache_breakpoints[0] + 1
+            branches = [self.scoped_thread(scheduler, thread, (workflow.current_phase_index, phase.current_conversation_index + index)) for index in range(len(conversations))]
+          else:
+            start = len(thread.messages)
+            branches = [thread.branch() for _ in conversations]
+          for index, branch in enumerate(branches):
+            branch.journal = ThreadJournal(workspace_path= thread.workspace_path, name= f"branch-{workflow.current_phase_index}-{phase.current_conversation_index + index}")
+
+          if len(branches) == 1:
+            yield from self.conversation(workflow, phase, conversations[0], branches[0], report)
+          else:
+            yield BranchRequest([self.conversation(workflow, phase, conversation, branch, report) for conversation, branch in zip(conversations, branches)])
+
+          for branch in branches:
+            thread.merge(branch, start)
+            thread.mark_cache_breakpoint()
+            branch.journal.remove()
+
+        for _ in conversations:
+          workflow.next_conversation()
+        self.save_checkpoint(checkpoint, workflow, thread, adapter, report, phase_started= True)
+      workflow.next_phase()
+      self.save_checkpoint(checkpoint, workflow, thread, adapter, report, phase_started= False)
+
+  def scoped_thread(self, scheduler: WorkflowScheduler, thread: Thread, position: Tuple[int, int]) -> Thread:
+    """
+    Returns a thread for the conversation at the position holding only the instructions, their answer and a brief
+    of the phase and the input artifact, so its prompts don't grow with the conversations before it.
+
+    The brief is answered with a synthetic "SUCCESS" like a phase start, it is merged into the thread as well.
+    """
+    phase = scheduler.workflow.phases[position[0]]
+    conversation = scheduler.conversation(position)
+    scoped_thread = Thread(workspace_path= thread.workspace_path, messages= thread.messages[:thread.cache_breakpoints[0] + 1])
+    # The instructions are the same prefix in every scoped thread, providers cache it across conversations
+    scoped_thread.mark_cache_breakpoint()
+
+    scoped_thread.append_text_message(f'''
+      START PHASE {phase.name}
+
+      The earlier conversations of the workflow were held in other threads, this thread only holds conversation {conversation.name}.
+
+      {self.artifact_brief(scheduler, thread, position)}
+
+      Everything earlier conversations created is in the workspace, use the tools to read what you need.
+    ''')
+    scoped_thread.append_message(Message(role= "assistant", content= [TextBlock(text= "SUCCESS")]))
+    scoped_thread.mark_cache_breakpoint()
+    return scoped_thread
+
+  def artifact_brief(self, scheduler: WorkflowScheduler, thread: Thread, position: Tuple[int, int]) -> str:
+    """
+    Describes the input artifact of the conversation at the position by the last message of the conversation that
+    created it and the files that conversation wrote.
+    """
+    artifact = scheduler.conversation(position).input
+    producer_position = scheduler.producer(position)
+    if producer_position is None:
+      return f"The input {artifact.name} of this conversation is the instruction of the workflow."
+
+    producer = scheduler.conversation(producer_position)
+    sections = [section for section in thread.completed_sections() if section.name == producer.name]
+    if len(sections) == 0:
+      return f"The input {artifact.name} of this conversation was created in conversation {producer.name}."
+
+    messages = thread.messages[sections[-1].start:sections[-1].end + 1]
+    file_paths = list(dict.fromkeys(block.input["file_path"] for message in messages for block in message.tool_use_blocks() if block.name in ToolExecutor.write_tools and "file_path" in block.input))
+    replies = [message for message in messages if message.role == "assistant" and len(message.text_blocks()) > 0]
+    summary = "\n".join(block.text for block in replies[-1].text_blocks()).replace("END CONVERSATION", "").strip() if len(replies) > 0 else ""
+    if len(summary) > self.artifact_summary_length:
+      summary = f"{summary[:self.artifact_summary_length]}\n... (shortened, the files hold the complete artifact)"
+
+    return (
+      f"The input {artifact.name} of this conversation was created in conversation {producer.name}, which ended with:\n\n"
+      f"{summary}\n\n"
+      f"Files written in conversation {producer.name}: {', '.join(file_paths) if len(file_paths) > 0 else 'none'}"
+    )
+
+  def conversation(self, workflow: Workflow, phase: WorkflowPhase, conversation: WorkflowConversation, thread: Thread, report: UsageReport, checkpoint: Optional[WorkflowCheckpoint] = None) -> Generator[ResponseRequest, ResponseResult, Thread]:
+    """
+    Runs a conversation on the thread and returns the thread, continuing a conversation started in the checkpoint.
 
-        thread.append_text_message(f'''
-          START CONVERSATION {conversation.name}
-        ''')
+    Without a checkpoint, e.g. on a branch of the thread, no checkpoints are saved during the conversation.
+    """
+    adapter = self.adapter_factory.adapter(conversation.lead.model)
+    budget = self.budget.renewed()
+
+    if not checkpoint is None and not checkpoint.conversation_turn is None:
+      print(f"\n=== Conversation {conversation.name} (resumed) ===\n")
+      result = None
+      message_count = checkpoint.conversation_turn
+      current_role = checkpoint.current_role
+    else:
+      print(f"\n=== Conversation {conversation.name} ===\n")
+
+      thread.start_section(conversation.name)
+      thread.append_text_message(f'''
+        START CONVERSATION {conversation.name}
+      ''')
 
-        adapter.generate_response(thread)
+      result = yield ResponseRequest(adapter, thread, budget, self.conversation_stop_phrases)
+      self.record(report, result, phase.name, conversation.name, "lead")
 
-        print(f"{thread.last_message_text()}\n")
+      if adapter.stream_handler is None:
+        print(f"{thread.last_message_text() or ''}\n")
         print("=====\n")
-      
-        message_count = 0
-        current_role = "assistant"
-        while True:
-          model = conversation.lead.model if current_role == "lead" else conversation.assistant.model
-          adapter = self.adapter_factory.adapter(model)
+    
+      message_count = 0
+      current_role = "assistant"
+      if not checkpoint is None:
+        self.save_checkpoint(checkpoint, workflow, thread, adapter, report, phase_started= True, conversation_turn= message_count, current_role= current_role)
 
-          thread.append_text_message("SWITCH")
-          adapter.generate_response(thread)
+    while result is None or not result.exhausted():
+      model = conversation.lead.model if current_role == "lead" else conversation.assistant.model
+      adapter = self.adapter_factory.adapter(model)
 
-          last_message_text = thread.last_message_text()
+      thread.append_text_message("SWITCH")
+      result = yield ResponseRequest(adapter, thread, budget, self.conversation_stop_phrases)
+      self.record(report, result, phase.name, conversation.name, current_role)
 
-          print(f"{last_message_text}\n")
-          print("=====\n")
+      last_message_text = thread.last_message_text() or ""
 
-          if message_count >= 10 or "END CONVERSATION" in last_message_text:
-            break
+      if adapter.stream_handler is None:
+        print(f"{last_message_text}\n")
+        print("=====\n")
 
-          message_count += 1
-          current_role = "assistant" if current_role == "lead" else "lead"
+      if message_count >= 10 or "END CONVERSATION" in last_message_text:
+        break
 
-        workflow.next_conversation()
-      workflow.next_phase()
+      message_count += 1
+      current_role = "assistant" if current_role == "lead" else "lead"
+      if not checkpoint is None:
+        self.save_checkpoint(checkpoint, workflow, thread, adapter, report, phase_started= True, conversation_turn= message_count, current_role= current_role)
+
+    if result.exhausted():
+      print(f"Conversation {conversation.name} stopped after {budget.turns} turns: {result.stop_reason}\n")
+
+    summary = report.summary([record for record in report.records if record.kind == "llm" and record.phase == phase.name and record.conversation == conversation.name])
+    cost = f"${summary['cost']:.4f}" if not summary["cost"] is None else "unknown cost"
+    print(f"Conversation {conversation.name} used {budget.usage.input_tokens} input tokens ({budget.usage.cache_read_tokens} cached, {budget.usage.cache_miss_tokens()} uncached) and {budget.usage.output_tokens} output tokens ({cost}) in {summary['calls']} calls taking {summary['seconds']:.1f}s\n")
+    # The completed conversation is a stable prefix, providers can cache it and compactors may summarize it
+    thread.end_section()
+    thread.mark_cache_breakpoint()
+    return thread
+
+  def save_checkpoint(self, checkpoint: WorkflowCheckpoint, workflow: Workflow, thread: Thread, adapter: Adapter, report: UsageReport, phase_started: bool, conversation_turn: Optional[int] = None, current_role: str = "assistant") -> None:
+    """
+    Persists the thread and the usage report and saves the checkpoint at the current state of the run.
+    """
+    # The checkpoint refers to journaled messages, so messages added by the manager are persisted first
+    adapter.dump_thread(thread)
+    self.write_report(report, thread)
+    checkpoint.update(workflow, thread, phase_started, conversation_turn, current_role)
+    checkpoint.save()
+
+  def record(self, report: UsageReport, result: ResponseResult, phase: Optional[str], conversation: Optional[str], role: Optional[str]) -> None:
+    """
+    Tags the records of the response with where in the workflow they were made and adds them to the report.
+    """
+    for record in result.records:
+      record.tag(phase, conversation, role)
+    report.add(result.records)
+
+  def write_report(self, report: UsageReport, thread: Thread) -> None:
+    """
+    Writes the usage report into the workspace of the thread.
+    """
+    report.write(f"{thread.workspace_path}/{self.report_file_name}")
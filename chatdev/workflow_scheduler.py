@@ -0,0 +1,76 @@
+"""
+This module contains the WorkflowScheduler class which finds the conversations of a workflow that can run concurrently.
+
+Modules Imported:
+- `Workflow`, `WorkflowConversation` from `chatdev.entities`: Represents the workflow and its conversations.
+- `Dict`, `List`, `Optional`, `Tuple` from `typing`: Specifies dict, list, optional and tuple types.
+
+Classes:
+- `WorkflowScheduler`: Builds the artifact dependency graph of a workflow and groups independent conversations.
+
+`WorkflowScheduler` Class:
+Conversations are identified by their position `(phase index, conversation index)`, as a conversation may be
+used in several phases. A conversation depends on every earlier conversation that creates its input, creates the
+same output, or reads the artifact it creates, so running them concurrently would lose or overwrite work.
+Phases stay barriers: each starts with its own START PHASE exchange and checkpoints count the conversations of the
+current phase, so only consecutive conversations of a phase without dependencies among them run together.
+
+Attributes:
+- `workflow` (Workflow): The scheduled workflow.
+- `dependencies` (Dict[Tuple[int, int], List[Tuple[int, int]]]): The positions of the conversations every conversation depends on.
+
+Methods:
+- `__init__(self, workflow: Workflow)`: Builds the dependency graph of the workflow.
+- `conversation(self, position: Tuple[int, int]) -> WorkflowConversation`: Returns the conversation at a position.
+- `depends(later: WorkflowConversation, earlier: WorkflowConversation) -> bool`: Returns whether a conversation has to wait for an earlier one.
+- `producer(self, position: Tuple[int, int]) -> Optional[Tuple[int, int]]`: Returns the position of the conversation that last created the input of a conversation.
+- `next_conversations(self, limit: int) -> List[WorkflowConversation]`: Returns the conversations starting at the current one that can run concurrently.
+"""
+
+from chatdev.entities import Workflow, WorkflowConversation
+from typing import Dict, List, Optional, Tuple
+
+class WorkflowScheduler:
+  workflow: Workflow
+  dependencies: Dict[Tuple[int, int], List[Tuple[int, int]]]
+
+  def __init__(self, workflow: Workflow):
+    self.workflow = workflow
+    self.dependencies = {}
+
+    positions = [(phase_index, conversation_index) for phase_index, phase in enumerate(workflow.phases) for conversation_index in range(len(phase.conversations))]
+    for index, position in enumerate(positions):
+      conversation = self.conversation(position)
+      self.dependencies[position] = [earlier for earlier in positions[:index] if WorkflowScheduler.depends(conversation, self.conversation(earlier))]
+
+  def conversation(self, position: Tuple[int, int]) -> WorkflowConversation:
+    return self.workflow.phases[position[0]].conversations[position[1]]
+
+  @staticmethod
+  def depends(later: WorkflowConversation, earlier: WorkflowConversation) -> bool:
+    # Artifacts are compared by identity, like the artifact lists of the workflow
+    return earlier.output is later.input or earlier.output is later.output or earlier.input is later.output
+
+  def producer(self, position: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+    """
+    Returns the position of the latest earlier conversation creating the input of the conversation at the position,
+    `None` if the input isn't created in the workflow, e.g. the task given by the human.
+    """
+    conversation = self.conversation(position)
+    producers = [earlier for earlier in self.dependencies[position] if self.conversation(earlier).output is conversation.input]
+    return producers[-1] if len(producers) > 0 else None
+
+  def next_conversations(self, limit: int) -> List[WorkflowConversation]:
+    """
+    Returns the current conversation and the following conversations of the phase that depend neither on it nor on
+    each other, at most `limit`.
+    """
+    phase_index = self.workflow.current_phase_index
+    phase = self.workflow.current_phase()
+    positions = [(phase_index, phase.current_conversation_index)]
+    for conversation_index in range(phase.current_conversation_index + 1, len(phase.conversations)):
+      position = (phase_index, conversation_index)
+      if len(positions) >= limit or any(earlier in positions for earlier in self.dependencies[position]):
+        break
+      positions.append(position)
+    return [self.conversation(position) for position in positions]
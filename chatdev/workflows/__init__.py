@@ -2,3 +2,9 @@ from .documentation import documentation_workflow
 from .medium_software_development import medium_software_development_workflow
 from .tiny_software_development import tiny_software_development_workflow
 
+
+workflows = {
+  "documentation": documentation_workflow,
+  "medium_software_development": medium_software_development_workflow,
+  "tiny_software_development": tiny_software_development_workflow
+}